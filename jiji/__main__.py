@@ -6,6 +6,8 @@ import asyncio
 import json
 import logging
 import os
+import signal
+import socket
 import sys
 import time
 import urllib.request
@@ -52,6 +54,42 @@ def parse_peers(peers_str: str) -> list[tuple[str, int]]:
     return result
 
 
+async def resolve_peers(
+    peers: list[tuple[str, int]], dns_seed: str | None = None,
+) -> list[tuple[str, int]]:
+    """Resolve bootstrap peers (and an optional DNS seed) concurrently.
+
+    Every lookup runs at once, so startup waits for the slowest one rather
+    than the sum of all of them. Names that fail to resolve are dropped
+    with a warning instead of holding up the node. A DNS seed is a hostname
+    whose A/AAAA records each name a peer on the default P2P port.
+    """
+    loop = asyncio.get_running_loop()
+    lookups = list(peers)
+    if dns_seed:
+        lookups.append((dns_seed, DEFAULT_P2P_PORT))
+    results = await asyncio.gather(
+        *[
+            loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            for host, port in lookups
+        ],
+        return_exceptions=True,
+    )
+    resolved: list[tuple[str, int]] = []
+    for (host, port), infos in zip(lookups, results):
+        if isinstance(infos, Exception):
+            print(f"could not resolve peer {host}:{port}: {infos}", file=sys.stderr)
+            continue
+        # a plain peer entry keeps its first address; a seed expands to all
+        for _family, _type, _proto, _canon, sockaddr in (
+            infos if host == dns_seed else infos[:1]
+        ):
+            addr = (sockaddr[0], port)
+            if addr not in resolved:
+                resolved.append(addr)
+    return resolved
+
+
 # ---------------------------------------------------------------------------
 # RPC helper
 # ---------------------------------------------------------------------------
@@ -231,9 +269,21 @@ def _apply_lan_defaults(args: argparse.Namespace) -> None:
         args.rpc_allow_origin = "*"
 
 
+def _install_fast_event_loop() -> None:
+    """Use uvloop for the node if it's installed; stock asyncio otherwise."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logging.getLogger(__name__).info("using uvloop event loop")
+
+
 async def run_node(args: argparse.Namespace) -> None:
     private_key, public_key = load_or_generate_keypair(args.keyfile)
-    bootstrap_peers = parse_peers(args.peers)
+    bootstrap_peers = await resolve_peers(
+        parse_peers(args.peers), getattr(args, "dns_bootstrap", None),
+    )
 
     _apply_lan_defaults(args)
     mdns_enabled = bool(getattr(args, "mdns", False))
@@ -272,9 +322,18 @@ async def run_node(args: argparse.Namespace) -> None:
     )
     await node.start()
 
+    # Park on an event instead of polling, so an idle node doesn't wake the
+    # loop every second. SIGINT/SIGTERM set it for a clean shutdown.
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows; KeyboardInterrupt still lands below
+
     try:
-        while True:
-            await asyncio.sleep(1)
+        await stop_event.wait()
     except (KeyboardInterrupt, asyncio.CancelledError):
         pass
     finally:
@@ -309,6 +368,8 @@ def build_parser() -> argparse.ArgumentParser:
     node_p.add_argument("--rpc-port", type=int, default=DEFAULT_RPC_PORT)
     node_p.add_argument("--mine", action="store_true", help="Enable mining")
     node_p.add_argument("--peers", default="", help="Bootstrap peers (host:port,...)")
+    node_p.add_argument("--dns-bootstrap", default=None, metavar="HOST",
+                        help="DNS seed whose A/AAAA records list bootstrap peers")
     node_p.add_argument("--keyfile", default=None, help="Private key file (hex)")
     node_p.add_argument("--data-dir", default=None,
                         help="Data directory for persistent storage")
@@ -429,6 +490,7 @@ def main() -> None:
         node_parser.add_argument("--rpc-port", type=int, default=DEFAULT_RPC_PORT)
         node_parser.add_argument("--mine", action="store_true")
         node_parser.add_argument("--peers", default="")
+        node_parser.add_argument("--dns-bootstrap", default=None)
         node_parser.add_argument("--keyfile", default=None)
         node_parser.add_argument("--data-dir", default=None)
         node_parser.add_argument("--log-level", default="INFO",
@@ -446,6 +508,7 @@ def main() -> None:
             format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         )
 
+    _install_fast_event_loop()
     asyncio.run(run_node(args))
 
 
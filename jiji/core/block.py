@@ -1,12 +1,31 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from jiji.core.config import MAX_TARGET
 from jiji.core.merkle import merkle_root
-from jiji.core.serialization import canonicalize, sha256
+from jiji.core.serialization import canonicalize, memoize_to_dict, sha256
 from jiji.core.transaction import Transaction, transaction_from_dict
 
+_BLOCK_FRAME_SIZE = len(b'{"header":,"transactions":[]}')
+
+
+def difficulty_target(difficulty: int) -> int:
+    """Largest block hash (as a big-endian int) that satisfies `difficulty`."""
+    return MAX_TARGET // difficulty
+
+
+@lru_cache(maxsize=64)
+def difficulty_target_bytes(difficulty: int) -> bytes:
+    """`difficulty_target` as 32 big-endian bytes.
+
+    Digests are fixed-length big-endian, so `block_hash <= target_bytes` is a
+    plain memcmp with the same result as comparing the integers, minus the
+    per-hash bignum conversion.
+    """
+    return difficulty_target(difficulty).to_bytes(32, "big")
+
 
 @dataclass
 class BlockHeader:
@@ -23,6 +42,15 @@ class BlockHeader:
     state_root: bytes
     tx_count: int
 
+    def __setattr__(self, name: str, value) -> None:
+        # Miners bump `nonce` in place, so every field write drops the memos.
+        if name[0] != "_":
+            d = self.__dict__
+            d.pop("_block_hash", None)
+            d.pop("_dict", None)
+        object.__setattr__(self, name, value)
+
+    @memoize_to_dict
     def to_dict(self) -> dict:
         return {
             "version": self.version,
@@ -52,9 +80,49 @@ class BlockHeader:
             tx_count=d["tx_count"],
         )
 
+    def canonical_bytes(self) -> bytes:
+        """Canonical header serialization, laid out in sorted-key order directly.
+
+        Byte-identical to `canonicalize(self.to_dict())`; falls back to it if a
+        field has an unexpected type (e.g. a header decoded from a bad peer).
+        """
+        if not (all(type(v) is int for v in (
+                    self.difficulty, self.height, self.nonce,
+                    self.timestamp, self.tx_count, self.version))
+                and all(isinstance(b, bytes) for b in (
+                    self.miner, self.prev_hash, self.state_root, self.tx_merkle_root))):
+            return canonicalize(self.to_dict())
+        return (
+            f'{{"difficulty":{self.difficulty},"height":{self.height},'
+            f'"miner":"{self.miner.hex()}","nonce":{self.nonce},'
+            f'"prev_hash":"{self.prev_hash.hex()}",'
+            f'"state_root":"{self.state_root.hex()}",'
+            f'"timestamp":{self.timestamp},"tx_count":{self.tx_count},'
+            f'"tx_merkle_root":"{self.tx_merkle_root.hex()}",'
+            f'"version":{self.version}}}'
+        ).encode("utf-8")
+
+    def nonce_template(self) -> tuple[bytes, bytes]:
+        """Split the canonical header around the nonce digits.
+
+        `prefix + str(nonce).encode() + suffix` is the canonical serialization
+        for any int nonce, which lets the miner hash a precomputed prefix
+        state instead of re-serializing the header per attempt. Keys are
+        sorted, so the only keys before "nonce" are difficulty, height and
+        miner, and none of their values can contain the key text.
+        """
+        raw = self.canonical_bytes()
+        key = b'"nonce":'
+        start = raw.index(key) + len(key)
+        end = raw.index(b",", start)
+        return raw[:start], raw[end:]
+
     def block_hash(self) -> bytes:
-        """SHA-256 of the canonical header serialization."""
-        return sha256(canonicalize(self.to_dict()))
+        """SHA-256 of the canonical header serialization (memoized)."""
+        h = self.__dict__.get("_block_hash")
+        if h is None:
+            h = self._block_hash = sha256(self.canonical_bytes())
+        return h
 
 
 @dataclass
@@ -73,14 +141,32 @@ class Block:
         return merkle_root(tx_hashes)
 
     def serialized_size(self) -> int:
-        """Approximate serialized size in bytes."""
-        return len(canonicalize(self.to_dict()))
+        """Byte length of `canonicalize(self.to_dict())`.
+
+        Summed from the header encoding and each tx's memoized size, plus
+        the `{"header":...,"transactions":[...]}` framing and commas, so
+        re-checking a block doesn't re-serialize it.
+        """
+        txs = self.transactions
+        return (
+            _BLOCK_FRAME_SIZE + len(self.header.canonical_bytes())
+            + sum(tx.serialized_size() for tx in txs) + max(len(txs) - 1, 0)
+        )
 
     def meets_difficulty(self) -> bool:
-        """Check if the block hash satisfies the difficulty target."""
+        """Check if the block hash satisfies the difficulty target.
+
+        Difficulty 1 targets MAX_TARGET, which every 32-byte digest meets,
+        so the header isn't hashed at all.
+        """
+        difficulty = self.header.difficulty
+        if type(difficulty) is int and difficulty > 0:
+            if difficulty == 1:
+                return True
+            return self.block_hash() <= difficulty_target_bytes(difficulty)
+        # Malformed header from a peer: keep the plain integer semantics
         hash_int = int.from_bytes(self.block_hash(), "big")
-        target = MAX_TARGET // self.header.difficulty
-        return hash_int <= target
+        return hash_int <= MAX_TARGET // difficulty
 
     def to_dict(self) -> dict:
         return {
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import os
 import time
+from collections.abc import KeysView
 from typing import TYPE_CHECKING
 
-from jiji.core.block import Block, BlockHeader
-from jiji.core.config import GENESIS_DIFFICULTY, MAX_REORG_DEPTH, PROTOCOL_VERSION, block_reward
+from jiji.core.block import Block, BlockHeader, difficulty_target_bytes
+from jiji.core.config import (
+    CHAIN_INDEX_SAVE_INTERVAL, GENESIS_DIFFICULTY, MAX_REORG_DEPTH, PROTOCOL_VERSION,
+    block_reward,
+)
 from jiji.core.merkle import merkle_root
 from jiji.core.state import WorldState
 from jiji.core.transaction import Coinbase, Endorse, Post, Transaction
@@ -13,18 +18,111 @@ from jiji.core.validation import validate_block
 if TYPE_CHECKING:
     from jiji.storage.store import BlockStore
 
+_HASH_SIZE = 32
+
+
+class HashChain:
+    """Sequence of 32-byte block hashes packed into one contiguous buffer.
+
+    Behaves like the `list[bytes]` it replaces (len, indexing, slicing,
+    iteration, append, index, equality with lists), but holds a single
+    allocation instead of one bytes object per height. The raw buffer is
+    exactly the on-disk chain index format.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, hashes=()):
+        self._buf = bytearray()
+        for h in hashes:
+            self.append(h)
+
+    def append(self, block_hash: bytes) -> None:
+        if len(block_hash) != _HASH_SIZE:
+            raise ValueError("block hash must be 32 bytes")
+        self._buf += block_hash
+
+    def clear(self) -> None:
+        self._buf.clear()
+
+    def view(self, height: int) -> memoryview:
+        """Zero-copy view of the hash at `height` (for comparisons)."""
+        start = height * _HASH_SIZE
+        return memoryview(self._buf)[start:start + _HASH_SIZE]
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buf)
+
+    def index(self, block_hash: bytes) -> int:
+        pos = self._buf.find(block_hash)
+        while pos != -1:
+            if pos % _HASH_SIZE == 0:
+                return pos // _HASH_SIZE
+            pos = self._buf.find(block_hash, pos + 1)
+        raise ValueError("block hash not in chain")
+
+    def __len__(self) -> int:
+        return len(self._buf) // _HASH_SIZE
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("chain index out of range")
+        start = i * _HASH_SIZE
+        return bytes(self._buf[start:start + _HASH_SIZE])
+
+    def __iter__(self):
+        buf = bytes(self._buf)
+        for start in range(0, len(buf), _HASH_SIZE):
+            yield buf[start:start + _HASH_SIZE]
+
+    def __contains__(self, block_hash) -> bool:
+        try:
+            self.index(block_hash)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HashChain):
+            return self._buf == other._buf
+        if isinstance(other, list):
+            return len(other) == len(self) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HashChain(<{len(self)} hashes>)"
+
 
 class Blockchain:
     """Manages the chain of blocks, world state, and transaction index."""
 
-    def __init__(self, store: BlockStore | None = None):
+    def __init__(
+        self, store: BlockStore | None = None, index_path: str | None = None,
+    ):
         self.blocks: dict[bytes, Block] = {}
-        self.main_chain: list[bytes] = []
+        self.main_chain: HashChain = HashChain()
         self.state: WorldState = WorldState()
         self.tx_index: dict[bytes, bytes] = {}
-        self.known_posts: set[bytes] = set()
+        self.tx_by_hash: dict[bytes, Transaction] = {}
         self.post_authors: dict[bytes, bytes] = {}
         self._store: BlockStore | None = store
+        self._index_path: str | None = index_path
+        # (tip hash, count, median) of the last median_timestamp() call
+        self._median_cache: tuple[bytes, int, int | float] | None = None
+        # (tip hash, height, difficulty), kept by compute_expected_difficulty
+        self._difficulty_cache: tuple[bytes, int, int] | None = None
+
+    @property
+    def known_posts(self) -> KeysView[bytes]:
+        """Hashes of confirmed posts (a live view of `post_authors`)."""
+        return self.post_authors.keys()
 
     @property
     def height(self) -> int:
@@ -50,23 +148,35 @@ class Blockchain:
 
     def get_transaction(self, tx_hash: bytes) -> Transaction | None:
         """Look up a confirmed transaction by hash."""
-        block_hash = self.tx_index.get(tx_hash)
-        if block_hash is None:
-            return None
-        block = self.blocks[block_hash]
-        for tx in block.transactions:
-            if tx.tx_hash() == tx_hash:
-                return tx
-        return None
+        return self.tx_by_hash.get(tx_hash)
 
     def get_recent_timestamps(self, count: int) -> list[int]:
         """Get timestamps of the last N blocks."""
         start = max(0, len(self.main_chain) - count)
-        timestamps = []
-        for i in range(start, len(self.main_chain)):
-            block = self.blocks[self.main_chain[i]]
-            timestamps.append(block.header.timestamp)
-        return timestamps
+        blocks = self.blocks
+        return [blocks[h].header.timestamp for h in self.main_chain[start:]]
+
+    def median_timestamp(self, count: int) -> int | float | None:
+        """Median timestamp of the last `count` blocks (None if empty).
+
+        Same value as `statistics.median` (the mean of the middle two for an
+        even count). Memoized per tip, since the miner and then
+        validate_block both ask for it about the same tip.
+        """
+        if not self.main_chain:
+            return None
+        tip_hash = self.main_chain[-1]
+        cached = self._median_cache
+        if cached is not None and cached[0] == tip_hash and cached[1] == count:
+            return cached[2]
+        recent = sorted(self.get_recent_timestamps(count))
+        mid = len(recent) // 2
+        if len(recent) & 1:
+            median = recent[mid]
+        else:
+            median = (recent[mid - 1] + recent[mid]) / 2
+        self._median_cache = (tip_hash, count, median)
+        return median
 
     def add_block(self, block: Block, current_time: int | None = None) -> None:
         """Validate and append a block. Raises ValidationError if invalid."""
@@ -85,6 +195,9 @@ class Blockchain:
         # Persist to disk if store is configured
         if self._store is not None:
             self._store.put_block(block, on_main_chain=True)
+            if (self._index_path is not None
+                    and len(self.main_chain) % CHAIN_INDEX_SAVE_INTERVAL == 0):
+                self.save_index()
 
     def _replay_block_state(self, block: Block) -> None:
         """Replay a block's effects on state and indexes without persistence."""
@@ -94,9 +207,9 @@ class Blockchain:
         for tx in block.transactions:
             tx_h = tx.tx_hash()
             self.tx_index[tx_h] = block_hash
+            self.tx_by_hash[tx_h] = tx
 
             if isinstance(tx, Post):
-                self.known_posts.add(tx_h)
                 self.post_authors[tx_h] = tx.author
 
             target_author = None
@@ -138,13 +251,42 @@ class Blockchain:
 
         block = Block(header=header, transactions=[coinbase])
 
-        # mine (at GENESIS_DIFFICULTY=1, any hash works)
-        while not block.meets_difficulty():
-            block.header.nonce += 1
+        # mine: at difficulty 1 the target is MAX_TARGET, so nonce 0 already
+        # satisfies PoW and there's nothing to hash
+        if header.difficulty > 1:
+            target = difficulty_target_bytes(header.difficulty)
+            while header.block_hash() > target:
+                header.nonce += 1
 
         self._apply_block(block)
         return block
 
+    def save_index(self, path: str | None = None) -> None:
+        """Write the main chain to a flat file of 32-byte hashes, atomically.
+
+        Record i is the hash at height i, so the file size gives the height.
+        The index is only a startup hint; the store stays authoritative.
+        """
+        path = path or self._index_path
+        if path is None:
+            return
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.main_chain.to_bytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load_index(path: str) -> list[bytes]:
+        """Read a main-chain index written by save_index ([] if unusable)."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        if len(data) % 32:
+            return []
+        return [data[i:i + 32] for i in range(0, len(data), 32)]
+
     def load_from_store(self) -> None:
         """Rebuild in-memory chain state from the block store."""
         if self._store is None:
@@ -154,25 +296,41 @@ class Blockchain:
         if tip_hash is None:
             return  # empty store
 
-        # Get ordered main chain hashes
-        main_hashes = self._store.get_main_chain_hashes()
-
+        # Get ordered main chain hashes. A saved index lets us walk back from
+        # the tip only as far as where the index was last written.
+        known = self.load_index(self._index_path) if self._index_path else []
+        bad = self._replay_main_chain(self._store.get_main_chain_hashes(known))
+        if bad is not None and known:
+            # Index was stale or corrupt; fall back to a full walk.
+            bad = self._replay_main_chain(self._store.get_main_chain_hashes())
+        if bad is not None:
+            raise RuntimeError(f"store main chain broken at block {bad.hex()}")
+
+    def _replay_main_chain(self, main_hashes: list[bytes]) -> bytes | None:
+        """Reset in-memory state and replay `main_hashes` from the store.
+
+        Returns the first hash that is missing or doesn't link to its
+        predecessor by prev_hash, or None if the whole chain replayed.
+        """
         # Clear in-memory state
         self.blocks.clear()
         self.main_chain.clear()
         self.state = WorldState()
         self.tx_index.clear()
-        self.known_posts.clear()
+        self.tx_by_hash.clear()
         self.post_authors.clear()
 
         # Replay all main chain blocks
+        prev_hash = bytes(32)
         for bh in main_hashes:
             block = self._store.get_block(bh)
-            if block is None:
-                raise RuntimeError(f"store missing block {bh.hex()}")
+            if block is None or block.header.prev_hash != prev_hash:
+                return bh
             self.blocks[bh] = block
             self.main_chain.append(bh)
             self._replay_block_state(block)
+            prev_hash = bh
+        return None
 
     def store_fork_block(self, block: Block) -> None:
         """Store a valid block that doesn't extend the current tip."""
@@ -231,10 +389,10 @@ class Blockchain:
         # Step 5: Rebuild state from genesis through fork point, then fork blocks
         self.state = WorldState()
         self.tx_index.clear()
-        self.known_posts.clear()
+        self.tx_by_hash.clear()
         self.post_authors.clear()
 
-        new_main_chain = list(self.main_chain[:fork_point_idx + 1])
+        new_main_chain = HashChain(self.main_chain[:fork_point_idx + 1])
 
         # Replay blocks from genesis to fork point
         for bh in new_main_chain:
@@ -252,5 +410,6 @@ class Blockchain:
         # Step 6: Persist updated main chain
         if self._store is not None:
             self._store.set_main_chain(self.main_chain)
+            self.save_index()
 
         return orphaned_blocks
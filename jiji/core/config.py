@@ -6,6 +6,9 @@ PROTOCOL_VERSION = 1
 BLOCK_TIME_TARGET = 15
 DIFFICULTY_ADJUSTMENT_WINDOW = 10
 MAX_DIFFICULTY_ADJUSTMENT = 4.0
+# Seconds the miner pauses after an empty block, so an idle node doesn't
+# flood the chain at low difficulty
+EMPTY_BLOCK_DELAY = 5
 
 # Block limits
 MAX_BLOCK_SIZE = 262144
@@ -41,15 +44,31 @@ MEDIAN_TIME_BLOCK_COUNT = 11
 # Genesis
 GENESIS_DIFFICULTY = 1
 
+# Blocks are announced before full validation only when the difficulty due
+# at their height is at least this; below it the PoW check costs a peer
+# nothing, so anyone could make us relay junk.
+PRE_RELAY_MIN_DIFFICULTY = 2
+
 # PoW target ceiling (2^256 - 1)
 MAX_TARGET = (1 << 256) - 1
 
 # Chain reorganization
 MAX_REORG_DEPTH = 100
 
+# Storage: rewrite the on-disk main-chain index every N blocks
+CHAIN_INDEX_SAVE_INTERVAL = 100
+
 # Networking
 DEFAULT_P2P_PORT = 9333
 DEFAULT_RPC_PORT = 9332
+# HTTP keep-alive on the RPC server: idle seconds between requests, and
+# requests served before the connection is closed anyway
+RPC_KEEPALIVE_TIMEOUT = 15
+RPC_KEEPALIVE_MAX_REQUESTS = 100
+# RPC bodies this large (request bytes / response tx count) are parsed or
+# serialized on a worker thread so the event loop keeps serving P2P
+RPC_OFFLOAD_MIN_BYTES = 64 * 1024
+RPC_OFFLOAD_MIN_TXS = 500
 MAX_PEERS = 50
 MAX_OUTBOUND = 40
 MAX_INBOUND = 10
@@ -57,12 +76,26 @@ MAX_INBOUND = 10
 # LAN discovery (mDNS / DNS-SD service type)
 MDNS_SERVICE_TYPE = "_jiji._tcp.local."
 SYNC_BATCH_SIZE = 50
+# SYNC_REQUEST batches kept in flight to one peer during initial sync
+SYNC_PIPELINE_DEPTH = 4
+# Encoded blocks kept for serving sync / block requests (bytes, LRU)
+BLOCK_WIRE_CACHE_BYTES = 16 * 1024 * 1024
 PEER_EXCHANGE_INTERVAL = 60
 PEER_EXCHANGE_INITIAL_DELAY = 5
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
 HANDSHAKE_TIMEOUT = 10
 PEER_MAX_AGE = 7 * 24 * 3600  # 7 days
 MAX_SAVED_PEERS = 200
+# Addresses remembered from peer exchange (oldest-refreshed evicted first)
+MAX_KNOWN_ADDRESSES = 1024
+# Outbound connection attempts allowed in flight at once
+PEER_CONNECT_CONCURRENCY = 8
+MEMPOOL_BLOOM_INTERVAL = 0.5  # seconds between mempool digests to each peer
+MEMPOOL_BLOOM_ERROR_RATE = 0.01
+MEMPOOL_BLOOM_MAX_BYTES = 256 * 1024
+# A tx announced to a peer whose digests still lack it this many digests
+# later is pushed to it whole (the announce or its fetch was lost).
+MEMPOOL_RESEND_DIGESTS = 2
 
 # Rate limiting and peer scoring
 INBOUND_CONN_PER_MIN = 5  # per /32 sliding-window cap
@@ -71,6 +104,8 @@ PEER_MSG_BURST = 200
 RPC_REQ_PER_MIN = 120
 SEEN_SET_MAX = 50000
 SEEN_SET_FLUSH_INTERVAL = 60
+# Slots (power of two) in each table that drops repeated announces on receipt
+ANNOUNCE_CACHE_SLOTS = 8192
 BAN_DURATION = 86400  # 24h
 BAN_SCORE_THRESHOLD = 100
 SCORE_BAD_SIG = 10
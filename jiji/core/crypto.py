@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from cryptography.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PrivateKey,
     Ed25519PublicKey,
@@ -10,6 +12,17 @@ from cryptography.hazmat.primitives.serialization import (
 )
 from cryptography.exceptions import InvalidSignature
 
+# Parsed public keys, keyed by raw bytes. A node sees the same few authors
+# over and over, so re-parsing through OpenSSL on every verify is wasted
+# work. Private keys are never cached: that would keep secret material
+# alive in a process-wide table.
+_KEY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _public_key(public_key_bytes: bytes) -> Ed25519PublicKey:
+    return Ed25519PublicKey.from_public_bytes(public_key_bytes)
+
 
 def generate_keypair() -> tuple[bytes, bytes]:
     """Generate an Ed25519 keypair. Returns (private_key, public_key) as raw bytes."""
@@ -25,17 +38,15 @@ def generate_keypair() -> tuple[bytes, bytes]:
 
 def sign(private_key_bytes: bytes, message: bytes) -> bytes:
     """Sign a message with an Ed25519 private key. Returns 64-byte signature."""
-    private_key = Ed25519PrivateKey.from_private_bytes(private_key_bytes)
-    return private_key.sign(message)
+    return Ed25519PrivateKey.from_private_bytes(private_key_bytes).sign(message)
 
 
 def verify(public_key_bytes: bytes, message: bytes, signature: bytes) -> bool:
     """Verify an Ed25519 signature. Returns True if valid."""
     try:
-        public_key = Ed25519PublicKey.from_public_bytes(public_key_bytes)
-        public_key.verify(signature, message)
+        _public_key(public_key_bytes).verify(signature, message)
         return True
-    except (InvalidSignature, ValueError):
+    except (InvalidSignature, ValueError, TypeError):
         return False
 
 
@@ -43,3 +54,15 @@ def public_key_from_private(private_key_bytes: bytes) -> bytes:
     """Derive public key from private key."""
     private_key = Ed25519PrivateKey.from_private_bytes(private_key_bytes)
     return private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def verify_batch(items: list[tuple[bytes, bytes, bytes]]) -> bool:
+    """Verify many (public_key, message, signature) triples. True if all valid.
+
+    Stops at the first bad signature. Callers that need to know which item
+    is bad should fall back to `verify`.
+    """
+    for public_key_bytes, message, signature in items:
+        if not verify(public_key_bytes, message, signature):
+            return False
+    return True
@@ -1,23 +1,153 @@
+import hashlib
+
 from jiji.core.serialization import sha256
 
 EMPTY_HASH = sha256(b"")
 
 
+def _next_level(level: list[bytes]) -> list[bytes]:
+    """Hash adjacent pairs; an odd last element is paired with itself."""
+    h = hashlib.sha256
+    # zip over one iterator yields adjacent pairs without index arithmetic
+    # (and drops an odd tail, handled below).
+    pairs = iter(level)
+    out = [h(left + right).digest() for left, right in zip(pairs, pairs)]
+    if len(level) & 1:
+        last = level[-1]
+        out.append(h(last + last).digest())
+    return out
+
+
 def merkle_root(hashes: list[bytes]) -> bytes:
     """Compute the Merkle root of a list of leaf hashes."""
     if not hashes:
         return EMPTY_HASH
-    level = list(hashes)
+    level = hashes
     while len(level) > 1:
-        if len(level) % 2 == 1:
-            level.append(level[-1])
-        next_level = []
-        for i in range(0, len(level), 2):
-            next_level.append(sha256(level[i] + level[i + 1]))
-        level = next_level
+        level = _next_level(level)
     return level[0]
 
 
+class MerkleAccumulator:
+    """Streaming Merkle root: add leaves one at a time, read the root any time.
+
+    Keeps one pending subtree root per level (the binary "frontier"), so
+    `add` is O(log N) amortized and `root` is O(log N) without touching the
+    leaves again. Roots match `merkle_root` over the same leaves, including
+    the duplicate-the-odd-tail rule.
+    """
+
+    def __init__(self, hashes: list[bytes] = ()):
+        self._count = 0
+        # _frontier[level] is the root of a complete 2**level-leaf subtree,
+        # valid when bit `level` of _count is set.
+        self._frontier: list[bytes] = []
+        for leaf in hashes:
+            self.add(leaf)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, leaf: bytes) -> None:
+        h = hashlib.sha256
+        frontier = self._frontier
+        node = leaf
+        self._count += 1
+        count = self._count
+        level = 0
+        while not count >> level & 1:
+            node = h(frontier[level] + node).digest()
+            level += 1
+        if level == len(frontier):
+            frontier.append(node)
+        else:
+            frontier[level] = node
+
+    def root(self) -> bytes:
+        count = self._count
+        if not count:
+            return EMPTY_HASH
+        h = hashlib.sha256
+        frontier = self._frontier
+        level = 0
+        while not count >> level & 1:
+            level += 1
+        node = frontier[level]
+        while count != 1 << level:
+            # node is a lone subtree at this level: pair it with itself, as
+            # _next_level does with an odd tail, then fold in the completed
+            # subtrees to its left.
+            node = h(node + node).digest()
+            count += 1 << level
+            level += 1
+            while not count >> level & 1:
+                node = h(frontier[level] + node).digest()
+                level += 1
+        return node
+
+
+def merkle_levels(hashes: list[bytes]) -> list[list[bytes]]:
+    """Every level of the tree, leaves first and the root level last.
+
+    Keep this around to answer several proofs for the same block with
+    `proof_from_levels` instead of re-hashing the tree for each one.
+    """
+    levels = [hashes]
+    while len(levels[-1]) > 1:
+        levels.append(_next_level(levels[-1]))
+    return levels
+
+
+def updated_root(
+    levels: list[list[bytes]], changed: dict[int, bytes], in_place: bool = False,
+) -> bytes:
+    """Root of the `merkle_levels` tree with leaves replaced by `changed`.
+
+    `changed` maps leaf index -> new leaf hash; only the paths above those
+    leaves are re-hashed, O(len(changed) * log N). The leaf count must not
+    change. With `in_place` the new nodes are written back into `levels`.
+    """
+    h = hashlib.sha256
+    for level in levels[:-1]:
+        n = len(level)
+        parents: dict[int, bytes] = {}
+        for i in changed:
+            p = i >> 1
+            if p in parents:
+                continue
+            left_i = p << 1
+            left = changed.get(left_i, level[left_i])
+            # Odd tail: the last node is paired with itself.
+            right = changed.get(left_i + 1, level[left_i + 1]) if left_i + 1 < n else left
+            parents[p] = h(left + right).digest()
+        if in_place:
+            for i, node in changed.items():
+                level[i] = node
+        changed = parents
+    top = levels[-1]
+    if in_place:
+        for i, node in changed.items():
+            top[i] = node
+    return changed.get(0, top[0])
+
+
+def proof_from_levels(levels: list[list[bytes]], index: int) -> list[tuple[bytes, bool]]:
+    """`merkle_proof` for leaf `index`, read off precomputed `merkle_levels`."""
+    if not levels[0] or index < 0 or index >= len(levels[0]):
+        raise ValueError("invalid index for merkle proof")
+    proof = []
+    idx = index
+    for level in levels[:-1]:
+        if idx & 1:
+            proof.append((level[idx - 1], True))
+        else:
+            # Odd tail: the last node is its own sibling.
+            sibling = level[idx + 1] if idx + 1 < len(level) else level[idx]
+            proof.append((sibling, False))
+        idx >>= 1
+    return proof
+
+
 def merkle_proof(hashes: list[bytes], index: int) -> list[tuple[bytes, bool]]:
     """Generate a Merkle proof for the leaf at the given index.
 
@@ -26,32 +156,18 @@ def merkle_proof(hashes: list[bytes], index: int) -> list[tuple[bytes, bool]]:
     """
     if not hashes or index < 0 or index >= len(hashes):
         raise ValueError("invalid index for merkle proof")
-    proof = []
-    level = list(hashes)
-    idx = index
-    while len(level) > 1:
-        if len(level) % 2 == 1:
-            level.append(level[-1])
-        if idx % 2 == 0:
-            proof.append((level[idx + 1], False))
-        else:
-            proof.append((level[idx - 1], True))
-        next_level = []
-        for i in range(0, len(level), 2):
-            next_level.append(sha256(level[i] + level[i + 1]))
-        level = next_level
-        idx //= 2
-    return proof
+    return proof_from_levels(merkle_levels(hashes), index)
 
 
 def verify_merkle_proof(
     leaf_hash: bytes, proof: list[tuple[bytes, bool]], root: bytes
 ) -> bool:
     """Verify a Merkle proof against a known root."""
+    h = hashlib.sha256
     current = leaf_hash
     for sibling, is_left in proof:
         if is_left:
-            current = sha256(sibling + current)
+            current = h(sibling + current).digest()
         else:
-            current = sha256(current + sibling)
+            current = h(current + sibling).digest()
     return current == root
@@ -1,5 +1,19 @@
+import functools
 import hashlib
 import json
+import re
+from json.encoder import encode_basestring
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover — optional speedup
+    orjson = None  # type: ignore[assignment]
+    _ORJSON_AVAILABLE = False
+
+# Quote and escape a str exactly as `canonicalize` does (ensure_ascii=False).
+# Used by the fixed-layout encoders that emit canonical JSON without a dict.
+json_string = encode_basestring
 
 
 def _json_default(obj):
@@ -22,11 +36,93 @@ def canonicalize(data: dict, exclude_fields: set[str] | None = None) -> bytes:
     ).encode("utf-8")
 
 
+def dumps(data) -> bytes:
+    """Compact JSON bytes for wire, storage and RPC payloads (not hashing).
+
+    Uses orjson when installed. Output is valid JSON either way but not
+    byte-identical across backends (orjson emits raw UTF-8, stdlib escapes
+    to ASCII), so never hash or sign it — that's what `canonicalize` is for.
+    """
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; stdlib handles those
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+# A JSON number of 19+ digits outside any string. orjson reads integers past
+# the 64-bit range as floats, so such documents are left to stdlib, which
+# keeps them exact (a peer's big int must parse the same on every node).
+# Hex hashes never match: their digit runs follow a quote or a hex letter.
+_LONG_INT = re.compile(rb"(?:^|[:,\[\s])-?[0-9]{19}")
+_LONG_INT_TEXT = re.compile(r"(?:^|[:,\[\s])-?[0-9]{19}")
+
+
+def loads(data: bytes | bytearray | memoryview | str):
+    """Parse JSON from a str or UTF-8 bytes-like object, the inverse of `dumps`.
+
+    Uses orjson when installed, which reads bytes without a decode copy.
+    Documents with integers that may not fit 64 bits, and anything orjson
+    rejects, go through stdlib, so malformed input raises the same
+    json.JSONDecodeError / UnicodeDecodeError either way.
+    """
+    if _ORJSON_AVAILABLE:
+        long_int = _LONG_INT_TEXT if isinstance(data, str) else _LONG_INT
+        if long_int.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    if not isinstance(data, str):
+        data = str(data, "utf-8")
+    return json.loads(data)
+
+
+def memoize_to_dict(build):
+    """Cache a `to_dict` result on the instance under `_dict`.
+
+    The owning class must drop `_dict` whenever a field is assigned. Callers
+    get a fresh shallow copy, so mutating the result can't poison the cache.
+    """
+    @functools.wraps(build)
+    def to_dict(self) -> dict:
+        d = self.__dict__.get("_dict")
+        if d is None:
+            d = self._dict = build(self)
+        return dict(d)
+    return to_dict
+
+
 def sha256(data: bytes) -> bytes:
     """Compute SHA-256 hash."""
     return hashlib.sha256(data).digest()
 
 
+def sha256_backend() -> str:
+    """Describe the SHA-256 implementation in use, for startup logging.
+
+    CPython's hashlib goes through OpenSSL's EVP interface, which already
+    dispatches to SHA-NI / ARMv8 SHA2 instructions when the CPU has them
+    (OPENSSL_ia32cap can mask them off for benchmarking). The builtin
+    fallback only appears on interpreters built without OpenSSL.
+    """
+    if getattr(hashlib.sha256, "__name__", "") != "openssl_sha256":
+        return "builtin (no OpenSSL, no hardware acceleration)"
+    import ssl
+    accel = "unknown CPU support"
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = set(f.read().split())
+        if "sha_ni" in flags or "sha2" in flags:
+            accel = "hardware SHA available"
+        else:
+            accel = "no hardware SHA"
+    except OSError:
+        pass
+    return f"{ssl.OPENSSL_VERSION}, {accel}"
+
+
 def compute_hash(data: dict, exclude_fields: set[str] | None = None) -> bytes:
     """Compute SHA-256 of canonical JSON representation."""
     return sha256(canonicalize(data, exclude_fields))
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import copy
+import bisect
+import hashlib
+import heapq
 from dataclasses import dataclass
 
-from jiji.core.merkle import merkle_root
-from jiji.core.serialization import canonicalize, sha256
+from jiji.core.merkle import merkle_levels, merkle_root, updated_root
+from jiji.core.serialization import sha256
 from jiji.core.transaction import Coinbase, Endorse, Post, Transfer, Transaction
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     """An account in the world state."""
 
@@ -20,9 +22,12 @@ class WorldState:
     """Tracks all account balances and nonces. Supports state transitions.
 
     Maintains a per-pubkey leaf hash cache so `state_root()` only re-hashes
-    accounts that have actually changed since the last call. The tree itself
-    is re-assembled from the cached leaves on each call (sorted-pubkey
-    ordering means we can't reuse tree internals when the key set shifts).
+    accounts that have actually changed since the last call. The tree levels
+    are kept too: while the key set is unchanged, only the paths above dirty
+    leaves are re-hashed. A new account shifts the sorted leaf positions, so
+    it drops the levels and the next call rebuilds them from cached leaves.
+    Pubkeys are kept in a sorted list as accounts are created, so the tree
+    build doesn't re-sort the whole key set every block.
     """
 
     def __init__(self):
@@ -30,6 +35,11 @@ class WorldState:
         # pubkey -> sha256(canonicalized leaf)
         self._leaf_cache: dict[bytes, bytes] = {}
         self._dirty: set[bytes] = set()
+        # Sorted view of `accounts` keys (accounts are never removed)
+        self._sorted_keys: list[bytes] = []
+        # merkle_levels over the leaves of _sorted_keys as of the last refresh
+        # (stale only at _dirty keys), or None to rebuild.
+        self._levels: list[list[bytes]] | None = None
 
     def _invalidate(self, pubkey: bytes) -> None:
         self._dirty.add(pubkey)
@@ -41,32 +51,41 @@ class WorldState:
 
     def get_or_create(self, pubkey: bytes) -> Account:
         """Get an existing account or create one with zero balance."""
-        if pubkey not in self.accounts:
-            self.accounts[pubkey] = Account()
+        account = self.accounts.get(pubkey)
+        if account is None:
+            account = self.accounts[pubkey] = Account()
+            bisect.insort(self._sorted_keys, pubkey)
+            self._levels = None
             self._invalidate(pubkey)
-        return self.accounts[pubkey]
+        return account
 
     def apply_transaction(
         self, tx: Transaction, miner: bytes, target_author: bytes | None = None
     ) -> None:
         """Apply a single transaction to the state. Assumes already validated."""
-        if isinstance(tx, Coinbase):
-            self._apply_coinbase(tx)
-        elif isinstance(tx, Post):
-            self._apply_post(tx, miner)
-        elif isinstance(tx, Endorse):
-            self._apply_endorse(tx, miner, target_author)
-        elif isinstance(tx, Transfer):
-            self._apply_transfer(tx, miner)
-        else:
-            raise ValueError(f"unknown transaction type: {type(tx)}")
-
-    def _apply_coinbase(self, tx: Coinbase) -> None:
+        apply = _APPLIERS.get(type(tx))
+        if apply is None:
+            # Subclasses of the tx types miss the exact-type table.
+            apply = next(
+                (fn for base, fn in _APPLIERS.items() if isinstance(tx, base)), None,
+            )
+            if apply is None:
+                raise ValueError(f"unknown transaction type: {type(tx)}")
+        apply(self, tx, miner, target_author)
+
+    # The appliers share one signature so apply_transaction can dispatch
+    # through a type-keyed table.
+
+    def _apply_coinbase(
+        self, tx: Coinbase, miner: bytes, target_author: bytes | None = None
+    ) -> None:
         account = self.get_or_create(tx.recipient)
         account.balance += tx.amount
         self._invalidate(tx.recipient)
 
-    def _apply_post(self, tx: Post, miner: bytes) -> None:
+    def _apply_post(
+        self, tx: Post, miner: bytes, target_author: bytes | None = None
+    ) -> None:
         author = self.get_or_create(tx.author)
         author.balance -= tx.gas_fee
         author.nonce += 1
@@ -76,7 +95,7 @@ class WorldState:
         self._invalidate(miner)
 
     def _apply_endorse(
-        self, tx: Endorse, miner: bytes, target_author: bytes | None
+        self, tx: Endorse, miner: bytes, target_author: bytes | None = None
     ) -> None:
         author = self.get_or_create(tx.author)
         author.balance -= tx.gas_fee + tx.amount
@@ -90,7 +109,9 @@ class WorldState:
             recipient.balance += tx.amount
             self._invalidate(target_author)
 
-    def _apply_transfer(self, tx: Transfer, miner: bytes) -> None:
+    def _apply_transfer(
+        self, tx: Transfer, miner: bytes, target_author: bytes | None = None
+    ) -> None:
         sender = self.get_or_create(tx.sender)
         sender.balance -= tx.amount + tx.gas_fee
         sender.nonce += 1
@@ -107,28 +128,143 @@ class WorldState:
         if cached is not None:
             return cached
         account = self.accounts[pubkey]
-        leaf_data = canonicalize({
-            "pubkey": pubkey.hex(),
-            "balance": account.balance,
-            "nonce": account.nonce,
-        })
-        h = sha256(leaf_data)
+        # Canonical JSON of {"pubkey", "balance", "nonce"}, spelled out in
+        # sorted-key order so leaves don't go through dict + json.dumps.
+        leaf_data = (
+            f'{{"balance":{account.balance},"nonce":{account.nonce},'
+            f'"pubkey":"{pubkey.hex()}"}}'
+        ).encode()
+        h = hashlib.sha256(leaf_data).digest()
         self._leaf_cache[pubkey] = h
         return h
 
+    def _fresh_levels(self) -> list[list[bytes]] | None:
+        """The state tree's levels brought up to date, or None if empty."""
+        keys = self._sorted_keys
+        if len(keys) != len(self.accounts):
+            # Accounts were inserted behind our back; resync the sorted view.
+            keys = self._sorted_keys = sorted(self.accounts)
+            self._levels = None
+        levels = self._levels
+        if not keys:
+            levels = None
+        elif levels is None:
+            cache = self._leaf_cache
+            levels = self._levels = merkle_levels(
+                [cache.get(pk) or self._leaf_hash(pk) for pk in keys]
+            )
+        elif self._dirty:
+            changed = {}
+            for pk in self._dirty:
+                i = bisect.bisect_left(keys, pk)
+                if i < len(keys) and keys[i] == pk:
+                    changed[i] = self._leaf_hash(pk)
+            updated_root(levels, changed, in_place=True)
+        self._dirty.clear()
+        return levels
+
     def state_root(self) -> bytes:
         """Compute Merkle root of the world state (using cached leaf hashes)."""
-        if not self.accounts:
-            self._dirty.clear()
-            return sha256(b"")
-        leaf_hashes = [self._leaf_hash(pk) for pk in sorted(self.accounts.keys())]
-        self._dirty.clear()
-        return merkle_root(leaf_hashes)
+        levels = self._fresh_levels()
+        return sha256(b"") if levels is None else levels[-1][0]
+
+    def overlay(self) -> StateOverlay:
+        """A scratch state that reads through to this one.
+
+        Accounts are copied only when first written, so forking the state
+        for a block template or a validation pass costs nothing up front.
+        This state must not change while the overlay is in use.
+        """
+        return StateOverlay(self)
 
     def copy(self) -> WorldState:
         """Create a deep copy of this state."""
         new_state = WorldState()
-        new_state.accounts = copy.deepcopy(self.accounts)
+        # Accounts are two ints; cloning them directly is far cheaper than
+        # going through copy.deepcopy's generic machinery.
+        new_state.accounts = {
+            pk: Account(acct.balance, acct.nonce) for pk, acct in self.accounts.items()
+        }
         new_state._leaf_cache = dict(self._leaf_cache)
         new_state._dirty = set(self._dirty)
+        new_state._sorted_keys = list(self._sorted_keys)
+        if self._levels is not None:
+            new_state._levels = [list(level) for level in self._levels]
+        return new_state
+
+
+class StateOverlay(WorldState):
+    """Copy-on-write view over a base `WorldState` (see `WorldState.overlay`).
+
+    `accounts` holds only the accounts written through the overlay; reads of
+    anything else fall through to the base. Leaf hashes of untouched
+    accounts come from the base's cache.
+    """
+
+    def __init__(self, base: WorldState):
+        super().__init__()
+        self._base = base
+        # Sorted pubkeys created by the overlay (absent from the base)
+        self._new_keys: list[bytes] = []
+
+    def get_account(self, pubkey: bytes) -> Account | None:
+        account = self.accounts.get(pubkey)
+        if account is None:
+            account = self._base.accounts.get(pubkey)
+        return account
+
+    def get_or_create(self, pubkey: bytes) -> Account:
+        account = self.accounts.get(pubkey)
+        if account is None:
+            base_account = self._base.accounts.get(pubkey)
+            if base_account is None:
+                account = Account()
+                bisect.insort(self._new_keys, pubkey)
+            else:
+                account = Account(base_account.balance, base_account.nonce)
+            self.accounts[pubkey] = account
+            self._invalidate(pubkey)
+        return account
+
+    def state_root(self) -> bytes:
+        base = self._base
+        base_levels = base._fresh_levels()
+        keys = base._sorted_keys
+        if base_levels is not None and not self._new_keys:
+            # Same key set as the base: patch the paths of the accounts
+            # written here into the base's tree without touching it.
+            self._dirty.clear()
+            return updated_root(base_levels, {
+                bisect.bisect_left(keys, pk): self._leaf_hash(pk) for pk in self.accounts
+            })
+        if self._new_keys:
+            keys = list(heapq.merge(keys, self._new_keys))
+        self._dirty.clear()
+        if not keys:
+            return sha256(b"")
+        local, base_cache = self.accounts, base._leaf_cache
+        leaf_hashes = [
+            self._leaf_hash(pk) if pk in local
+            else base_cache.get(pk) or base._leaf_hash(pk)
+            for pk in keys
+        ]
+        return merkle_root(leaf_hashes)
+
+    def copy(self) -> WorldState:
+        """Materialize the overlay into an independent `WorldState`."""
+        new_state = self._base.copy()
+        for pk, acct in self.accounts.items():
+            if pk not in new_state.accounts:
+                bisect.insort(new_state._sorted_keys, pk)
+                new_state._levels = None
+            new_state.accounts[pk] = Account(acct.balance, acct.nonce)
+            new_state._invalidate(pk)
         return new_state
+
+
+_APPLIERS = {
+    Coinbase: WorldState._apply_coinbase,
+    Post: WorldState._apply_post,
+    Endorse: WorldState._apply_endorse,
+    Transfer: WorldState._apply_transfer,
+}
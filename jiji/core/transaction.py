@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from jiji.core.crypto import sign, verify
-from jiji.core.serialization import canonicalize, compute_hash
+from jiji.core.serialization import canonicalize, json_string, memoize_to_dict, sha256
 
 _SIGNATURE_FIELD = {"signature"}
 
@@ -24,7 +24,85 @@ def _from_hex(s: str | None) -> bytes | None:
     return bytes.fromhex(s)
 
 
-class Signable:
+def _hex_or_null(b: bytes | None) -> bytes:
+    """JSON fragment for an optional bytes field."""
+    if b is None:
+        return b"null"
+    return b'"%s"' % b.hex().encode()
+
+
+# Canonical JSON layouts (sorted keys, compact separators) built once at
+# import and filled with %-formatting. The fast encoders only accept plain
+# ints and bytes -- a bool would print as 1 instead of true -- and hand
+# anything else to canonicalize() so the bytes can't diverge.
+_POST_TEMPLATE = (
+    b'{"author":"%s","body":%s,"gas_fee":%d,"nonce":%d,'
+    b'"reply_to":%s,"timestamp":%d,"tx_type":"post"}'
+)
+_ENDORSE_TEMPLATE = (
+    b'{"amount":%d,"author":"%s","gas_fee":%d,"message":%s,'
+    b'"nonce":%d,"target":"%s","tx_type":"endorse"}'
+)
+_TRANSFER_TEMPLATE = (
+    b'{"amount":%d,"gas_fee":%d,"nonce":%d,"recipient":"%s",'
+    b'"sender":"%s","tx_type":"transfer"}'
+)
+_COINBASE_TEMPLATE = (
+    b'{"amount":%d,"height":%d,"recipient":"%s","tx_type":"coinbase"}'
+)
+
+
+class _Memoized:
+    """Memoizes the preimage, `tx_hash`, `to_dict` and the signature check.
+
+    Assigning any field drops the memos that depend on it. Private
+    attributes and the signature are not part of the hash preimage, so
+    re-signing keeps the cached hash.
+    """
+
+    def __setattr__(self, name: str, value) -> None:
+        if name[0] != "_":
+            d = self.__dict__
+            d.pop("_dict", None)
+            d.pop("_size", None)
+            d.pop("_sig_ok", None)
+            if name != "signature":
+                d.pop("_preimage", None)
+                d.pop("_tx_hash", None)
+        object.__setattr__(self, name, value)
+
+    def canonical_bytes(self) -> bytes:
+        raise NotImplementedError
+
+    def _cached_preimage(self) -> bytes:
+        b = self.__dict__.get("_preimage")
+        if b is None:
+            b = self._preimage = self.canonical_bytes()
+        return b
+
+    def preimage_size(self) -> int:
+        """Byte length of `canonical_bytes()`, from the memoized preimage."""
+        return len(self._cached_preimage())
+
+    def tx_hash(self) -> bytes:
+        """Content address: SHA-256 of the canonical serialization."""
+        h = self.__dict__.get("_tx_hash")
+        if h is None:
+            h = self._tx_hash = sha256(self._cached_preimage())
+        return h
+
+    def serialized_size(self) -> int:
+        """Byte length of `canonicalize(self.to_dict())`, signature included."""
+        n = self.__dict__.get("_size")
+        if n is None:
+            n = self._size = self._full_size()
+        return n
+
+    def _full_size(self) -> int:
+        return len(canonicalize(self.to_dict()))
+
+
+class Signable(_Memoized):
     """Mixin providing signing, verification, and hashing for transactions."""
 
     signature: bytes
@@ -36,21 +114,52 @@ class Signable:
     def signer_key(self) -> bytes:
         raise NotImplementedError
 
-    def tx_hash(self) -> bytes:
-        """Content address: SHA-256 of canonical serialization excluding signature."""
-        return compute_hash(self.to_dict(), exclude_fields=_SIGNATURE_FIELD)
+    def canonical_bytes(self) -> bytes:
+        """Canonical serialization excluding signature (the signing payload)."""
+        return canonicalize(self.to_dict(), exclude_fields=_SIGNATURE_FIELD)
+
+    def _full_size(self) -> int:
+        # The full serialization is the signing payload plus one
+        # `,"signature":...` member, so its length follows without encoding.
+        sig = self.signature
+        if sig is None:
+            sig_len = 4  # null
+        elif type(sig) is bytes:
+            sig_len = 2 * len(sig) + 2  # quoted hex
+        else:
+            return super()._full_size()
+        return len(self._cached_preimage()) + len(',"signature":') + sig_len
+
+    def signing_payload(self) -> bytes:
+        """The bytes that get signed: `canonical_bytes()`, memoized."""
+        return self._cached_preimage()
 
     def sign_tx(self, private_key: bytes) -> None:
         """Sign this transaction with the given private key."""
-        payload = canonicalize(self.to_dict(), exclude_fields=_SIGNATURE_FIELD)
-        self.signature = sign(private_key, payload)
+        self.signature = sign(private_key, self.signing_payload())
 
     def verify_signature(self) -> bool:
-        """Verify the transaction signature against the signer's public key."""
-        if not self.signature:
-            return False
-        payload = canonicalize(self.to_dict(), exclude_fields=_SIGNATURE_FIELD)
-        return verify(self.signer_key, payload, self.signature)
+        """Verify the transaction signature against the signer's public key.
+
+        The result is memoized until a field (or the signature) changes, so
+        a tx checked on mempool entry isn't re-verified when it shows up in
+        a block we mined or in a fork replay.
+        """
+        ok = self.__dict__.get("_sig_ok")
+        if ok is None:
+            ok = bool(self.signature) and verify(
+                self.signer_key, self.signing_payload(), self.signature,
+            )
+            self._sig_ok = ok
+        return ok
+
+    def signature_verified(self) -> bool:
+        """True if a previous check already found the signature valid."""
+        return self.__dict__.get("_sig_ok") is True
+
+    def mark_signature_verified(self) -> None:
+        """Record a successful external (e.g. batch) signature check."""
+        self._sig_ok = True
 
 
 @dataclass
@@ -69,6 +178,18 @@ class Post(Signable):
     def signer_key(self) -> bytes:
         return self.author
 
+    def canonical_bytes(self) -> bytes:
+        if not (type(self.nonce) is int and type(self.timestamp) is int
+                and type(self.gas_fee) is int and type(self.body) is str
+                and type(self.author) is bytes
+                and (self.reply_to is None or type(self.reply_to) is bytes)):
+            return super().canonical_bytes()
+        return _POST_TEMPLATE % (
+            self.author.hex().encode(), json_string(self.body).encode("utf-8"),
+            self.gas_fee, self.nonce, _hex_or_null(self.reply_to), self.timestamp,
+        )
+
+    @memoize_to_dict
     def to_dict(self) -> dict:
         return {
             "tx_type": "post",
@@ -110,6 +231,18 @@ class Endorse(Signable):
     def signer_key(self) -> bytes:
         return self.author
 
+    def canonical_bytes(self) -> bytes:
+        if not (type(self.nonce) is int and type(self.amount) is int
+                and type(self.gas_fee) is int and type(self.message) is str
+                and type(self.author) is bytes and type(self.target) is bytes):
+            return super().canonical_bytes()
+        return _ENDORSE_TEMPLATE % (
+            self.amount, self.author.hex().encode(), self.gas_fee,
+            json_string(self.message).encode("utf-8"), self.nonce,
+            self.target.hex().encode(),
+        )
+
+    @memoize_to_dict
     def to_dict(self) -> dict:
         return {
             "tx_type": "endorse",
@@ -150,6 +283,17 @@ class Transfer(Signable):
     def signer_key(self) -> bytes:
         return self.sender
 
+    def canonical_bytes(self) -> bytes:
+        if not (type(self.amount) is int and type(self.nonce) is int
+                and type(self.gas_fee) is int and type(self.sender) is bytes
+                and type(self.recipient) is bytes):
+            return super().canonical_bytes()
+        return _TRANSFER_TEMPLATE % (
+            self.amount, self.gas_fee, self.nonce,
+            self.recipient.hex().encode(), self.sender.hex().encode(),
+        )
+
+    @memoize_to_dict
     def to_dict(self) -> dict:
         return {
             "tx_type": "transfer",
@@ -174,13 +318,14 @@ class Transfer(Signable):
 
 
 @dataclass
-class Coinbase:
+class Coinbase(_Memoized):
     """Block reward transaction. Validity comes from the block, not a signature."""
 
     recipient: bytes
     amount: int
     height: int
 
+    @memoize_to_dict
     def to_dict(self) -> dict:
         return {
             "tx_type": "coinbase",
@@ -189,9 +334,17 @@ class Coinbase:
             "height": self.height,
         }
 
-    def tx_hash(self) -> bytes:
-        """Content address: SHA-256 of canonical serialization."""
-        return compute_hash(self.to_dict())
+    def _full_size(self) -> int:
+        return len(self._cached_preimage())
+
+    def canonical_bytes(self) -> bytes:
+        """Canonical serialization (coinbase has no signature to exclude)."""
+        if not (type(self.amount) is int and type(self.height) is int
+                and type(self.recipient) is bytes):
+            return canonicalize(self.to_dict())
+        return _COINBASE_TEMPLATE % (
+            self.amount, self.height, self.recipient.hex().encode(),
+        )
 
     @classmethod
     def from_dict(cls, d: dict) -> Coinbase:
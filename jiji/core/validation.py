@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import statistics
+from collections import ChainMap
+from collections.abc import Mapping
 from typing import TYPE_CHECKING
 
 from jiji.core.block import Block
@@ -20,6 +21,7 @@ from jiji.core.config import (
     PROTOCOL_VERSION,
     block_reward,
 )
+from jiji.core.crypto import verify_batch
 from jiji.core.merkle import merkle_root
 from jiji.core.state import WorldState
 from jiji.core.transaction import Coinbase, Endorse, Post, Transfer, Transaction
@@ -35,7 +37,7 @@ class ValidationError(Exception):
 # -- Transaction format validation --
 
 
-def validate_post_format(tx: Post) -> None:
+def validate_post_format(tx: Post, check_signature: bool = True) -> None:
     """Validate post structure and signature."""
     if not isinstance(tx.body, str) or not tx.body:
         raise ValidationError("post body must be a non-empty string")
@@ -49,11 +51,11 @@ def validate_post_format(tx: Post) -> None:
         raise ValidationError(f"gas fee below minimum ({MINIMUM_GAS_FEE})")
     if tx.reply_to is not None and len(tx.reply_to) != 32:
         raise ValidationError("reply_to must be 32 bytes or null")
-    if not tx.verify_signature():
+    if check_signature and not tx.verify_signature():
         raise ValidationError("invalid post signature")
 
 
-def validate_endorse_format(tx: Endorse) -> None:
+def validate_endorse_format(tx: Endorse, check_signature: bool = True) -> None:
     """Validate endorsement structure and signature."""
     if len(tx.author) != 32:
         raise ValidationError("author key must be 32 bytes")
@@ -67,11 +69,11 @@ def validate_endorse_format(tx: Endorse) -> None:
         raise ValidationError(f"message exceeds {ENDORSE_MESSAGE_LIMIT} chars")
     if tx.gas_fee < MINIMUM_GAS_FEE:
         raise ValidationError(f"gas fee below minimum ({MINIMUM_GAS_FEE})")
-    if not tx.verify_signature():
+    if check_signature and not tx.verify_signature():
         raise ValidationError("invalid endorsement signature")
 
 
-def validate_transfer_format(tx: Transfer) -> None:
+def validate_transfer_format(tx: Transfer, check_signature: bool = True) -> None:
     """Validate transfer structure and signature."""
     if len(tx.sender) != 32:
         raise ValidationError("sender key must be 32 bytes")
@@ -85,7 +87,7 @@ def validate_transfer_format(tx: Transfer) -> None:
         raise ValidationError("nonce must be non-negative")
     if tx.gas_fee < MINIMUM_GAS_FEE:
         raise ValidationError(f"gas fee below minimum ({MINIMUM_GAS_FEE})")
-    if not tx.verify_signature():
+    if check_signature and not tx.verify_signature():
         raise ValidationError("invalid transfer signature")
 
 
@@ -102,18 +104,39 @@ def validate_coinbase_format(tx: Coinbase, expected_height: int) -> None:
         )
 
 
-def validate_transaction_format(tx: Transaction, expected_height: int = 0) -> None:
-    """Dispatch format validation to the appropriate type handler."""
-    if isinstance(tx, Post):
-        validate_post_format(tx)
-    elif isinstance(tx, Endorse):
-        validate_endorse_format(tx)
-    elif isinstance(tx, Transfer):
-        validate_transfer_format(tx)
-    elif isinstance(tx, Coinbase):
-        validate_coinbase_format(tx, expected_height)
+def validate_transaction_format(
+    tx: Transaction, expected_height: int = 0, check_signature: bool = True,
+) -> None:
+    """Dispatch format validation to the appropriate type handler.
+
+    `check_signature=False` skips signature verification for callers that
+    have already verified it (e.g. a block's batch check).
+    """
+    check_format, _ = _rules_for(tx)
+    if isinstance(tx, Coinbase):
+        check_format(tx, expected_height)
     else:
-        raise ValidationError(f"unknown transaction type: {type(tx)}")
+        check_format(tx, check_signature)
+
+
+def batch_verify_signatures(txs: list[Transaction]) -> bool:
+    """Verify every signed tx's signature in one batch.
+
+    Txs already known to be valid are skipped. On success each tx is marked
+    verified, so later `verify_signature()` calls are free. Returns False if
+    any signature is bad; the caller re-checks one by one to find which.
+    """
+    unchecked = [
+        tx for tx in txs
+        if isinstance(tx, (Post, Endorse, Transfer)) and not tx.signature_verified()
+    ]
+    if not verify_batch([
+        (tx.signer_key, tx.signing_payload(), tx.signature) for tx in unchecked
+    ]):
+        return False
+    for tx in unchecked:
+        tx.mark_signature_verified()
+    return True
 
 
 # -- State validation (balance, nonce) --
@@ -122,7 +145,7 @@ def validate_transaction_format(tx: Transaction, expected_height: int = 0) -> No
 def validate_transaction_state(
     tx: Transaction,
     state: WorldState,
-    post_authors: dict[bytes, bytes],
+    post_authors: Mapping[bytes, bytes],
     height: int = 0,
 ) -> None:
     """Validate a transaction against the current world state.
@@ -131,18 +154,12 @@ def validate_transaction_state(
     height this tx would land in, used to gate hard-fork rules (e.g.
     self-endorsement ban).
     """
-    if isinstance(tx, Post):
-        _validate_post_state(tx, state, post_authors)
-    elif isinstance(tx, Endorse):
-        _validate_endorse_state(tx, state, post_authors, height)
-    elif isinstance(tx, Transfer):
-        _validate_transfer_state(tx, state)
-    elif isinstance(tx, Coinbase):
-        pass  # coinbase has no state preconditions
+    _, check_state = _rules_for(tx)
+    check_state(tx, state, post_authors, height)
 
 
 def _validate_post_state(
-    tx: Post, state: WorldState, post_authors: dict[bytes, bytes]
+    tx: Post, state: WorldState, post_authors: Mapping[bytes, bytes], height: int
 ) -> None:
     account = state.get_account(tx.author)
     if account is None:
@@ -158,7 +175,7 @@ def _validate_post_state(
 
 
 def _validate_endorse_state(
-    tx: Endorse, state: WorldState, post_authors: dict[bytes, bytes], height: int
+    tx: Endorse, state: WorldState, post_authors: Mapping[bytes, bytes], height: int
 ) -> None:
     account = state.get_account(tx.author)
     if account is None:
@@ -178,7 +195,9 @@ def _validate_endorse_state(
         raise ValidationError("self-endorsement not allowed")
 
 
-def _validate_transfer_state(tx: Transfer, state: WorldState) -> None:
+def _validate_transfer_state(
+    tx: Transfer, state: WorldState, post_authors: Mapping[bytes, bytes], height: int
+) -> None:
     account = state.get_account(tx.sender)
     if account is None:
         raise ValidationError("sender account does not exist")
@@ -191,17 +210,62 @@ def _validate_transfer_state(tx: Transfer, state: WorldState) -> None:
         raise ValidationError("insufficient balance for transfer + gas")
 
 
+def _validate_coinbase_state(
+    tx: Coinbase, state: WorldState, post_authors: Mapping[bytes, bytes], height: int
+) -> None:
+    pass  # coinbase has no state preconditions
+
+
+# (format, state) rules per tx type: one dict lookup per tx instead of an
+# isinstance chain. The coinbase format rule takes the block height where
+# the others take `check_signature`.
+_TX_RULES = {
+    Post: (validate_post_format, _validate_post_state),
+    Endorse: (validate_endorse_format, _validate_endorse_state),
+    Transfer: (validate_transfer_format, _validate_transfer_state),
+    Coinbase: (validate_coinbase_format, _validate_coinbase_state),
+}
+
+
+def _rules_for(tx: Transaction) -> tuple:
+    """The (format, state) rules for a tx; subclasses use their nearest base's."""
+    rules = _TX_RULES.get(type(tx))
+    if rules is not None:
+        return rules
+    for base in type(tx).__mro__[1:]:
+        rules = _TX_RULES.get(base)
+        if rules is not None:
+            return rules
+    raise ValidationError(f"unknown transaction type: {type(tx)}")
+
+
 # -- Difficulty computation --
 
 
 def compute_expected_difficulty(chain: Blockchain, height: int) -> int:
-    """Compute the expected difficulty for a block at the given height."""
+    """Compute the expected difficulty for a block at the given height.
+
+    Off a window boundary this is the parent's difficulty, one indexed
+    lookup. The retarget at a boundary is remembered against the current
+    tip, since the miner's template and validate_block both ask for it.
+    """
     if height == 0:
         return GENESIS_DIFFICULTY
     if height % DIFFICULTY_ADJUSTMENT_WINDOW != 0:
         return chain.get_block_by_height(height - 1).header.difficulty
 
-    # Adjustment window boundary
+    tip_hash = chain.main_chain[-1] if chain.main_chain else None
+    cached = chain._difficulty_cache
+    if cached is not None and cached[0] == tip_hash and cached[1] == height:
+        return cached[2]
+    difficulty = _retarget(chain, height)
+    if tip_hash is not None:
+        chain._difficulty_cache = (tip_hash, height, difficulty)
+    return difficulty
+
+
+def _retarget(chain: Blockchain, height: int) -> int:
+    """Difficulty at an adjustment window boundary."""
     window_end = chain.get_block_by_height(height - 1)
     window_start_height = height - DIFFICULTY_ADJUSTMENT_WINDOW
     window_start = chain.get_block_by_height(window_start_height)
@@ -305,10 +369,9 @@ def validate_block(block: Block, chain: Blockchain, current_time: int) -> None:
         raise ValidationError("prev_hash does not match tip")
 
     # Timestamp: must exceed median of recent blocks
-    if chain.height >= 0:
-        recent = chain.get_recent_timestamps(MEDIAN_TIME_BLOCK_COUNT)
-        if recent and header.timestamp <= statistics.median(recent):
-            raise ValidationError("timestamp not above median of recent blocks")
+    median = chain.median_timestamp(MEDIAN_TIME_BLOCK_COUNT)
+    if median is not None and header.timestamp <= median:
+        raise ValidationError("timestamp not above median of recent blocks")
 
     # Timestamp: not too far in the future
     if header.timestamp > current_time + MAX_FUTURE_TIMESTAMP:
@@ -346,49 +409,57 @@ def validate_block(block: Block, chain: Blockchain, current_time: int) -> None:
         if isinstance(tx, Coinbase):
             raise ValidationError("only one coinbase per block")
 
-    # Validate and apply each transaction on a working state copy
-    working_state = chain.state.copy()
-    working_authors = dict(chain.post_authors)
+    # Merkle root and size are cheap next to signature checks, so a block
+    # with a tampered tx list is rejected before paying for the batch.
+    expected_merkle = block.compute_tx_merkle_root()
+    if header.tx_merkle_root != expected_merkle:
+        raise ValidationError("tx_merkle_root mismatch")
+
+    # Block size limit
+    if block.serialized_size() > MAX_BLOCK_SIZE:
+        raise ValidationError("block exceeds maximum size")
+
+    # Verify all signatures in one batch. If any fails, the per-tx checks
+    # below re-verify one by one so the error names the offending tx.
+    sigs_ok = batch_verify_signatures(block.transactions)
+
+    # Validate and apply each transaction on a copy-on-write working state
+    working_state = chain.state.overlay()
+    working_authors = ChainMap({}, chain.post_authors)
     seen_hashes: set[bytes] = set()
+    tx_index = chain.tx_index
+    height = header.height
+    miner = header.miner
+    check_signature = not sigs_ok
 
     for i, tx in enumerate(block.transactions):
         tx_h = tx.tx_hash()
 
         # No duplicate transactions
-        if tx_h in seen_hashes or tx_h in chain.tx_index:
+        if tx_h in seen_hashes or tx_h in tx_index:
             raise ValidationError(f"duplicate transaction at index {i}")
         seen_hashes.add(tx_h)
 
-        # Format validation
-        validate_transaction_format(tx, header.height)
-
-        # State validation (skip coinbase, already checked). Runs the
-        # self-endorsement hard-fork rule via `height`.
-        if not isinstance(tx, Coinbase):
-            validate_transaction_state(tx, working_state, working_authors, header.height)
-
-        # Resolve target author for endorsement tips
+        # Format, then state, then apply, in one visit per tx. The coinbase
+        # (index 0) was format-checked above and has no state rule. State
+        # checks run the self-endorsement hard-fork rule via `height`.
         target_author = None
-        if isinstance(tx, Endorse) and tx.amount > 0:
-            target_author = working_authors.get(tx.target)
+        if i:
+            check_format, check_state = _rules_for(tx)
+            check_format(tx, check_signature)
+            check_state(tx, working_state, working_authors, height)
+            # Resolve target author for endorsement tips
+            if isinstance(tx, Endorse) and tx.amount > 0:
+                target_author = working_authors.get(tx.target)
 
         # Apply to working state
-        working_state.apply_transaction(tx, header.miner, target_author)
+        working_state.apply_transaction(tx, miner, target_author)
 
         # Track new posts for intra-block reply/endorse references
         if isinstance(tx, Post):
             working_authors[tx_h] = tx.author
 
-    # Merkle root verification
-    expected_merkle = block.compute_tx_merkle_root()
-    if header.tx_merkle_root != expected_merkle:
-        raise ValidationError("tx_merkle_root mismatch")
-
     # State root verification
     expected_state_root = working_state.state_root()
     if header.state_root != expected_state_root:
         raise ValidationError("state_root mismatch")
-
-    # Block size limit
-    if block.serialized_size() > MAX_BLOCK_SIZE:
-        raise ValidationError("block exceeds maximum size")
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
+import bisect
+import itertools
+
 from jiji.core.block import Block
 from jiji.core.config import HARDFORK_HEIGHT, MAX_MEMPOOL_SIZE, RBF_MIN_BUMP_BPS
-from jiji.core.serialization import canonicalize
 from jiji.core.transaction import Coinbase, Post, Endorse, Transfer, Transaction
 from jiji.core.validation import (
     ValidationError,
+    batch_verify_signatures,
     validate_transaction_format,
     validate_transaction_state,
 )
 
-_SIGNATURE_FIELD = {"signature"}
-
 if __import__("typing").TYPE_CHECKING:
     from jiji.core.chain import Blockchain
 
@@ -21,6 +22,9 @@ class Mempool:
 
     Supports out-of-order nonce arrival: transactions with future nonces are
     held in a queue and promoted automatically when earlier nonces fill in.
+
+    Active txs are also kept in a list sorted by miner priority, so
+    `get_pending` is a slice and eviction reads the tail instead of scanning.
     """
 
     def __init__(self, chain: Blockchain, max_size: int = MAX_MEMPOOL_SIZE):
@@ -30,6 +34,14 @@ class Mempool:
         self._pending_nonces: dict[bytes, int] = {}  # pubkey -> next expected nonce
         # queued txs waiting for earlier nonces: pubkey -> {nonce: tx}
         self._queued: dict[bytes, dict[int, Transaction]] = {}
+        # Priority index over _txs: ascending (-gas_per_byte, -gas_fee, seq,
+        # tx_hash), i.e. best first; seq keeps arrival order among ties.
+        self._order: list[tuple] = []
+        self._order_keys: dict[bytes, tuple] = {}
+        self._seq = itertools.count()
+        # Bumped on every insert/removal, so gossip can tell when the pool
+        # changed without diffing it.
+        self.version = 0
 
     @property
     def size(self) -> int:
@@ -38,6 +50,10 @@ class Mempool:
     def __contains__(self, tx_hash: bytes) -> bool:
         return tx_hash in self._txs
 
+    def tx_hashes(self) -> list[bytes]:
+        """Hashes of all pending transactions (no particular order)."""
+        return list(self._txs)
+
     def add(self, tx: Transaction) -> bytes:
         """Validate and add a transaction. Returns tx_hash. Raises ValidationError.
 
@@ -96,7 +112,7 @@ class Mempool:
 
         # RBF replacement: drop the old tx before inserting the new one
         if replaced_hash is not None:
-            del self._txs[replaced_hash]
+            self._discard(replaced_hash)
 
         # nonce matches — validate against chain state or accept as sequential pending.
         # Height used for hard-fork gating is chain.height + 1 (the soonest a
@@ -127,6 +143,44 @@ class Mempool:
 
         return tx_hash
 
+    def add_many(self, txs: list[Transaction]) -> list[bytes]:
+        """Add several transactions, skipping invalid ones. Returns accepted hashes.
+
+        Signatures are checked up front in one batch; `add` then finds them
+        already verified. If the batch fails, each tx is verified on its own
+        as usual and only the bad ones are rejected.
+        """
+        batch_verify_signatures(txs)
+        accepted = []
+        for tx in txs:
+            try:
+                accepted.append(self.add(tx))
+            except ValidationError:
+                continue
+        return accepted
+
+    def mark_known_signatures(self, txs: list[Transaction]) -> int:
+        """Carry over signature checks already done for matching pool txs.
+
+        Blocks from peers arrive as fresh objects, so their txs have lost
+        the verification memo the pooled copies earned on admission. Same
+        tx_hash means same signing payload; if the signature bytes match
+        too, the result is the same and needn't be recomputed. Returns the
+        number of txs marked.
+        """
+        marked = 0
+        pool = self._txs
+        for tx in txs:
+            known = pool.get(tx.tx_hash())
+            if (known is not None and known is not tx
+                    and isinstance(tx, (Post, Endorse, Transfer))
+                    and type(known) is type(tx)
+                    and known.signature_verified()
+                    and known.signature == tx.signature):
+                tx.mark_signature_verified()
+                marked += 1
+        return marked
+
     def _insert(self, tx: Transaction, pubkey: bytes | None) -> None:
         """Insert a tx into the active pool and update nonce tracking."""
         # evict lowest-priority tx (gas-per-byte) if pool is full
@@ -134,14 +188,32 @@ class Mempool:
             tx_priority = _tx_priority(tx)
             lowest_hash, lowest_priority = self._find_lowest_priority()
             if lowest_priority is not None and tx_priority > lowest_priority:
-                del self._txs[lowest_hash]
+                self._discard(lowest_hash)
             else:
                 raise ValidationError("mempool full and fee too low for eviction")
 
-        self._txs[tx.tx_hash()] = tx
+        tx_hash = tx.tx_hash()
+        self._txs[tx_hash] = tx
+        self._index_add(tx_hash, tx)
         if pubkey is not None:
             self._pending_nonces[pubkey] = _get_nonce(tx) + 1
 
+    def _index_add(self, tx_hash: bytes, tx: Transaction) -> None:
+        key = (-_tx_priority(tx), -_get_gas_fee(tx), next(self._seq), tx_hash)
+        bisect.insort(self._order, key)
+        self._order_keys[tx_hash] = key
+        self.version += 1
+
+    def _discard(self, tx_hash: bytes) -> None:
+        """Remove a tx from the active pool and the priority index."""
+        if self._txs.pop(tx_hash, None) is not None:
+            self.version += 1
+        key = self._order_keys.pop(tx_hash, None)
+        if key is not None:
+            i = bisect.bisect_left(self._order, key)
+            if i < len(self._order) and self._order[i] == key:
+                del self._order[i]
+
     def _promote_queued(self, pubkey: bytes) -> None:
         """Move queued txs into the active pool if their nonce is now expected."""
         if pubkey not in self._queued:
@@ -192,26 +264,28 @@ class Mempool:
 
     def remove(self, tx_hash: bytes) -> None:
         """Remove a single transaction by hash."""
-        self._txs.pop(tx_hash, None)
+        self._discard(tx_hash)
 
     def remove_confirmed(self, block: Block) -> None:
         """Remove all transactions that appear in a confirmed block."""
         for tx in block.transactions:
-            self._txs.pop(tx.tx_hash(), None)
+            self._discard(tx.tx_hash())
         self._rebuild_pending_nonces()
 
     def revalidate(self) -> list[bytes]:
         """Purge transactions no longer valid against current state. Returns removed hashes."""
-        removed = []
+        state = self._chain.state
+        post_authors = self._chain.post_authors
         next_height = self._chain.height + 1
-        for tx_hash, tx in list(self._txs.items()):
+        # collect first, then discard, instead of copying the whole pool
+        removed = []
+        for tx_hash, tx in self._txs.items():
             try:
-                validate_transaction_state(
-                    tx, self._chain.state, self._chain.post_authors, next_height,
-                )
+                validate_transaction_state(tx, state, post_authors, next_height)
             except ValidationError:
-                del self._txs[tx_hash]
                 removed.append(tx_hash)
+        for tx_hash in removed:
+            self._discard(tx_hash)
         self._rebuild_pending_nonces()
         # try to promote queued txs (chain state may have advanced)
         for pubkey in list(self._queued.keys()):
@@ -229,14 +303,9 @@ class Mempool:
         absolute fee (matches intuition and keeps the old tests' ordering when
         tx sizes are uniform).
         """
-        txs = sorted(
-            self._txs.values(),
-            key=lambda t: (_tx_priority(t), _get_gas_fee(t)),
-            reverse=True,
-        )
-        if limit is not None:
-            txs = txs[:limit]
-        return txs
+        order = self._order if limit is None else self._order[:limit]
+        txs = self._txs
+        return [txs[key[-1]] for key in order]
 
     def next_nonce(self, pubkey: bytes) -> int:
         """Return the next nonce to use for a given account (accounting for pending + queued txs)."""
@@ -261,31 +330,16 @@ class Mempool:
                 self._pending_nonces[pubkey] = next_nonce
 
     def _find_lowest_priority(self) -> tuple[bytes | None, float | None]:
-        """Find the transaction with the lowest gas-per-byte ratio."""
-        lowest_hash = None
-        lowest_priority: float | None = None
-        for tx_hash, tx in self._txs.items():
-            priority = _tx_priority(tx)
-            if lowest_priority is None or priority < lowest_priority:
-                lowest_hash = tx_hash
-                lowest_priority = priority
-        return lowest_hash, lowest_priority
+        """The pool's lowest-priority tx (by gas-per-byte) and its priority."""
+        if not self._order:
+            return None, None
+        key = self._order[-1]
+        return key[-1], -key[0]
 
 
 def _tx_size(tx: Transaction) -> int:
-    """Canonical serialization size in bytes, memoized on the tx object."""
-    cached = getattr(tx, "_jiji_size", None)
-    if cached is not None:
-        return cached
-    if isinstance(tx, Coinbase):
-        size = len(canonicalize(tx.to_dict()))
-    else:
-        size = len(canonicalize(tx.to_dict(), exclude_fields=_SIGNATURE_FIELD))
-    try:
-        tx._jiji_size = size  # type: ignore[attr-defined]
-    except (AttributeError, TypeError):
-        pass
-    return size
+    """Canonical serialization size in bytes (the tx's memoized preimage)."""
+    return tx.preimage_size()
 
 
 def _tx_priority(tx: Transaction) -> float:
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
-import statistics
+import hashlib
+import itertools
 import time
+from collections import ChainMap
 
-from jiji.core.block import Block, BlockHeader
+from jiji.core.block import Block, BlockHeader, difficulty_target_bytes
 from jiji.core.config import MAX_BLOCK_SIZE, MEDIAN_TIME_BLOCK_COUNT, PROTOCOL_VERSION, block_reward
-from jiji.core.merkle import merkle_root
+from jiji.core.merkle import MerkleAccumulator
 from jiji.core.state import WorldState
 from jiji.core.transaction import Coinbase, Endorse, Post, Transaction
-from jiji.core.validation import ValidationError, compute_expected_difficulty
+from jiji.core.validation import (
+    ValidationError,
+    compute_expected_difficulty,
+    validate_transaction_format,
+    validate_transaction_state,
+)
 from jiji.mining.mempool import Mempool
 
 if __import__("typing").TYPE_CHECKING:
     from jiji.core.chain import Blockchain
 
 
+# Block framing plus a generous bound on the canonical header (four hex
+# hashes and six ints come to ~420 bytes), so templates never exceed
+# MAX_BLOCK_SIZE once the header is filled in.
+_BLOCK_SIZE_OVERHEAD = 600
+
+
 class Miner:
     """Assembles candidate blocks from the mempool and mines them via PoW."""
 
@@ -30,36 +43,36 @@ class Miner:
         difficulty = compute_expected_difficulty(self._chain, height)
         # ensure timestamp exceeds median of recent blocks
         timestamp = int(time.time())
-        recent = self._chain.get_recent_timestamps(MEDIAN_TIME_BLOCK_COUNT)
-        if recent:
-            median = int(statistics.median(recent))
-            timestamp = max(timestamp, median + 1)
+        median = self._chain.median_timestamp(MEDIAN_TIME_BLOCK_COUNT)
+        if median is not None:
+            timestamp = max(timestamp, int(median) + 1)
 
         # coinbase
         reward = block_reward(height)
         coinbase = Coinbase(recipient=self._pubkey, amount=reward, height=height)
         selected: list[Transaction] = [coinbase]
+        # tx root and block size grow with the selection instead of being
+        # recomputed over every selected tx for each candidate
+        tx_tree = MerkleAccumulator([coinbase.tx_hash()])
+        block_size = _BLOCK_SIZE_OVERHEAD + coinbase.serialized_size()
 
         # simulate state to select valid transactions
-        working_state = self._chain.state.copy()
+        working_state = self._chain.state.overlay()
         working_state.apply_transaction(coinbase, self._pubkey)
-        working_authors = dict(self._chain.post_authors)
+        # writes land in the front map; the chain's own map is never copied
+        working_authors = ChainMap({}, self._chain.post_authors)
 
         for tx in self._mempool.get_pending():
             try:
                 # validate against working state (nonce and balance may have shifted)
-                from jiji.core.validation import (
-                    validate_transaction_format,
-                    validate_transaction_state,
-                )
                 validate_transaction_format(tx)
                 validate_transaction_state(tx, working_state, working_authors, height)
             except ValidationError:
                 continue
 
-            # check block size won't be exceeded
-            test_txs = selected + [tx]
-            if _estimate_block_size(test_txs) > MAX_BLOCK_SIZE:
+            # check block size won't be exceeded (+1 for the separating comma)
+            tx_size = tx.serialized_size() + 1
+            if block_size + tx_size > MAX_BLOCK_SIZE:
                 break
 
             # resolve target author for endorsement tips
@@ -69,13 +82,15 @@ class Miner:
 
             working_state.apply_transaction(tx, self._pubkey, target_author)
             selected.append(tx)
+            tx_tree.add(tx.tx_hash())
+            block_size += tx_size
 
             if isinstance(tx, Post):
                 working_authors[tx.tx_hash()] = tx.author
 
-        # compute roots
-        tx_hashes = [tx.tx_hash() for tx in selected]
-        tx_root = merkle_root(tx_hashes)
+        # compute roots (the overlay reads the chain's leaf cache, so only
+        # accounts touched by the selected txs are re-hashed)
+        tx_root = tx_tree.root()
         state_root = working_state.state_root()
 
         header = BlockHeader(
@@ -93,13 +108,19 @@ class Miner:
         return Block(header=header, transactions=selected)
 
     def mine_block(self, block: Block, max_iterations: int = 0) -> Block | None:
-        """Grind nonce until PoW is satisfied. Returns solved block or None."""
-        iterations = 0
-        while not block.meets_difficulty():
-            block.header.nonce += 1
-            iterations += 1
-            if max_iterations > 0 and iterations >= max_iterations:
-                return None
+        """Grind nonce until PoW is satisfied. Returns solved block or None.
+
+        Tries nonces starting at `header.nonce`; on giving up, leaves the
+        header at the next untried nonce so a later call resumes there.
+        """
+        header = block.header
+        if header.difficulty == 1:
+            # Any nonce meets MAX_TARGET (see Block.meets_difficulty)
+            return block
+        nonce = _grind(header, max_iterations)
+        if nonce is None:
+            return None
+        header.nonce = nonce
         return block
 
     def mine_next(self, current_time: int | None = None) -> Block | None:
@@ -114,10 +135,27 @@ class Miner:
         return block
 
 
-def _estimate_block_size(txs: list[Transaction]) -> int:
-    """Rough byte estimate for a block containing these transactions."""
-    # each tx serializes to roughly its dict JSON size
-    total = 200  # header overhead estimate
-    for tx in txs:
-        total += len(str(tx.to_dict()))
-    return total
+def _grind(header: BlockHeader, max_iterations: int = 0) -> int | None:
+    """Search for a nonce whose header hash meets the target.
+
+    Hashes the fixed prefix of the canonical header once and extends a copy
+    of that SHA-256 state per attempt, so each try only formats the nonce
+    and hashes the tail. The loop body is kept to bound locals and a single
+    bytes %-format; every attribute lookup here costs real hash rate.
+    """
+    target = difficulty_target_bytes(header.difficulty)
+    prefix, suffix = header.nonce_template()
+    copy = hashlib.sha256(prefix).copy
+    tail = b"%d" + suffix.replace(b"%", b"%%")
+    start = header.nonce
+    nonces = (
+        range(start, start + max_iterations) if max_iterations > 0
+        else itertools.count(start)
+    )
+    for nonce in nonces:
+        h = copy()
+        h.update(tail % nonce)
+        if h.digest() <= target:
+            return nonce
+    header.nonce = start + max_iterations
+    return None
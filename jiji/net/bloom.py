@@ -0,0 +1,206 @@
+"""Bloom filters for gossip: dedup of seen hashes and mempool digests.
+
+`RotatingBloom` keeps two generations of bits: keys go into the current
+one, and once it holds `capacity` keys it becomes the previous generation
+and a fresh one starts. A key is remembered for between one and two
+generations, so old entries age out without per-key bookkeeping. Memory is
+fixed at roughly two bytes per key of capacity, against ~200 bytes for a
+hex-string LRU entry.
+
+`BloomFilter` is a single generation whose bits, hash count and salt go on
+the wire as a MEMPOOL_BLOOM digest.
+
+`NetCache` is the inverse: a direct-mapped table of recent hashes that can
+forget a key (a newer one took its slot) but never reports one it wasn't
+given, so it can drop duplicate announces before any handler runs.
+
+Indexes are drawn from keyed BLAKE2b digests. The key is a random salt, so
+a peer can't craft hashes that saturate known bits. A false positive only
+makes us skip one announce; callers keep the exact mempool / chain checks
+as the authoritative guard.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import math
+import os
+from array import array
+
+
+def _optimal_shape(capacity: int, error_rate: float) -> tuple[int, int]:
+    """(byte length, hash count) for `capacity` keys at `error_rate`."""
+    nbits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    nbytes = (nbits + 7) // 8
+    k = max(1, round(nbytes * 8 / capacity * math.log(2)))
+    return nbytes, k
+
+
+def _indexes(key: bytes, salt: bytes, k: int, nbits: int) -> list[int]:
+    # Indexes are peeled off a 512-bit digest with divmod; when k needs more
+    # bits than one digest holds, the next one is keyed by a counter salt.
+    # (Double hashing h1 + i*h2 collapses when h2 shares a factor with nbits.)
+    per_digest = max(1, 512 // nbits.bit_length())
+    out = []
+    h = 0
+    for i in range(k):
+        if i % per_digest == 0:
+            counter = (i // per_digest).to_bytes(16, "little")
+            h = int.from_bytes(hashlib.blake2b(
+                key, digest_size=64, key=salt, salt=counter).digest(), "little")
+        h, r = divmod(h, nbits)
+        out.append(r)
+    return out
+
+
+def _has(bits: bytearray, indexes: list[int]) -> bool:
+    for i in indexes:
+        if not bits[i >> 3] & (1 << (i & 7)):
+            return False
+    return True
+
+
+def _set(bits: bytearray, indexes: list[int]) -> None:
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+
+
+class BloomFilter:
+    """Single-generation filter, e.g. a snapshot of a peer's mempool hashes.
+
+    `bits`, `k` and `salt` are all a receiver needs to test membership, so
+    they are what goes on the wire.
+    """
+
+    SALT_SIZE = 16
+
+    def __init__(self, bits: bytes | bytearray, k: int, salt: bytes):
+        if not bits or k < 1 or len(salt) != self.SALT_SIZE:
+            raise ValueError("bloom filter needs bits, k >= 1 and a 16-byte salt")
+        self._bits = bytearray(bits)
+        self._nbits = len(self._bits) * 8
+        self.k = k
+        self.salt = salt
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> BloomFilter:
+        """An empty filter sized for `capacity` keys, with a fresh salt."""
+        nbytes, k = _optimal_shape(max(capacity, 1), error_rate)
+        return cls(bytes(nbytes), k, os.urandom(cls.SALT_SIZE))
+
+    @property
+    def bits(self) -> bytes:
+        return bytes(self._bits)
+
+    def add(self, key: bytes) -> None:
+        _set(self._bits, _indexes(key, self.salt, self.k, self._nbits))
+
+    def __contains__(self, key: bytes) -> bool:
+        return _has(self._bits, _indexes(key, self.salt, self.k, self._nbits))
+
+
+class RotatingBloom:
+    """Fixed-size, self-expiring probabilistic set of byte keys."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4, salt: bytes | None = None):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        self.capacity = capacity
+        # Membership is tested against both generations, so each gets half
+        # the false-positive budget.
+        self._nbytes, self._k = _optimal_shape(capacity, error_rate / 2)
+        self._nbits = self._nbytes * 8
+        self._salt = salt if salt is not None else os.urandom(16)
+        self._current = bytearray(self._nbytes)
+        self._previous = bytearray(self._nbytes)
+        self._count = 0
+
+    def _indexes(self, key: bytes) -> list[int]:
+        return _indexes(key, self._salt, self._k, self._nbits)
+
+    def _insert(self, indexes: list[int]) -> None:
+        _set(self._current, indexes)
+        self._count += 1
+        if self._count >= self.capacity:
+            self.rotate()
+
+    def __contains__(self, key: bytes) -> bool:
+        idx = self._indexes(key)
+        return _has(self._current, idx) or _has(self._previous, idx)
+
+    def add(self, key: bytes) -> None:
+        self.test_and_add(key)
+
+    def test_and_add(self, key: bytes) -> bool:
+        """Return True if `key` was (probably) seen; otherwise record it.
+
+        A key found only in the previous generation is copied forward, so
+        keys that keep arriving stay remembered (like an LRU touch).
+        """
+        idx = self._indexes(key)
+        if _has(self._current, idx):
+            return True
+        seen = _has(self._previous, idx)
+        self._insert(idx)
+        return seen
+
+    def rotate(self) -> None:
+        """Retire the previous generation and start an empty current one."""
+        self._previous = self._current
+        self._current = bytearray(self._nbytes)
+        self._count = 0
+
+    def clear(self) -> None:
+        self._current = bytearray(self._nbytes)
+        self._previous = bytearray(self._nbytes)
+        self._count = 0
+
+    # -- Persistence --
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "k": self._k,
+            "salt": self._salt.hex(),
+            "count": self._count,
+            "current": base64.b64encode(self._current).decode(),
+            "previous": base64.b64encode(self._previous).decode(),
+        }
+
+    def load_dict(self, d: dict) -> bool:
+        """Restore bits saved by `to_dict`. False (and no change) if the saved
+        filter has a different shape than this one.
+        """
+        current = base64.b64decode(d["current"], validate=True)
+        previous = base64.b64decode(d["previous"], validate=True)
+        if (d.get("capacity") != self.capacity or d.get("k") != self._k
+                or len(current) != self._nbytes or len(previous) != self._nbytes):
+            return False
+        self._salt = bytes.fromhex(d["salt"])
+        self._current = bytearray(current)
+        self._previous = bytearray(previous)
+        self._count = min(int(d.get("count", 0)), self.capacity - 1)
+        return True
+
+
+class NetCache:
+    """Fixed-size "recently seen" table keyed by 64-bit slices of hashes.
+
+    A key's low bits pick its slot and the whole key is stored there, so a
+    hit is exact up to a 64-bit collision. Colliding keys overwrite each
+    other; a miss only means falling through to the exact checks.
+    """
+
+    def __init__(self, slots: int = 8192):
+        if slots < 1 or slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self._mask = slots - 1
+        self._slots = array("Q", bytes(8 * slots))
+
+    def test_and_add(self, key: int) -> bool:
+        """Return True if `key` is resident; otherwise store it."""
+        i = key & self._mask
+        if self._slots[i] == key:
+            return True
+        self._slots[i] = key
+        return False
@@ -2,14 +2,32 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import socket
 import time
+from collections import deque
 
 from jiji.core.config import MAX_MESSAGE_SIZE, PEER_MSG_BURST, PEER_MSG_PER_SEC
-from jiji.net.protocol import Message, decode_length_prefix, decode_message, encode_message
+from jiji.net.bloom import BloomFilter
+from jiji.net.protocol import Message, decode_length_prefix, decode_message, encode_frame
 
 logger = logging.getLogger(__name__)
 
 
+def set_nodelay(writer: asyncio.StreamWriter) -> None:
+    """Disable Nagle on the writer's TCP socket, if it has one.
+
+    P2P traffic is mostly small frames (announces, handshakes), which would
+    otherwise sit behind the peer's delayed ACK for up to ~40 ms per hop.
+    """
+    sock = writer.get_extra_info("socket")
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug(f"could not set TCP_NODELAY: {e}")
+
+
 class PeerConnection:
     """Wraps an asyncio StreamReader/StreamWriter pair for the P2P protocol."""
 
@@ -24,6 +42,7 @@ class PeerConnection:
     ):
         self.reader = reader
         self.writer = writer
+        set_nodelay(writer)
         self.host = host
         self.port = port
         self.inbound = inbound
@@ -32,13 +51,27 @@ class PeerConnection:
         self.genesis_hash: str | None = None
         self.listen_port: int = port  # defaults to connection port, updated by handshake
         self.handshake_done = False
+        # Set once the peer's handshake says it decodes binary hash frames.
+        self.compact_frames = False
+        # Set once the peer's handshake says it exchanges MEMPOOL_BLOOM.
+        self.mempool_bloom = False
+        # The peer's latest mempool digest, and the mempool version of the
+        # last digest we sent it.
+        self.peer_mempool_bloom: BloomFilter | None = None
+        self.sent_bloom_version = -1
         self._closed = False
         # Token bucket: refills at PEER_MSG_PER_SEC, caps at PEER_MSG_BURST.
         self._rate_limit = rate_limit
         self._tokens: float = float(PEER_MSG_BURST)
         self._tokens_updated: float = time.monotonic()
-        # Hashes we've already told this peer about (for mempool dedup).
-        self.sent_mempool_hashes: set[str] = set()
+        # Pending hashes we've told this peer about (for mempool dedup),
+        # each with the value of `mempool_blooms` when it was last sent.
+        self.sent_mempool_hashes: dict[bytes, int] = {}
+        # Mempool digests received from this peer.
+        self.mempool_blooms = 0
+        # (start, end) heights of our SYNC_REQUESTs this peer hasn't answered,
+        # oldest first.
+        self.inflight_sync_ranges: deque[tuple[int, int]] = deque()
 
     @property
     def address(self) -> tuple[str, int]:
@@ -50,11 +83,49 @@ class PeerConnection:
 
     async def send(self, msg: Message) -> None:
         """Send a framed message to this peer."""
+        if self.write(msg):
+            await self.drain()
+
+    async def send_many(self, msgs: list[Message]) -> None:
+        """Send several frames with one vectored write and a single drain."""
+        if not msgs or self._closed:
+            return
+        compact = self.compact_frames
+        if self._write([part for m in msgs for part in encode_frame(m, compact)]):
+            await self.drain()
+
+    async def send_parts(self, parts: list[bytes]) -> None:
+        """Send a frame that was assembled as buffers, e.g. a sync response."""
+        if not self._closed and self._write(parts):
+            await self.drain()
+
+    def write(self, msg: Message) -> bool:
+        """Buffer a framed message without waiting for the socket.
+
+        Pair with `drain()`; broadcasts write to every peer first and then
+        drain them together. False if the peer is (or just got) closed.
+        """
+        if self._closed:
+            return False
+        return self._write(encode_frame(msg, compact=self.compact_frames))
+
+    def _write(self, parts: list[bytes] | tuple[bytes, ...]) -> bool:
+        # writelines lets the transport send the buffers with one sendmsg
+        # (Python 3.12+) instead of joining prefix and body first.
+        try:
+            self.writer.writelines(parts)
+            return True
+        except (ConnectionError, OSError) as e:
+            logger.debug(f"send error to {self.address}: {e}")
+            self._closed = True
+            self.writer.close()
+            return False
+
+    async def drain(self) -> None:
+        """Wait for buffered frames to flush; close the peer on error."""
         if self._closed:
             return
         try:
-            data = encode_message(msg)
-            self.writer.write(data)
             await self.writer.drain()
         except (ConnectionError, OSError) as e:
             logger.debug(f"send error to {self.address}: {e}")
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import enum
-import json
 import struct
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Iterable
 
 from jiji.core.config import MAX_MESSAGE_SIZE
+from jiji.core.serialization import dumps, loads
 
 
 class MessageType(enum.IntEnum):
@@ -22,6 +23,7 @@ class MessageType(enum.IntEnum):
     SYNC_RESPONSE = 10
     MEMPOOL_REQUEST = 11
     MEMPOOL_RESPONSE = 12
+    MEMPOOL_BLOOM = 13
 
 
 @dataclass
@@ -30,6 +32,11 @@ class Message:
 
     msg_type: MessageType
     payload: dict
+    # Encoded (length prefix, body) pairs by `compact` flag. A broadcast
+    # sends one Message to every peer, so it is encoded once per format
+    # rather than once per peer. Messages are built by the factories below
+    # and not mutated.
+    _frames: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         return {"type": self.msg_type.value, "payload": self.payload}
@@ -39,25 +46,118 @@ class Message:
         return cls(msg_type=MessageType(d["type"]), payload=d["payload"])
 
 
-# Wire format: [4 bytes big-endian uint32 length][JSON bytes]
-
-
-def encode_message(msg: Message) -> bytes:
-    """Serialize a Message to length-prefixed JSON bytes."""
-    data = json.dumps(msg.to_dict(), separators=(",", ":")).encode("utf-8")
+# Wire format: [4 bytes big-endian uint32 length][body]
+#
+# The body is JSON, or -- between peers that both advertised
+# `compact_frames` in their handshake -- a fixed binary layout for the
+# small, hot hash messages: [1 byte MessageType][fields]. A JSON body
+# always starts with "{", which no MessageType value collides with, so
+# the decoder tells them apart from the first byte.
+
+_LENGTH = struct.Struct("!I")
+_TX_HASH = struct.Struct("!B32s")  # TX_ANNOUNCE / TX_REQUEST
+_BLOCK_ANNOUNCE = struct.Struct("!B32sQ")
+_MEMPOOL_BLOOM = struct.Struct("!BB16s")  # type, k, salt; filter bits follow
+_U64_MAX = 2**64 - 1
+
+
+def _encode_compact(msg: Message) -> bytes | None:
+    """Binary body for `msg`, or None if it has no compact layout."""
+    t = msg.msg_type
+    p = msg.payload
+    try:
+        if t in (MessageType.TX_ANNOUNCE, MessageType.TX_REQUEST) and len(p) == 1:
+            return _TX_HASH.pack(t, _hash32(p["tx_hash"]))
+        if t == MessageType.BLOCK_ANNOUNCE and len(p) == 2:
+            height = p["height"]
+            if type(height) is int and 0 <= height <= _U64_MAX:
+                return _BLOCK_ANNOUNCE.pack(t, _hash32(p["block_hash"]), height)
+        if t == MessageType.MEMPOOL_RESPONSE and len(p) == 1:
+            return bytes((t,)) + b"".join(_hash32(h) for h in p["tx_hashes"])
+        if t == MessageType.MEMPOOL_BLOOM and len(p) == 3:
+            return _MEMPOOL_BLOOM.pack(
+                t, p["k"], bytes.fromhex(p["salt"]),
+            ) + bytes.fromhex(p["bits"])
+    except (KeyError, TypeError, ValueError, struct.error):
+        pass
+    return None
+
+
+def _hash32(hex_str: str) -> bytes:
+    b = bytes.fromhex(hex_str)
+    # only canonical lowercase hex round-trips to the same string
+    if len(b) != 32 or b.hex() != hex_str:
+        raise ValueError("not a 32-byte lowercase hex hash")
+    return b
+
+
+def _decode_compact(data: memoryview) -> Message:
+    t = MessageType(data[0])
+    if t in (MessageType.TX_ANNOUNCE, MessageType.TX_REQUEST):
+        _, h = _TX_HASH.unpack(data)
+        return Message(t, {"tx_hash": h.hex()})
+    if t == MessageType.BLOCK_ANNOUNCE:
+        _, h, height = _BLOCK_ANNOUNCE.unpack(data)
+        return Message(t, {"block_hash": h.hex(), "height": height})
+    if t == MessageType.MEMPOOL_RESPONSE:
+        body = data[1:]
+        if len(body) % 32:
+            raise ValueError("truncated hash list")
+        # hex straight off the view: no per-hash bytes copies
+        return Message(t, {
+            "tx_hashes": [body[i:i + 32].hex() for i in range(0, len(body), 32)],
+        })
+    if t == MessageType.MEMPOOL_BLOOM:
+        _, k, salt = _MEMPOOL_BLOOM.unpack_from(data)
+        return Message(t, {
+            "bits": data[_MEMPOOL_BLOOM.size:].hex(), "k": k, "salt": salt.hex(),
+        })
+    raise ValueError(f"no compact layout for {t.name}")
+
+
+def encode_frame(msg: Message, compact: bool = False) -> tuple[bytes, bytes]:
+    """Serialize a Message to its (length prefix, body) pair.
+
+    With `compact=True`, messages that have a binary layout use it; all
+    others (and any payload the layout can't represent) stay JSON. The two
+    parts are kept apart so a writer can hand them to `writelines` without
+    copying a multi-megabyte sync body just to prepend four bytes.
+    """
+    parts = msg._frames.get(compact)
+    if parts is not None:
+        return parts
+    data = _encode_compact(msg) if compact else None
+    if data is None:
+        data = dumps(msg.to_dict())
     if len(data) > MAX_MESSAGE_SIZE:
         raise ValueError(f"message too large: {len(data)} bytes")
-    return struct.pack("!I", len(data)) + data
+    parts = msg._frames[compact] = (_LENGTH.pack(len(data)), data)
+    return parts
 
 
-def decode_length_prefix(header_bytes: bytes) -> int:
-    """Decode the 4-byte big-endian length prefix."""
-    return struct.unpack("!I", header_bytes)[0]
+def encode_message(msg: Message, compact: bool = False) -> bytes:
+    """Serialize a Message to length-prefixed bytes."""
+    return b"".join(encode_frame(msg, compact))
 
 
-def decode_message(data: bytes) -> Message:
-    """Deserialize JSON bytes (without length prefix) into a Message."""
-    d = json.loads(data.decode("utf-8"))
+def decode_length_prefix(header_bytes: bytes) -> int:
+    """Decode the 4-byte big-endian length prefix."""
+    return _LENGTH.unpack(header_bytes)[0]
+
+
+def decode_message(data: bytes | bytearray | memoryview) -> Message:
+    """Deserialize a frame body (without length prefix) into a Message.
+
+    Accepts any bytes-like object, so a reader can hand over a view of its
+    own buffer without copying the frame out first.
+    """
+    view = memoryview(data)
+    if not view or view[0] != 0x7B:  # not "{": compact frame
+        try:
+            return _decode_compact(view)
+        except (ValueError, struct.error, IndexError) as e:
+            raise ValueError(f"malformed compact frame: {e}") from None
+    d = loads(view)
     return Message.from_dict(d)
 
 
@@ -67,7 +167,8 @@ def decode_message(data: bytes) -> Message:
 def make_handshake(version: int, height: int, genesis_hash: str, listen_port: int = 0) -> Message:
     return Message(MessageType.HANDSHAKE, {
         "version": version, "height": height, "genesis_hash": genesis_hash,
-        "listen_port": listen_port,
+        "listen_port": listen_port, "compact_frames": True,
+        "mempool_bloom": True,
     })
 
 
@@ -81,28 +182,51 @@ def make_peers_response(peers: list[tuple[str, int]]) -> Message:
     })
 
 
-def make_tx_announce(tx_hash: str) -> Message:
-    return Message(MessageType.TX_ANNOUNCE, {"tx_hash": tx_hash})
+def _hex(h: bytes | str) -> str:
+    return h.hex() if isinstance(h, (bytes, bytearray)) else h
+
 
+def _prefill_compact(msg: Message, body: bytes) -> Message:
+    """Seed the compact frame cache with a body packed from raw fields."""
+    msg._frames[True] = (_LENGTH.pack(len(body)), body)
+    return msg
 
-def make_tx_request(tx_hash: str) -> Message:
-    return Message(MessageType.TX_REQUEST, {"tx_hash": tx_hash})
+
+def _tx_hash_message(t: MessageType, tx_hash: bytes | str) -> Message:
+    msg = Message(t, {"tx_hash": _hex(tx_hash)})
+    if type(tx_hash) is bytes and len(tx_hash) == 32:
+        # raw hash in hand: pack the compact frame without a hex round-trip
+        _prefill_compact(msg, _TX_HASH.pack(t, tx_hash))
+    return msg
+
+
+def make_tx_announce(tx_hash: bytes | str) -> Message:
+    return _tx_hash_message(MessageType.TX_ANNOUNCE, tx_hash)
+
+
+def make_tx_request(tx_hash: bytes | str) -> Message:
+    return _tx_hash_message(MessageType.TX_REQUEST, tx_hash)
 
 
 def make_tx_response(tx_dict: dict | None) -> Message:
     return Message(MessageType.TX_RESPONSE, {"transaction": tx_dict})
 
 
-def make_block_announce(block_hash: str, height: int) -> Message:
-    return Message(MessageType.BLOCK_ANNOUNCE, {
-        "block_hash": block_hash, "height": height,
-    })
+def make_block_announce(block_hash: bytes | str, height: int) -> Message:
+    t = MessageType.BLOCK_ANNOUNCE
+    msg = Message(t, {"block_hash": _hex(block_hash), "height": height})
+    if (type(block_hash) is bytes and len(block_hash) == 32
+            and type(height) is int and 0 <= height <= _U64_MAX):
+        _prefill_compact(msg, _BLOCK_ANNOUNCE.pack(t, block_hash, height))
+    return msg
 
 
-def make_block_request(block_hash: str | None = None, height: int | None = None) -> Message:
+def make_block_request(
+    block_hash: bytes | str | None = None, height: int | None = None,
+) -> Message:
     payload: dict = {}
     if block_hash is not None:
-        payload["block_hash"] = block_hash
+        payload["block_hash"] = _hex(block_hash)
     if height is not None:
         payload["height"] = height
     return Message(MessageType.BLOCK_REQUEST, payload)
@@ -112,6 +236,17 @@ def make_block_response(block_dict: dict | None) -> Message:
     return Message(MessageType.BLOCK_RESPONSE, {"block": block_dict})
 
 
+_BLOCK_RESPONSE_HEAD = b'{"type":%d,"payload":{"block":' % MessageType.BLOCK_RESPONSE
+
+
+def block_response_parts(block_body: bytes) -> list[bytes]:
+    """Frame parts of a BLOCK_RESPONSE around an already-encoded block."""
+    size = len(_BLOCK_RESPONSE_HEAD) + len(block_body) + 2
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"message too large: {size} bytes")
+    return [_LENGTH.pack(size), _BLOCK_RESPONSE_HEAD, block_body, b"}}"]
+
+
 def make_sync_request(start_height: int, end_height: int) -> Message:
     return Message(MessageType.SYNC_REQUEST, {
         "start_height": start_height, "end_height": end_height,
@@ -122,9 +257,46 @@ def make_sync_response(blocks: list[dict]) -> Message:
     return Message(MessageType.SYNC_RESPONSE, {"blocks": blocks})
 
 
+_SYNC_HEAD = b'{"type":%d,"payload":{"blocks":[' % MessageType.SYNC_RESPONSE
+_SYNC_TAIL = b"]}}"
+
+
+def sync_response_parts(block_bodies: Iterable[bytes]) -> list[bytes]:
+    """Frame parts of a SYNC_RESPONSE built from already-encoded blocks.
+
+    Decodes to the same Message as `make_sync_response`, but the blocks are
+    never gathered into one payload dict or joined into one body: each
+    block's JSON goes to `writelines` as its own buffer. `block_bodies` is
+    consumed lazily and cut off before the frame would exceed
+    MAX_MESSAGE_SIZE, so an oversized batch becomes a shorter one.
+    """
+    parts = [b"", _SYNC_HEAD]
+    size = len(_SYNC_HEAD) + len(_SYNC_TAIL)
+    for body in block_bodies:
+        sep = len(parts) > 2
+        if size + sep + len(body) > MAX_MESSAGE_SIZE:
+            break
+        if sep:
+            parts.append(b",")
+        parts.append(body)
+        size += sep + len(body)
+    parts.append(_SYNC_TAIL)
+    parts[0] = _LENGTH.pack(size)
+    return parts
+
+
 def make_mempool_request() -> Message:
     return Message(MessageType.MEMPOOL_REQUEST, {})
 
 
-def make_mempool_response(tx_hashes: list[str]) -> Message:
-    return Message(MessageType.MEMPOOL_RESPONSE, {"tx_hashes": tx_hashes})
+def make_mempool_response(tx_hashes: list[bytes | str]) -> Message:
+    return Message(MessageType.MEMPOOL_RESPONSE, {
+        "tx_hashes": [_hex(h) for h in tx_hashes],
+    })
+
+
+def make_mempool_bloom(bits: bytes, k: int, salt: bytes) -> Message:
+    """Digest of the sender's mempool: a Bloom filter over its tx hashes."""
+    return Message(MessageType.MEMPOOL_BLOOM, {
+        "bits": bits.hex(), "k": k, "salt": salt.hex(),
+    })
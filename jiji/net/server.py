@@ -6,17 +6,27 @@ import logging
 import os
 import time
 from collections import OrderedDict, deque
+from collections.abc import Iterable, Sequence
 from typing import TYPE_CHECKING
 
+from jiji.core.block import Block
 from jiji.core.config import (
+    ANNOUNCE_CACHE_SLOTS,
+    BLOCK_WIRE_CACHE_BYTES,
     DEFAULT_P2P_PORT,
     HANDSHAKE_TIMEOUT,
     INBOUND_CONN_PER_MIN,
     MAX_INBOUND,
+    MAX_KNOWN_ADDRESSES,
     MAX_OUTBOUND,
     MAX_PEERS,
     MAX_REORG_DEPTH,
     MAX_SAVED_PEERS,
+    MEMPOOL_BLOOM_ERROR_RATE,
+    MEMPOOL_BLOOM_INTERVAL,
+    MEMPOOL_BLOOM_MAX_BYTES,
+    MEMPOOL_RESEND_DIGESTS,
+    PEER_CONNECT_CONCURRENCY,
     PEER_EXCHANGE_INITIAL_DELAY,
     PEER_EXCHANGE_INTERVAL,
     PEER_MAX_AGE,
@@ -24,7 +34,12 @@ from jiji.core.config import (
     SEEN_SET_FLUSH_INTERVAL,
     SEEN_SET_MAX,
     SYNC_BATCH_SIZE,
+    SYNC_PIPELINE_DEPTH,
 )
+from jiji.core.serialization import dumps
+from jiji.core.transaction import Transaction, transaction_from_dict
+from jiji.core.validation import batch_verify_signatures
+from jiji.net.bloom import BloomFilter, NetCache, RotatingBloom
 from jiji.net.peer import PeerConnection
 from jiji.net.scoring import PeerScorer
 from jiji.net.protocol import (
@@ -37,12 +52,14 @@ from jiji.net.protocol import (
     make_peers_request,
     make_peers_response,
     make_sync_request,
-    make_sync_response,
+    make_mempool_bloom,
     make_mempool_request,
     make_mempool_response,
     make_tx_announce,
     make_tx_request,
     make_tx_response,
+    block_response_parts,
+    sync_response_parts,
 )
 
 if TYPE_CHECKING:
@@ -69,13 +86,28 @@ class P2PServer:
         self.data_dir = data_dir
         self.rate_limit = rate_limit
         self.peers: dict[tuple[str, int], PeerConnection] = {}
-        # addr -> last_seen timestamp
-        self.known_addresses: dict[tuple[str, int], float] = {}
+        # Immutable copy of peers.values() for broadcasts to iterate across
+        # awaits; rebuilt only when a peer joins or leaves.
+        self._peer_snapshot: tuple[PeerConnection, ...] = ()
+        # addr -> last_seen timestamp, least recently refreshed first and
+        # capped at MAX_KNOWN_ADDRESSES so peer-exchange floods can't grow it.
+        self.known_addresses: OrderedDict[tuple[str, int], float] = OrderedDict()
         self._server: asyncio.Server | None = None
-        self._syncing = False
-        # Use OrderedDicts as LRUs so oldest entries are evicted first.
-        self._seen_tx_hashes: OrderedDict[str, None] = OrderedDict()
-        self._seen_block_hashes: OrderedDict[str, None] = OrderedDict()
+        # Tx gossip volume is high and a missed announce is harmless, so tx
+        # hashes go in a fixed-size rotating Bloom filter. Blocks are rare
+        # and must not be dropped, so they keep an exact OrderedDict LRU.
+        self._seen_tx_hashes = RotatingBloom(SEEN_SET_MAX)
+        self._seen_block_hashes: OrderedDict[bytes, None] = OrderedDict()
+        # Announces relayed by several peers are dropped on arrival, before
+        # the handlers parse hashes and check the sets above.
+        self._announce_caches = {
+            MessageType.TX_ANNOUNCE: ("tx_hash", NetCache(ANNOUNCE_CACHE_SLOTS)),
+            MessageType.BLOCK_ANNOUNCE: ("block_hash", NetCache(ANNOUNCE_CACHE_SLOTS)),
+        }
+        # JSON of recently served blocks by hash. Peers syncing from us ask
+        # for the same ranges, and a hash pins a chain block's contents.
+        self._block_wire: OrderedDict[bytes, bytes] = OrderedDict()
+        self._block_wire_size = 0
         # Inbound connection timestamps per /32 for sliding-window rate limit.
         self._inbound_attempts: dict[str, deque[float]] = {}
         self.scorer = PeerScorer(
@@ -84,36 +116,75 @@ class P2PServer:
             disabled=not rate_limit,
         )
         self._seen_flush_task: asyncio.Task | None = None
+        # Txs from TX_RESPONSEs awaiting admission, with the peer they came
+        # from; see _admit_tx_inbox.
+        self._tx_inbox: list[tuple[Transaction, PeerConnection]] = []
+        self._tx_inbox_task: asyncio.Task | None = None
+        # The peer exchange loop's current round of outbound dials, if any.
+        self._connect_task: asyncio.Task | None = None
+        # Outbound dials in flight; each holds a MAX_OUTBOUND slot until it
+        # either becomes a peer or fails.
+        self._dialing = 0
+        # Hex hash of our genesis, filled on first use (the chain may have
+        # none yet when the server is built).
+        self._genesis_hash_hex: str | None = None
+        # Built once: bound methods for the receive loop's dispatch.
+        self._handlers = {
+            MessageType.PEERS_REQUEST: self._on_peers_request,
+            MessageType.PEERS_RESPONSE: self._on_peers_response,
+            MessageType.TX_ANNOUNCE: self._on_tx_announce,
+            MessageType.TX_REQUEST: self._on_tx_request,
+            MessageType.TX_RESPONSE: self._on_tx_response,
+            MessageType.BLOCK_ANNOUNCE: self._on_block_announce,
+            MessageType.BLOCK_REQUEST: self._on_block_request,
+            MessageType.BLOCK_RESPONSE: self._on_block_response,
+            MessageType.SYNC_REQUEST: self._on_sync_request,
+            MessageType.SYNC_RESPONSE: self._on_sync_response,
+            MessageType.MEMPOOL_REQUEST: self._on_mempool_request,
+            MessageType.MEMPOOL_RESPONSE: self._on_mempool_response,
+            MessageType.MEMPOOL_BLOOM: self._on_mempool_bloom,
+        }
+
+    def _genesis_hex(self) -> str | None:
+        """Our genesis block hash as hex, or None if the chain is empty."""
+        if self._genesis_hash_hex is None:
+            genesis = self.node.chain.get_block_by_height(0)
+            if genesis is not None:
+                self._genesis_hash_hex = genesis.block_hash().hex()
+        return self._genesis_hash_hex
 
     # -- Lifecycle --
 
     async def start(self) -> None:
         self.load_seen()
         self._server = await asyncio.start_server(
-            self._handle_inbound, self.host, self.port,
+            self._handle_inbound, self.host, self.port, reuse_address=True,
         )
         if self.data_dir is not None:
             self._seen_flush_task = asyncio.create_task(self._seen_flush_loop())
         logger.info(f"P2P server listening on {self.host}:{self.port}")
 
     async def stop(self) -> None:
-        if self._seen_flush_task is not None:
-            self._seen_flush_task.cancel()
+        for task in (self._seen_flush_task, self._connect_task):
+            if task is None:
+                continue
+            task.cancel()
             try:
-                await self._seen_flush_task
+                await task
             except asyncio.CancelledError:
                 pass
         self.save_seen()
         if self._server:
             self._server.close()
             await self._server.wait_closed()
-        for peer in list(self.peers.values()):
+        for peer in self._peer_snapshot:
             await peer.close()
         self.peers.clear()
+        self._peer_snapshot = ()
 
     # -- Seen-set helpers (bounded LRU) --
 
-    def _seen_add(self, store: OrderedDict[str, None], key: str) -> None:
+    def _seen_add(self, store: OrderedDict[bytes, None], key: bytes) -> None:
         if key in store:
             store.move_to_end(key)
             return
@@ -153,8 +224,9 @@ class P2PServer:
         if self.scorer.is_banned(host):
             logger.debug(f"refusing outbound to banned {host}:{port}")
             return False
-        if self._outbound_count >= MAX_OUTBOUND:
+        if self._outbound_count + self._dialing >= MAX_OUTBOUND:
             return False
+        self._dialing += 1
         try:
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(host, port),
@@ -166,8 +238,8 @@ class P2PServer:
             )
             await self._perform_handshake(peer)
             if peer.handshake_done:
-                self.peers[peer.address] = peer
-                self.known_addresses[(host, peer.listen_port)] = time.time()
+                self._add_peer(peer)
+                self._remember_address((host, peer.listen_port), time.time())
                 asyncio.create_task(self._peer_loop(peer))
                 logger.info(f"connected to peer {host}:{port}")
                 return True
@@ -177,6 +249,8 @@ class P2PServer:
         except (OSError, asyncio.TimeoutError) as e:
             logger.debug(f"failed to connect to {host}:{port}: {e}")
             return False
+        finally:
+            self._dialing -= 1
 
     async def _handle_inbound(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
@@ -206,17 +280,17 @@ class P2PServer:
                 return
             self._process_handshake(peer, msg)
             # Reject wrong-genesis inbounds before we accept them.
-            our_genesis = self.node.chain.get_block_by_height(0)
+            our_genesis = self._genesis_hex()
             if (our_genesis is not None and peer.genesis_hash and
-                    peer.genesis_hash != our_genesis.block_hash().hex()):
+                    peer.genesis_hash != our_genesis):
                 self.scorer.record(host, "bad_handshake")
                 await peer.close()
                 return
             await self._send_handshake(peer)
             peer.handshake_done = True
-            self.peers[peer.address] = peer
+            self._add_peer(peer)
             if peer.listen_port > 0:
-                self.known_addresses[(host, peer.listen_port)] = time.time()
+                self._remember_address((host, peer.listen_port), time.time())
             logger.info(f"inbound peer connected: {host}:{port}")
             asyncio.create_task(self._peer_loop(peer))
         except asyncio.TimeoutError:
@@ -232,16 +306,15 @@ class P2PServer:
             return
         self._process_handshake(peer, msg)
         # verify genesis match
-        our_genesis = self.node.chain.get_block_by_height(0)
-        if our_genesis and peer.genesis_hash != our_genesis.block_hash().hex():
+        our_genesis = self._genesis_hex()
+        if our_genesis and peer.genesis_hash != our_genesis:
             logger.warning(f"genesis mismatch with {peer.address}")
             self.scorer.record(peer.host, "bad_handshake")
             return
         peer.handshake_done = True
 
     async def _send_handshake(self, peer: PeerConnection) -> None:
-        genesis = self.node.chain.get_block_by_height(0)
-        genesis_hash = genesis.block_hash().hex() if genesis else ""
+        genesis_hash = self._genesis_hex() or ""
         msg = make_handshake(PROTOCOL_VERSION, self.node.chain.height, genesis_hash, self.port)
         await peer.send(msg)
 
@@ -252,6 +325,8 @@ class P2PServer:
         lp = msg.payload.get("listen_port", 0)
         if lp > 0:
             peer.listen_port = lp
+        peer.compact_frames = msg.payload.get("compact_frames") is True
+        peer.mempool_bloom = msg.payload.get("mempool_bloom") is True
 
     # -- Message loop --
 
@@ -268,28 +343,45 @@ class P2PServer:
                     break
                 await self._handle_message(peer, msg)
         finally:
-            self.peers.pop(peer.address, None)
+            self._remove_peer(peer)
             await peer.close()
 
+    def _add_peer(self, peer: PeerConnection) -> None:
+        self.peers[peer.address] = peer
+        self._peer_snapshot = tuple(self.peers.values())
+
+    def _remove_peer(self, peer: PeerConnection) -> None:
+        if self.peers.pop(peer.address, None) is not None:
+            self._peer_snapshot = tuple(self.peers.values())
+
     async def _handle_message(self, peer: PeerConnection, msg: Message) -> None:
-        handlers = {
-            MessageType.PEERS_REQUEST: self._on_peers_request,
-            MessageType.PEERS_RESPONSE: self._on_peers_response,
-            MessageType.TX_ANNOUNCE: self._on_tx_announce,
-            MessageType.TX_REQUEST: self._on_tx_request,
-            MessageType.TX_RESPONSE: self._on_tx_response,
-            MessageType.BLOCK_ANNOUNCE: self._on_block_announce,
-            MessageType.BLOCK_REQUEST: self._on_block_request,
-            MessageType.BLOCK_RESPONSE: self._on_block_response,
-            MessageType.SYNC_REQUEST: self._on_sync_request,
-            MessageType.SYNC_RESPONSE: self._on_sync_response,
-            MessageType.MEMPOOL_REQUEST: self._on_mempool_request,
-            MessageType.MEMPOOL_RESPONSE: self._on_mempool_response,
-        }
-        handler = handlers.get(msg.msg_type)
+        if self._repeated_announce(msg):
+            if msg.msg_type == MessageType.BLOCK_ANNOUNCE:
+                # Another peer announced it first, but this one has the block
+                # too; _start_sync and the pipeline go by peer_height.
+                height = msg.payload.get("height")
+                if type(height) is int:
+                    peer.peer_height = max(peer.peer_height, height)
+            return
+        handler = self._handlers.get(msg.msg_type)
         if handler:
             await handler(peer, msg)
 
+    def _repeated_announce(self, msg: Message) -> bool:
+        entry = self._announce_caches.get(msg.msg_type)
+        if entry is None:
+            return False
+        field, cache = entry
+        h = msg.payload.get(field)
+        if not isinstance(h, str) or len(h) != 64:
+            return False  # let the handler deal with it
+        try:
+            # The tail of the hash: PoW leaves a block hash's leading bits zero.
+            key = int(h[48:], 16)
+        except ValueError:
+            return False
+        return cache.test_and_add(key)
+
     # -- Peers --
 
     async def _on_peers_request(self, peer: PeerConnection, msg: Message) -> None:
@@ -305,20 +397,17 @@ class P2PServer:
         for entry in msg.payload.get("peers", []):
             addr = (entry["host"], entry["port"])
             if addr not in self.known_addresses:
-                self.known_addresses[addr] = now
+                self._remember_address(addr, now)
 
     # -- Transaction gossip --
 
     async def _on_tx_announce(self, peer: PeerConnection, msg: Message) -> None:
-        tx_hash_hex = msg.payload["tx_hash"]
-        if tx_hash_hex in self._seen_tx_hashes:
-            self._seen_tx_hashes.move_to_end(tx_hash_hex)
+        tx_hash = bytes.fromhex(msg.payload["tx_hash"])
+        if self._seen_tx_hashes.test_and_add(tx_hash):
             return
-        self._seen_add(self._seen_tx_hashes, tx_hash_hex)
-        tx_hash = bytes.fromhex(tx_hash_hex)
         if tx_hash in self.node.mempool or tx_hash in self.node.chain.tx_index:
             return
-        await peer.send(make_tx_request(tx_hash_hex))
+        await peer.send(make_tx_request(tx_hash))
 
     async def _on_tx_request(self, peer: PeerConnection, msg: Message) -> None:
         tx_hash = bytes.fromhex(msg.payload["tx_hash"])
@@ -333,58 +422,121 @@ class P2PServer:
         if tx_dict is None:
             return
         try:
-            await self.node.handle_new_transaction(tx_dict, source_peer=peer)
+            tx = transaction_from_dict(tx_dict)
         except Exception as e:
             logger.debug(f"rejected tx from {peer.address}: {e}")
+            return
+        self._tx_inbox.append((tx, peer))
+        if self._tx_inbox_task is None or self._tx_inbox_task.done():
+            self._tx_inbox_task = asyncio.create_task(self._admit_tx_inbox())
+
+    async def _admit_tx_inbox(self) -> None:
+        """Admit queued peer txs, verifying each round's signatures together.
+
+        Responses already buffered on a connection are all handled before
+        this task first runs (the receive loop doesn't yield while frames are
+        waiting), so a burst after a mempool sync shares one verify_batch;
+        `add` then finds the signatures already checked.
+        """
+        while self._tx_inbox:
+            batch, self._tx_inbox = self._tx_inbox, []
+            batch_verify_signatures([tx for tx, _ in batch])
+            for tx, peer in batch:
+                try:
+                    await self.node.handle_new_transaction(tx, source_peer=peer)
+                except Exception as e:
+                    logger.debug(f"rejected tx from {peer.address}: {e}")
 
     # -- Mempool sync --
 
     async def _on_mempool_request(self, peer: PeerConnection, msg: Message) -> None:
         pending = self.node.mempool.get_pending()
-        # Skip hashes we've already gossiped to this peer.
-        tx_hashes: list[str] = []
+        # Skip hashes we've already gossiped to this peer; entries for txs
+        # that have left our mempool are dropped.
+        sent = peer.sent_mempool_hashes
+        kept: dict[bytes, int] = {}
+        tx_hashes: list[bytes] = []
         for tx in pending:
-            h = tx.tx_hash().hex()
-            if h in peer.sent_mempool_hashes:
-                continue
-            tx_hashes.append(h)
-            peer.sent_mempool_hashes.add(h)
+            h = tx.tx_hash()
+            if h not in sent:
+                tx_hashes.append(h)
+            kept[h] = sent.get(h, peer.mempool_blooms)
+        peer.sent_mempool_hashes = kept
         await peer.send(make_mempool_response(tx_hashes))
 
     async def _on_mempool_response(self, peer: PeerConnection, msg: Message) -> None:
         tx_hashes = msg.payload.get("tx_hashes", [])
+        requests = []
         for tx_hash_hex in tx_hashes:
-            if tx_hash_hex in self._seen_tx_hashes:
-                self._seen_tx_hashes.move_to_end(tx_hash_hex)
-                continue
             tx_hash = bytes.fromhex(tx_hash_hex)
+            if tx_hash in self._seen_tx_hashes:
+                continue
             if tx_hash in self.node.mempool or tx_hash in self.node.chain.tx_index:
                 continue
             # request the full transaction
-            await peer.send(make_tx_request(tx_hash_hex))
+            requests.append(make_tx_request(tx_hash))
+        await peer.send_many(requests)
+
+    async def _on_mempool_bloom(self, peer: PeerConnection, msg: Message) -> None:
+        """Announce to `peer` the pending txs its mempool digest lacks."""
+        p = msg.payload
+        try:
+            bits = bytes.fromhex(p["bits"])
+            if (len(bits) > MEMPOOL_BLOOM_MAX_BYTES
+                    or type(p["k"]) is not int or not 1 <= p["k"] <= 32):
+                raise ValueError("filter too large or bad hash count")
+            bloom = BloomFilter(bits, p["k"], bytes.fromhex(p["salt"]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"bad mempool bloom from {peer.address}: {e}")
+            return
+        peer.peer_mempool_bloom = bloom
+        peer.mempool_blooms += 1
+        now = peer.mempool_blooms
+        mempool = self.node.mempool
+        sent = peer.sent_mempool_hashes
+        # Rebuilt each digest: hashes the peer now has, or that left our
+        # mempool, drop out.
+        kept: dict[bytes, int] = {}
+        msgs = []
+        for tx_hash in mempool.tx_hashes():
+            if tx_hash in bloom:
+                continue
+            sent_at = sent.get(tx_hash)
+            if sent_at is None:
+                msgs.append(make_tx_announce(tx_hash))
+            elif now - sent_at >= MEMPOOL_RESEND_DIGESTS:
+                # Still missing despite the announce. A re-announce would
+                # hit the peer's seen-set, so push the tx itself.
+                msgs.append(make_tx_response(mempool.get_by_hash(tx_hash).to_dict()))
+            else:
+                kept[tx_hash] = sent_at
+                continue
+            kept[tx_hash] = now
+        peer.sent_mempool_hashes = kept
+        await peer.send_many(msgs)
 
     # -- Block gossip --
 
     async def _on_block_announce(self, peer: PeerConnection, msg: Message) -> None:
-        block_hash_hex = msg.payload["block_hash"]
+        block_hash = bytes.fromhex(msg.payload["block_hash"])
         height = msg.payload["height"]
-        if block_hash_hex in self._seen_block_hashes:
-            self._seen_block_hashes.move_to_end(block_hash_hex)
+        peer.peer_height = max(peer.peer_height, height)
+        if block_hash in self._seen_block_hashes:
+            self._seen_block_hashes.move_to_end(block_hash)
             return
-        self._seen_add(self._seen_block_hashes, block_hash_hex)
-        block_hash = bytes.fromhex(block_hash_hex)
+        self._seen_add(self._seen_block_hashes, block_hash)
         if self.node.chain.get_block_by_hash(block_hash) is not None:
             return
         our_height = self.node.chain.height
         if height == our_height + 1:
             # Directly request this block (extends tip)
-            await peer.send(make_block_request(block_hash=block_hash_hex))
+            await peer.send(make_block_request(block_hash=block_hash))
         elif height > our_height + 1:
             # Peer is significantly ahead — sync
             await self._start_sync(peer)
         elif height >= our_height - MAX_REORG_DEPTH:
             # Potential fork block within reorg window — fetch it
-            await peer.send(make_block_request(block_hash=block_hash_hex))
+            await peer.send(make_block_request(block_hash=block_hash))
 
     async def _on_block_request(self, peer: PeerConnection, msg: Message) -> None:
         block = None
@@ -393,8 +545,10 @@ class P2PServer:
             block = self.node.chain.get_block_by_hash(bh)
         elif "height" in msg.payload:
             block = self.node.chain.get_block_by_height(msg.payload["height"])
-        block_dict = block.to_dict() if block else None
-        await peer.send(make_block_response(block_dict))
+        if block is None:
+            await peer.send(make_block_response(None))
+        else:
+            await peer.send_parts(block_response_parts(self._wire_block(block)))
 
     async def _on_block_response(self, peer: PeerConnection, msg: Message) -> None:
         block_dict = msg.payload.get("block")
@@ -411,61 +565,187 @@ class P2PServer:
         start = msg.payload["start_height"]
         end = msg.payload["end_height"]
         end = min(end, start + SYNC_BATCH_SIZE - 1)
-        blocks = []
-        for h in range(start, end + 1):
-            block = self.node.chain.get_block_by_height(h)
-            if block is None:
-                break
-            blocks.append(block.to_dict())
-        await peer.send(make_sync_response(blocks))
+        chain = self.node.chain
+
+        def block_bodies():
+            for h in range(start, end + 1):
+                block = chain.get_block_by_height(h)
+                if block is None:
+                    return
+                yield self._wire_block(block)
+
+        await peer.send_parts(sync_response_parts(block_bodies()))
+
+    def _wire_block(self, block: Block) -> bytes:
+        """JSON encoding of a chain block, from the served-block LRU."""
+        key = block.block_hash()
+        cache = self._block_wire
+        body = cache.get(key)
+        if body is not None:
+            cache.move_to_end(key)
+            return body
+        body = cache[key] = dumps(block.to_dict())
+        self._block_wire_size += len(body)
+        while self._block_wire_size > BLOCK_WIRE_CACHE_BYTES and len(cache) > 1:
+            _, old = cache.popitem(last=False)
+            self._block_wire_size -= len(old)
+        return body
 
     async def _on_sync_response(self, peer: PeerConnection, msg: Message) -> None:
         blocks = msg.payload.get("blocks", [])
+        parsed: list[Block] = []
         for block_dict in blocks:
             try:
-                await self.node.handle_new_block(block_dict, source_peer=peer)
+                parsed.append(Block.from_dict(block_dict))
             except Exception as e:
                 logger.debug(f"sync block rejected: {e}")
                 break
-        # if we got a full batch and peer has more, continue
-        if len(blocks) == SYNC_BATCH_SIZE:
-            last_height = blocks[-1]["header"]["height"]
-            if last_height < peer.peer_height:
-                await peer.send(make_sync_request(
-                    last_height + 1, last_height + SYNC_BATCH_SIZE,
-                ))
-        else:
-            self._syncing = False
+        # Verify the whole batch's signatures in one pass; each block's own
+        # check then skips them.
+        txs = [tx for block in parsed for tx in block.transactions]
+        self.node.mempool.mark_known_signatures(txs)
+        batch_verify_signatures(txs)
+        requested = self._pop_sync_range(peer, parsed[0].header.height if parsed else None)
+        failed = len(parsed) < len(blocks)
+        for block in parsed:
+            try:
+                await self.node.handle_new_block(block, source_peer=peer)
+            except Exception as e:
+                logger.debug(f"sync block rejected: {e}")
+                failed = True
+                break
+        if requested is None:
+            return  # late reply to a range we already gave up on
+        if failed or len(blocks) < requested[1] - requested[0] + 1:
+            # A bad block, the end of the peer's chain, or a batch cut short
+            # by MAX_MESSAGE_SIZE: the ranges still in flight no longer line
+            # up with our tip, so drop them and restart if the peer has more.
+            peer.inflight_sync_ranges.clear()
+            if not failed and parsed and self.node.chain.height < peer.peer_height:
+                await self._start_sync(peer)
+            return
+        await self._fill_sync_pipeline(peer)
+
+    @staticmethod
+    def _pop_sync_range(peer: PeerConnection, first_height: int | None) -> tuple[int, int] | None:
+        """Remove and return the in-flight range a sync response answers."""
+        ranges = peer.inflight_sync_ranges
+        for r in ranges:
+            if r[0] == first_height:
+                ranges.remove(r)
+                return r
+        if first_height is None and ranges:
+            return ranges.popleft()
+        return None
 
     async def _start_sync(self, peer: PeerConnection) -> None:
-        if self._syncing:
+        if peer.inflight_sync_ranges or peer.peer_height <= self.node.chain.height:
             return
-        self._syncing = True
-        start = self.node.chain.height + 1
-        end = start + SYNC_BATCH_SIZE - 1
-        logger.info(f"syncing from {peer.address}, requesting blocks {start}-{end}")
-        await peer.send(make_sync_request(start, end))
-
-    def mark_sync_done(self) -> None:
-        self._syncing = False
+        logger.info(f"syncing from {peer.address}, starting at block {self.node.chain.height + 1}")
+        await self._fill_sync_pipeline(peer)
+
+    async def _fill_sync_pipeline(self, peer: PeerConnection) -> None:
+        """Keep up to SYNC_PIPELINE_DEPTH batches requested from `peer`.
+
+        Each new range starts where the last one in flight ends, so the peer
+        streams consecutive batches without waiting a round trip per batch.
+        """
+        ranges = peer.inflight_sync_ranges
+        start = ranges[-1][1] + 1 if ranges else self.node.chain.height + 1
+        msgs = []
+        while len(ranges) < SYNC_PIPELINE_DEPTH and start <= peer.peer_height:
+            end = start + SYNC_BATCH_SIZE - 1
+            ranges.append((start, end))
+            msgs.append(make_sync_request(start, end))
+            start = end + 1
+        await peer.send_many(msgs)
 
     # -- Broadcasting --
 
-    async def broadcast_tx(self, tx_hash_hex: str, exclude: PeerConnection | None = None) -> None:
-        self._seen_add(self._seen_tx_hashes, tx_hash_hex)
-        msg = make_tx_announce(tx_hash_hex)
-        for peer in list(self.peers.values()):
-            if peer is not exclude and not peer.is_closed:
-                await peer.send(msg)
+    @staticmethod
+    async def _send_all(peers: Sequence[PeerConnection], msg: Message) -> None:
+        """Buffer `msg` on every peer, then drain them concurrently.
+
+        The frame is encoded once per wire format (Message caches it), and
+        one slow peer's drain no longer holds up the writes to the rest.
+        A peer whose drain fails unexpectedly is logged, not propagated, so
+        it can't abort the fanout.
+        """
+        await P2PServer.drain_peers([p for p in peers if p.write(msg)])
+
+    @staticmethod
+    async def drain_peers(peers: Sequence[PeerConnection]) -> None:
+        """Drain peers that were written to, logging rather than raising."""
+        if not peers:
+            return
+        results = await asyncio.gather(*(p.drain() for p in peers), return_exceptions=True)
+        for peer, result in zip(peers, results):
+            if isinstance(result, Exception):
+                logger.debug(f"broadcast to {peer.address} failed: {result}")
+
+    async def broadcast_tx(self, tx_hash: bytes, exclude: PeerConnection | None = None) -> None:
+        self._seen_tx_hashes.add(tx_hash)
+        targets = []
+        for peer in self._peer_snapshot:
+            if peer is exclude or peer.is_closed:
+                continue
+            # the peer's last digest says it already has this tx
+            if peer.peer_mempool_bloom is not None and tx_hash in peer.peer_mempool_bloom:
+                continue
+            targets.append(peer)
+        await self._send_all(targets, make_tx_announce(tx_hash))
 
     async def broadcast_block(
-        self, block_hash_hex: str, height: int, exclude: PeerConnection | None = None,
+        self, block_hash: bytes, height: int, exclude: PeerConnection | None = None,
     ) -> None:
-        self._seen_add(self._seen_block_hashes, block_hash_hex)
-        msg = make_block_announce(block_hash_hex, height)
-        for peer in list(self.peers.values()):
-            if peer is not exclude and not peer.is_closed:
-                await peer.send(msg)
+        await self.drain_peers(self.announce_block(block_hash, height, exclude))
+
+    def announce_block(
+        self, block_hash: bytes, height: int, exclude: PeerConnection | None = None,
+    ) -> list[PeerConnection]:
+        """Write a BLOCK_ANNOUNCE to every peer without waiting for drains.
+
+        Nothing here yields to the loop, so the caller can finish work (e.g.
+        validating the block) before any peer's reply is handled. Returns
+        the peers written to, for `drain_peers`.
+        """
+        self._seen_add(self._seen_block_hashes, block_hash)
+        msg = make_block_announce(block_hash, height)
+        return [
+            p for p in self._peer_snapshot
+            if p is not exclude and not p.is_closed and p.write(msg)
+        ]
+
+    # -- Mempool digest gossip --
+
+    def _mempool_digest(self) -> Message:
+        mempool = self.node.mempool
+        hashes = mempool.tx_hashes()
+        bloom = BloomFilter.for_capacity(len(hashes), MEMPOOL_BLOOM_ERROR_RATE)
+        for h in hashes:
+            bloom.add(h)
+        return make_mempool_bloom(bloom.bits, bloom.k, bloom.salt)
+
+    async def mempool_gossip_loop(self) -> None:
+        """Periodically send each capable peer a Bloom digest of our mempool.
+
+        Peers answer by announcing only the txs the digest lacks (pull
+        gossip), and `broadcast_tx` skips peers whose digest already has
+        the tx. A digest is rebuilt (with a fresh salt, so false positives
+        differ between rounds) only when the mempool has changed.
+        """
+        while True:
+            await asyncio.sleep(MEMPOOL_BLOOM_INTERVAL)
+            version = self.node.mempool.version
+            targets = [
+                p for p in self._peer_snapshot
+                if not p.is_closed and p.mempool_bloom and p.sent_bloom_version != version
+            ]
+            if not targets:
+                continue
+            for peer in targets:
+                peer.sent_bloom_version = version
+            await self._send_all(targets, self._mempool_digest())
 
     # -- Peer exchange background task --
 
@@ -484,17 +764,54 @@ class P2PServer:
         # First exchange fires quickly so peers discover each other fast
         await asyncio.sleep(PEER_EXCHANGE_INITIAL_DELAY)
         while True:
-            for peer in list(self.peers.values()):
-                if not peer.is_closed:
-                    await peer.send(make_peers_request())
+            await self._send_all(self._peer_snapshot, make_peers_request())
             # Short delay to let responses arrive before connecting
             await asyncio.sleep(2)
-            for addr in list(self.known_addresses):
-                if not self._is_connected_to(*addr) and self._outbound_count < MAX_OUTBOUND:
-                    asyncio.create_task(self.connect_to_peer(*addr))
             self.save_peers()
+            # Dial in the background: a round over unreachable addresses can
+            # take many handshake timeouts, and mustn't hold up the next
+            # exchange. A round still running means this one is skipped.
+            if (self._outbound_count + self._dialing < MAX_OUTBOUND
+                    and (self._connect_task is None or self._connect_task.done())):
+                self._connect_task = asyncio.create_task(self.connect_to_many([
+                    addr for addr in self.known_addresses if not self._is_connected_to(*addr)
+                ]))
             await asyncio.sleep(PEER_EXCHANGE_INTERVAL)
 
+    async def connect_to_many(self, addrs: Iterable[tuple[str, int]]) -> None:
+        """Try each address, at most PEER_CONNECT_CONCURRENCY at a time.
+
+        Attempts start one by one as slots free up, and the rest of the list
+        is abandoned once connected and in-flight dials fill MAX_OUTBOUND.
+        """
+        sem = asyncio.Semaphore(PEER_CONNECT_CONCURRENCY)
+
+        async def attempt(host: str, port: int) -> None:
+            try:
+                await self.connect_to_peer(host, port)
+            finally:
+                sem.release()
+
+        tasks: list[asyncio.Task] = []
+        try:
+            for host, port in list(addrs):
+                await sem.acquire()
+                if self._outbound_count + self._dialing >= MAX_OUTBOUND:
+                    sem.release()
+                    break
+                tasks.append(asyncio.create_task(attempt(host, port)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _remember_address(self, addr: tuple[str, int], last_seen: float) -> None:
+        known = self.known_addresses
+        known[addr] = last_seen
+        known.move_to_end(addr)
+        while len(known) > MAX_KNOWN_ADDRESSES:
+            known.popitem(last=False)
+
     # -- Peer persistence --
 
     def _peers_path(self) -> str | None:
@@ -518,7 +835,7 @@ class P2PServer:
                     continue
                 addr = (entry["host"], entry["port"])
                 if addr not in self.known_addresses:
-                    self.known_addresses[addr] = last_seen
+                    self._remember_address(addr, last_seen)
                     loaded += 1
             if loaded:
                 logger.info(f"loaded {loaded} saved peers from {path}")
@@ -539,13 +856,16 @@ class P2PServer:
         try:
             with open(path, "r") as f:
                 data = json.load(f)
-            for h in (data.get("tx") or [])[-SEEN_SET_MAX:]:
-                if isinstance(h, str):
-                    self._seen_tx_hashes[h] = None
+            tx_bloom = data.get("tx_bloom")
+            if not (isinstance(tx_bloom, dict) and self._seen_tx_hashes.load_dict(tx_bloom)):
+                # older files (or another filter size) list hex hashes
+                for h in (data.get("tx") or [])[-SEEN_SET_MAX:]:
+                    if isinstance(h, str):
+                        self._seen_tx_hashes.add(bytes.fromhex(h))
             for h in (data.get("block") or [])[-SEEN_SET_MAX:]:
                 if isinstance(h, str):
-                    self._seen_block_hashes[h] = None
-        except (json.JSONDecodeError, OSError, TypeError) as e:
+                    self._seen_block_hashes[bytes.fromhex(h)] = None
+        except (OSError, TypeError, ValueError, KeyError) as e:
             logger.warning(f"failed to load seen-set from {path}: {e}")
 
     def save_seen(self) -> None:
@@ -553,8 +873,8 @@ class P2PServer:
         if path is None:
             return
         data = {
-            "tx": list(self._seen_tx_hashes.keys()),
-            "block": list(self._seen_block_hashes.keys()),
+            "tx_bloom": self._seen_tx_hashes.to_dict(),
+            "block": [h.hex() for h in self._seen_block_hashes],
         }
         tmp = path + ".tmp"
         try:
@@ -578,7 +898,7 @@ class P2PServer:
         now = time.time()
         for peer in self.peers.values():
             if not peer.is_closed and peer.listen_port > 0:
-                self.known_addresses[(peer.host, peer.listen_port)] = now
+                self._remember_address((peer.host, peer.listen_port), now)
         # Sort by last_seen descending, cap at MAX_SAVED_PEERS
         entries = sorted(
             self.known_addresses.items(), key=lambda x: x[1], reverse=True,
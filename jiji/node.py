@@ -4,18 +4,25 @@ import asyncio
 import logging
 import os
 import time
+from collections.abc import Callable
 
 from jiji.core.block import Block
 from jiji.core.chain import Blockchain
-from jiji.core.config import DEFAULT_P2P_PORT, DEFAULT_RPC_PORT, MAX_REORG_DEPTH
-from jiji.core.transaction import Coinbase, transaction_from_dict
-from jiji.core.validation import ValidationError, validate_block_structure
+from jiji.core.config import (
+    DEFAULT_P2P_PORT, DEFAULT_RPC_PORT, EMPTY_BLOCK_DELAY, MAX_REORG_DEPTH,
+    PRE_RELAY_MIN_DIFFICULTY,
+)
+from jiji.core.serialization import sha256_backend
+from jiji.core.transaction import Coinbase, Transaction, transaction_from_dict
+from jiji.core.validation import (
+    ValidationError, compute_expected_difficulty, validate_block_structure,
+)
 from jiji.mining.mempool import Mempool
 from jiji.mining.miner import Miner
 from jiji.net.peer import PeerConnection
 from jiji.net.server import P2PServer
 from jiji.rpc.server import RPCServer
-from jiji.storage.store import BlockStore
+from jiji.storage.store import BlockStore, warm_page_cache
 
 try:
     from jiji.net.discovery import LANDiscovery
@@ -51,12 +58,15 @@ class Node:
 
         # Set up persistent store if data_dir is given
         self._store: BlockStore | None = None
+        index_path: str | None = None
         if data_dir is not None:
             os.makedirs(data_dir, exist_ok=True)
             db_path = os.path.join(data_dir, "blocks.db")
+            index_path = os.path.join(data_dir, "chain.idx")
+            warm_page_cache([db_path, db_path + "-wal", index_path])
             self._store = BlockStore(db_path)
 
-        self.chain = Blockchain(store=self._store)
+        self.chain = Blockchain(store=self._store, index_path=index_path)
         self.mempool = Mempool(self.chain)
         self.miner = Miner(self.chain, self.mempool, self.public_key)
         self.p2p = P2PServer(
@@ -77,6 +87,8 @@ class Node:
         if mdns and not _MDNS_AVAILABLE:
             logger.warning("mDNS requested but `zeroconf` is not installed — skipping")
         self._discovery: LANDiscovery | None = None
+        # Set (and replaced) whenever the chain or mempool changes
+        self._changed = asyncio.Event()
 
     async def start(self, genesis_block: Block | None = None) -> None:
         """Initialize chain and start servers."""
@@ -92,6 +104,7 @@ class Node:
         else:
             self.chain.initialize_genesis(self.public_key)
         logger.info(f"chain initialized, height={self.chain.height}")
+        logger.info(f"sha256 backend: {sha256_backend()}")
 
         await self.p2p.start()
         await self.rpc.start()
@@ -104,9 +117,10 @@ class Node:
 
         # Also try connecting to previously known peers (sorted by freshness)
         saved = sorted(self.p2p.known_addresses.items(), key=lambda x: x[1], reverse=True)
-        for addr, _ in saved:
-            if addr not in [(h, p) for h, p in self._bootstrap_peers]:
-                asyncio.create_task(self.p2p.connect_to_peer(*addr))
+        bootstrap = {(h, p) for h, p in self._bootstrap_peers}
+        asyncio.create_task(self.p2p.connect_to_many(
+            addr for addr, _ in saved if addr not in bootstrap
+        ))
 
         # Flip _running BEFORE scheduling background tasks. Any `await` after
         # create_task() yields control to the loop; if _running were still
@@ -116,6 +130,7 @@ class Node:
         self._running = True
 
         asyncio.create_task(self.p2p.peer_exchange_loop())
+        asyncio.create_task(self.p2p.mempool_gossip_loop())
 
         if self._mine:
             self._mining_task = asyncio.create_task(self._mining_loop())
@@ -149,27 +164,63 @@ class Node:
         await self.p2p.stop()
         await self.rpc.stop()
         if self._store is not None:
+            try:
+                self.chain.save_index()
+            except OSError as e:
+                logger.warning(f"failed to save chain index: {e}")
             self._store.close()
         logger.info("node stopped")
 
     # -- Event handlers --
 
+    def _notify_changed(self) -> None:
+        """Wake everything parked in `wait_until`."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_until(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """Wait until `predicate()` holds; False if `timeout` seconds pass first.
+
+        The predicate is re-checked each time the chain or mempool changes
+        through this node, instead of on a polling interval.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not predicate():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return predicate()
+        return True
+
     async def handle_new_transaction(
-        self, tx_dict: dict, source_peer: PeerConnection | None = None,
+        self, tx_dict: dict | Transaction, source_peer: PeerConnection | None = None,
     ) -> str:
-        """Validate, add to mempool, gossip. Returns tx_hash hex."""
-        tx = transaction_from_dict(tx_dict)
+        """Validate, add to mempool, gossip. Returns tx_hash hex.
+
+        Accepts a wire dict or an already-parsed transaction (peer txs are
+        parsed on arrival so a burst can be signature-checked as a batch).
+        """
+        tx = transaction_from_dict(tx_dict) if isinstance(tx_dict, dict) else tx_dict
         tx_hash = self.mempool.add(tx)
+        self._notify_changed()
         tx_hash_hex = tx_hash.hex()
         logger.info(f"new tx {tx_hash_hex[:16]}...")
-        await self.p2p.broadcast_tx(tx_hash_hex, exclude=source_peer)
+        await self.p2p.broadcast_tx(tx_hash, exclude=source_peer)
         return tx_hash_hex
 
     async def handle_new_block(
-        self, block_dict: dict, source_peer: PeerConnection | None = None,
+        self, block_dict: dict | Block, source_peer: PeerConnection | None = None,
     ) -> None:
-        """Validate, add to chain, handle forks, update mempool, gossip."""
-        block = Block.from_dict(block_dict)
+        """Validate, add to chain, handle forks, update mempool, gossip.
+
+        Accepts a wire dict or an already-parsed Block (the sync path parses
+        a whole batch up front to verify its signatures together).
+        """
+        block = block_dict if isinstance(block_dict, Block) else Block.from_dict(block_dict)
         block_hash = block.block_hash()
         block_hash_hex = block_hash.hex()
 
@@ -177,23 +228,43 @@ class Node:
         if self.chain.get_block_by_hash(block_hash) is not None:
             return
 
+        # Txs we already verified on mempool admission needn't be re-checked
+        self.mempool.mark_known_signatures(block.transactions)
+
         tip = self.chain.tip
 
         # Case 1: Extends current tip
         if (tip is not None and
                 block.header.height == tip.header.height + 1 and
                 block.header.prev_hash == tip.block_hash()):
+            # With its proof of work checked, the block is announced before
+            # full validation, so propagation doesn't wait on it at every
+            # hop. add_block doesn't yield, so a peer asking for the block
+            # is answered only once it is on our chain, or rejected.
+            relayed = None
+            if self._has_expected_work(block):
+                relayed = self.p2p.announce_block(
+                    block_hash, block.header.height, exclude=source_peer,
+                )
             try:
                 self.chain.add_block(block)
             except ValidationError as e:
                 logger.warning(f"rejected block {block_hash_hex[:16]}: {e}")
+                # we vouched for it on the strength of its work; the peer
+                # that sent it pays for the wasted relay
+                if relayed is not None and source_peer is not None:
+                    if self.p2p.scorer.record(source_peer.host, "invalid_block"):
+                        await source_peer.close()
                 return
 
             logger.info(f"accepted block {block_hash_hex[:16]}... height={block.header.height}")
             self.mempool.remove_confirmed(block)
             self.mempool.revalidate()
-            self.p2p.mark_sync_done()
-            await self.p2p.broadcast_block(block_hash_hex, block.header.height, exclude=source_peer)
+            self._notify_changed()
+            if relayed is None:
+                await self.p2p.broadcast_block(block_hash, block.header.height, exclude=source_peer)
+            else:
+                await self.p2p.drain_peers(relayed)
             return
 
         # Case 1b: Chain is empty (genesis)
@@ -204,7 +275,8 @@ class Node:
                 logger.warning(f"rejected genesis {block_hash_hex[:16]}: {e}")
                 return
             logger.info(f"accepted genesis {block_hash_hex[:16]}")
-            await self.p2p.broadcast_block(block_hash_hex, block.header.height, exclude=source_peer)
+            self._notify_changed()
+            await self.p2p.broadcast_block(block_hash, block.header.height, exclude=source_peer)
             return
 
         # Case 2: Known parent but not extending tip (fork candidate)
@@ -231,11 +303,12 @@ class Node:
                     orphaned = self.chain.reorganize(block_hash)
                     self._recycle_orphaned_transactions(orphaned)
                     self.mempool.revalidate()
+                    self._notify_changed()
                     logger.info(
                         f"reorg complete, height={self.chain.height}, "
                         f"orphaned {len(orphaned)} blocks"
                     )
-                    await self.p2p.broadcast_block(block_hash_hex, block.header.height, exclude=source_peer)
+                    await self.p2p.broadcast_block(block_hash, block.header.height, exclude=source_peer)
                 except (ValidationError, ValueError) as e:
                     logger.warning(f"reorg failed: {e}")
             return
@@ -244,25 +317,28 @@ class Node:
         logger.debug(
             f"block {block_hash_hex[:16]} has unknown parent, height={block.header.height}"
         )
-        if source_peer is not None and not self.p2p._syncing:
+        if source_peer is not None:
             asyncio.create_task(self.p2p._start_sync(source_peer))
 
+    def _has_expected_work(self, block: Block) -> bool:
+        """Header claims the (non-trivial) difficulty due at its height and meets it."""
+        expected = compute_expected_difficulty(self.chain, block.header.height)
+        return (expected >= PRE_RELAY_MIN_DIFFICULTY
+                and block.header.difficulty == expected and block.meets_difficulty())
+
     def _recycle_orphaned_transactions(self, orphaned_blocks: list[Block]) -> None:
         """Return non-coinbase transactions from orphaned blocks to the mempool."""
-        for block in orphaned_blocks:
-            for tx in block.transactions:
-                if isinstance(tx, Coinbase):
-                    continue
-                tx_hash = tx.tx_hash()
-                if tx_hash in self.chain.tx_index:
-                    continue  # already confirmed on new chain
-                if tx_hash in self.mempool:
-                    continue  # already pending
-                try:
-                    self.mempool.add(tx)
-                    logger.debug(f"recycled orphaned tx {tx_hash.hex()[:16]}")
-                except ValidationError:
-                    pass  # no longer valid against new state
+        candidates = [
+            tx
+            for block in orphaned_blocks
+            for tx in block.transactions
+            if not isinstance(tx, Coinbase)
+            and tx.tx_hash() not in self.chain.tx_index  # confirmed on new chain
+            and tx.tx_hash() not in self.mempool  # already pending
+        ]
+        # txs no longer valid against the new state are dropped
+        for tx_hash in self.mempool.add_many(candidates):
+            logger.debug(f"recycled orphaned tx {tx_hash.hex()[:16]}")
 
     # -- Mining --
 
@@ -287,13 +363,14 @@ class Node:
                 self.chain.add_block(block)
                 self.mempool.remove_confirmed(block)
                 self.mempool.revalidate()
-                bh = block.block_hash().hex()
-                logger.info(f"mined block {bh[:16]}... height={block.header.height}")
+                self._notify_changed()
+                bh = block.block_hash()
+                logger.info(f"mined block {bh.hex()[:16]}... height={block.header.height}")
                 await self.p2p.broadcast_block(bh, block.header.height)
                 # After mining an empty block, wait before mining the next one
                 # to avoid flooding the chain at low difficulty
                 if not has_txs:
-                    await asyncio.sleep(5)
+                    await asyncio.sleep(EMPTY_BLOCK_DELAY)
             except ValidationError as e:
                 logger.warning(f"mined block rejected: {e}")
                 # Purge any tx that no longer validates against current state
@@ -3,13 +3,22 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import re
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from ipaddress import ip_address, ip_network
 from typing import TYPE_CHECKING
 
-from jiji.core.config import DEFAULT_RPC_PORT, RPC_REQ_PER_MIN
-from jiji.core.merkle import merkle_proof
+from jiji.core.config import (
+    DEFAULT_RPC_PORT,
+    RPC_KEEPALIVE_MAX_REQUESTS,
+    RPC_KEEPALIVE_TIMEOUT,
+    RPC_OFFLOAD_MIN_BYTES,
+    RPC_OFFLOAD_MIN_TXS,
+    RPC_REQ_PER_MIN,
+)
+from jiji.core.merkle import merkle_levels, proof_from_levels
+from jiji.core.serialization import dumps, loads
 from jiji.core.transaction import transaction_from_dict
 
 if TYPE_CHECKING:
@@ -42,6 +51,17 @@ class RPCServer:
         self._trusted = [ip_network(c, strict=False) for c in trusted_cidrs]
         self._req_log: dict[str, deque[float]] = {}
         self._server: asyncio.Server | None = None
+        # Status line + fixed headers per (status, keep-alive); only Content-Length
+        # varies between responses.
+        self._heads: dict[tuple[int, bool], bytes] = {}
+        # Open client connections, closed on stop() so idle keep-alive
+        # sockets don't hold up shutdown.
+        self._writers: set[asyncio.StreamWriter] = set()
+        # block hash -> (leaf position by tx hash, merkle levels). A block's
+        # contents are fixed by its hash, so entries never go stale.
+        self._proof_trees: OrderedDict[bytes, tuple[dict[bytes, int], list[list[bytes]]]] = (
+            OrderedDict()
+        )
 
     async def start(self) -> None:
         self._server = await asyncio.start_server(
@@ -52,6 +72,8 @@ class RPCServer:
     async def stop(self) -> None:
         if self._server:
             self._server.close()
+            for writer in list(self._writers):
+                writer.close()
             await self._server.wait_closed()
 
     def _is_trusted(self, ip: str) -> bool:
@@ -80,92 +102,125 @@ class RPCServer:
     async def _handle_connection(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
     ) -> None:
+        """Serve requests on one connection until either side asks to close.
+
+        HTTP/1.1 keep-alive lets a client pipeline many calls over one
+        socket. The idle wait between requests is bounded by
+        RPC_KEEPALIVE_TIMEOUT and the request count by
+        RPC_KEEPALIVE_MAX_REQUESTS.
+        """
+        self._writers.add(writer)
         try:
             peer_addr = writer.get_extra_info("peername")
             peer_ip = peer_addr[0] if peer_addr else ""
-
-            # read HTTP request headers
-            raw = b""
-            while b"\r\n\r\n" not in raw:
-                chunk = await asyncio.wait_for(reader.read(4096), timeout=10)
-                if not chunk:
+            timeout = 10
+            for served in range(1, RPC_KEEPALIVE_MAX_REQUESTS + 1):
+                keep_alive = served < RPC_KEEPALIVE_MAX_REQUESTS
+                if not await self._serve_request(reader, writer, peer_ip, timeout, keep_alive):
                     return
-                raw += chunk
-
-            header_part, _, body_start = raw.partition(b"\r\n\r\n")
-            headers_text = header_part.decode("utf-8", errors="replace")
-            header_lines = headers_text.split("\r\n")
-            request_line = header_lines[0] if header_lines else ""
-            method_verb = request_line.split(" ", 1)[0].upper() if request_line else ""
-
-            # CORS preflight short-circuit — no rate limit on OPTIONS.
-            if method_verb == "OPTIONS":
-                await self._send_preflight(writer)
-                return
-
-            if not self._rate_limit_ok(peer_ip):
-                await self._send_http(
-                    writer,
-                    self._error_response(None, -32002, "Too Many Requests"),
-                    status_code=429,
-                )
-                return
-
-            content_length = 0
-            for line in header_lines:
-                lower = line.lower()
-                if lower.startswith("content-length:"):
-                    try:
-                        content_length = int(line.split(":", 1)[1].strip())
-                    except ValueError:
-                        content_length = 0
-
-            # read remaining body
-            body = body_start
-            while len(body) < content_length:
-                chunk = await asyncio.wait_for(reader.read(4096), timeout=10)
-                if not chunk:
-                    break
-                body += chunk
-
-            # parse JSON-RPC request
-            try:
-                request = json.loads(body.decode("utf-8"))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                response = self._error_response(None, -32700, "Parse error")
-                await self._send_http(writer, response)
-                return
-
-            result = await self._dispatch(request)
-            await self._send_http(writer, result)
-
+                timeout = RPC_KEEPALIVE_TIMEOUT
         except (asyncio.TimeoutError, ConnectionError, OSError):
             pass
         finally:
+            self._writers.discard(writer)
             try:
                 writer.close()
                 await writer.wait_closed()
             except (ConnectionError, OSError):
                 pass
 
+    async def _serve_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        peer_ip: str,
+        timeout: float,
+        keep_alive: bool,
+    ) -> bool:
+        """Read and answer one request. True if the connection stays open."""
+        # read HTTP request headers (bounded by the reader's 64 KiB limit)
+        try:
+            raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=timeout)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return False
+
+        request_line = raw[:raw.index(b"\r\n")]
+        method_verb = request_line.split(b" ", 1)[0].upper()
+        m = _CONNECTION_RE.search(raw)
+        connection = m.group(1).lower() if m else b""
+        if request_line.endswith(b"HTTP/1.1"):
+            keep_alive = keep_alive and b"close" not in connection
+        else:
+            keep_alive = keep_alive and b"keep-alive" in connection
+        m = _CONTENT_LENGTH_RE.search(raw)
+        content_length = int(m.group(1)) if m else 0
+
+        # CORS preflight short-circuit — no rate limit on OPTIONS.
+        if method_verb == b"OPTIONS":
+            # a preflight body is never read, so it would desync the stream
+            keep_alive = keep_alive and content_length == 0
+            await self._send_preflight(writer, keep_alive)
+            return keep_alive
+
+        if not self._rate_limit_ok(peer_ip):
+            await self._send_http(writer, _RATE_LIMITED_BODY, status_code=429)
+            return False
+
+        # read the body in one go; a short body falls through to a
+        # parse error below
+        try:
+            body = await asyncio.wait_for(reader.readexactly(content_length), timeout=10)
+        except asyncio.IncompleteReadError as e:
+            body = e.partial
+            keep_alive = False
+
+        # parse JSON-RPC request
+        try:
+            if len(body) >= RPC_OFFLOAD_MIN_BYTES:
+                request = await asyncio.to_thread(loads, body)
+            else:
+                request = loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            await self._send_http(writer, _PARSE_ERROR_BODY, keep_alive=keep_alive)
+            return keep_alive
+
+        result = await self._dispatch(request)
+        await self._send_http(writer, result, keep_alive=keep_alive)
+        return keep_alive
+
     async def _send_http(
-        self, writer: asyncio.StreamWriter, body: dict, status_code: int = 200,
+        self,
+        writer: asyncio.StreamWriter,
+        body: dict | bytes,
+        status_code: int = 200,
+        keep_alive: bool = False,
     ) -> None:
-        body_bytes = json.dumps(body, separators=(",", ":")).encode("utf-8")
-        status_line = f"HTTP/1.1 {status_code} {_http_reason(status_code)}\r\n".encode()
-        headers = [
-            status_line,
-            b"Content-Type: application/json\r\n",
-            b"Content-Length: " + str(len(body_bytes)).encode() + b"\r\n",
-            b"Connection: close\r\n",
-        ]
-        headers.extend(self._cors_header_lines())
-        headers.append(b"\r\n")
-        writer.write(b"".join(headers) + body_bytes)
+        """Write one JSON response. `body` may be pre-serialized bytes."""
+        if isinstance(body, bytes):
+            body_bytes = body
+        elif _is_bulky(body):
+            # Encoding still holds the GIL, but on a worker thread the
+            # interpreter's switch interval keeps the event loop running.
+            body_bytes = await asyncio.to_thread(dumps, body)
+        else:
+            body_bytes = dumps(body)
+        head = self._heads.get((status_code, keep_alive))
+        if head is None:
+            status_line = f"HTTP/1.1 {status_code} {_http_reason(status_code)}\r\n".encode()
+            head = self._heads[status_code, keep_alive] = b"".join([
+                status_line,
+                b"Content-Type: application/json\r\n",
+                b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n",
+                *self._cors_header_lines(),
+            ])
+        writer.write(b"%sContent-Length: %d\r\n\r\n%s" % (head, len(body_bytes), body_bytes))
         await writer.drain()
 
-    async def _send_preflight(self, writer: asyncio.StreamWriter) -> None:
-        headers = [b"HTTP/1.1 204 No Content\r\n", b"Connection: close\r\n"]
+    async def _send_preflight(self, writer: asyncio.StreamWriter, keep_alive: bool = False) -> None:
+        headers = [
+            b"HTTP/1.1 204 No Content\r\n",
+            b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n",
+        ]
         headers.extend(self._cors_header_lines())
         headers.append(b"\r\n")
         writer.write(b"".join(headers))
@@ -268,18 +323,31 @@ class RPCServer:
         block_hash_bytes = self.node.chain.tx_index.get(tx_hash)
         if block_hash_bytes is None:
             raise ValueError("transaction not in any confirmed block")
-        block = self.node.chain.get_block_by_hash(block_hash_bytes)
-        tx_hashes = [tx.tx_hash() for tx in block.transactions]
-        index = tx_hashes.index(tx_hash)
-        proof = merkle_proof(tx_hashes, index)
+        positions, levels = self._proof_tree(block_hash_bytes)
+        index = positions[tx_hash]
+        proof = proof_from_levels(levels, index)
         return {
             "tx_hash": tx_hash.hex(),
             "block_hash": block_hash_bytes.hex(),
             "index": index,
             "proof": [{"hash": h.hex(), "is_left": left} for h, left in proof],
-            "root": block.header.tx_merkle_root.hex(),
+            "root": levels[-1][0].hex(),  # equals the header root of a valid block
         }
 
+    def _proof_tree(self, block_hash: bytes) -> tuple[dict[bytes, int], list[list[bytes]]]:
+        """Leaf positions and Merkle levels for a block, built once per block."""
+        tree = self._proof_trees.get(block_hash)
+        if tree is not None:
+            self._proof_trees.move_to_end(block_hash)
+            return tree
+        block = self.node.chain.get_block_by_hash(block_hash)
+        tx_hashes = [tx.tx_hash() for tx in block.transactions]
+        tree = ({h: i for i, h in enumerate(tx_hashes)}, merkle_levels(tx_hashes))
+        self._proof_trees[block_hash] = tree
+        if len(self._proof_trees) > _PROOF_TREE_CACHE_SIZE:
+            self._proof_trees.popitem(last=False)
+        return tree
+
     async def _get_node_info(self, params: dict) -> dict:
         return {
             "height": self.node.chain.height,
@@ -292,6 +360,14 @@ class RPCServer:
         return {"nonce": self.node.mempool.next_nonce(pubkey)}
 
 
+# Matched against the raw header block (which ends in CRLF CRLF); a
+# missing or non-numeric value means no body.
+_CONTENT_LENGTH_RE = re.compile(rb"\r\ncontent-length:[ \t]*(\d+)[ \t]*\r\n", re.IGNORECASE)
+_CONNECTION_RE = re.compile(rb"\r\nconnection:[ \t]*([^\r]*)\r\n", re.IGNORECASE)
+
+# Blocks whose proof trees are kept; proof requests cluster on recent blocks.
+_PROOF_TREE_CACHE_SIZE = 16
+
 _HTTP_REASONS = {
     200: "OK",
     204: "No Content",
@@ -301,3 +377,20 @@ _HTTP_REASONS = {
 
 def _http_reason(status: int) -> str:
     return _HTTP_REASONS.get(status, "OK")
+
+
+def _is_bulky(response: dict) -> bool:
+    """True for block / mempool results long enough to encode off-loop."""
+    result = response.get("result")
+    return (isinstance(result, dict)
+            and len(result.get("transactions", ())) >= RPC_OFFLOAD_MIN_TXS)
+
+
+# Error bodies with no request id to echo never change, so they are
+# serialized once.
+_PARSE_ERROR_BODY = dumps({
+    "jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"},
+})
+_RATE_LIMITED_BODY = dumps({
+    "jsonrpc": "2.0", "id": None, "error": {"code": -32002, "message": "Too Many Requests"},
+})
@@ -1,11 +1,34 @@
 """SQLite-backed block storage."""
 from __future__ import annotations
 
-import json
+import os
 import sqlite3
 from pathlib import Path
 
 from jiji.core.block import Block
+from jiji.core.serialization import dumps, loads
+
+
+def warm_page_cache(paths: list[str | Path]) -> None:
+    """Ask the kernel to read files ahead into the page cache.
+
+    On a cold boot the startup replay does many small random reads against
+    the database; hinting POSIX_FADV_WILLNEED first lets the kernel stream
+    the files in sequentially. No-op where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # missing file (e.g. no WAL yet) — nothing to warm
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
 
 class BlockStore:
@@ -60,7 +83,7 @@ class BlockStore:
     def put_block(self, block: Block, on_main_chain: bool = True) -> None:
         """Store a block. Updates if already exists."""
         block_hash = block.block_hash()
-        data_json = json.dumps(block.to_dict(), separators=(",", ":"))
+        data_json = dumps(block.to_dict()).decode("utf-8")
         self._conn.execute(
             "INSERT OR REPLACE INTO blocks (block_hash, height, prev_hash, data, on_main_chain) "
             "VALUES (?, ?, ?, ?, ?)",
@@ -76,7 +99,7 @@ class BlockStore:
         row = cur.fetchone()
         if row is None:
             return None
-        return Block.from_dict(json.loads(row[0]))
+        return Block.from_dict(loads(row[0]))
 
     def has_block(self, block_hash: bytes) -> bool:
         """Check if a block exists."""
@@ -91,7 +114,7 @@ class BlockStore:
     def get_blocks_at_height(self, height: int) -> list[Block]:
         """Get all blocks at a given height (main + forks)."""
         cur = self._conn.execute("SELECT data FROM blocks WHERE height = ?", (height,))
-        return [Block.from_dict(json.loads(row[0])) for row in cur.fetchall()]
+        return [Block.from_dict(loads(row[0])) for row in cur.fetchall()]
 
     def get_main_chain_block_at_height(self, height: int) -> Block | None:
         """Get the main chain block at a given height."""
@@ -101,12 +124,12 @@ class BlockStore:
         row = cur.fetchone()
         if row is None:
             return None
-        return Block.from_dict(json.loads(row[0]))
+        return Block.from_dict(loads(row[0]))
 
     def get_children(self, block_hash: bytes) -> list[Block]:
         """Get all blocks whose prev_hash equals the given hash."""
         cur = self._conn.execute("SELECT data FROM blocks WHERE prev_hash = ?", (block_hash,))
-        return [Block.from_dict(json.loads(row[0])) for row in cur.fetchall()]
+        return [Block.from_dict(loads(row[0])) for row in cur.fetchall()]
 
     def get_tip_hash(self) -> bytes | None:
         """Get the main chain tip block hash."""
@@ -116,8 +139,13 @@ class BlockStore:
             return None
         return bytes.fromhex(row[0])
 
-    def get_main_chain_hashes(self) -> list[bytes]:
-        """Return ordered list of main chain block hashes (genesis to tip)."""
+    def get_main_chain_hashes(self, known: list[bytes] | None = None) -> list[bytes]:
+        """Return ordered list of main chain block hashes (genesis to tip).
+
+        `known` is a previously saved main chain (index file). The walk back
+        from the tip stops at the first block that sits at the same height in
+        `known`, and the rest of the chain is taken from it.
+        """
         tip_hash = self.get_tip_hash()
         if tip_hash is None:
             return []
@@ -126,14 +154,19 @@ class BlockStore:
         hashes = []
         current_hash = tip_hash
         while current_hash != bytes(32):  # genesis prev_hash is all zeros
-            hashes.append(current_hash)
             cur = self._conn.execute(
-                "SELECT prev_hash FROM blocks WHERE block_hash = ? AND on_main_chain = 1",
+                "SELECT prev_hash, height FROM blocks WHERE block_hash = ? AND on_main_chain = 1",
                 (current_hash,)
             )
             row = cur.fetchone()
             if row is None:
+                hashes.append(current_hash)
                 break
+            height = row[1]
+            if known and height < len(known) and known[height] == current_hash:
+                hashes.reverse()
+                return known[:height + 1] + hashes
+            hashes.append(current_hash)
             current_hash = row[0]
 
         hashes.reverse()  # return in ascending order
@@ -0,0 +1,10 @@
+"""Run the async tests on uvloop when it's installed, like the node does."""
+import asyncio
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows, and optional elsewhere
+    uvloop = None
+
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
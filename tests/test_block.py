@@ -37,6 +37,20 @@ class TestBlockHash:
         h2 = block.block_hash()
         assert h1 != h2
 
+    def test_header_to_dict_tracks_nonce(self):
+        block, _ = make_genesis_block()
+        assert block.header.to_dict()["nonce"] == 0
+        block.header.nonce = 5
+        assert block.header.to_dict()["nonce"] == 5
+
+    def test_canonical_bytes_matches_canonicalize(self):
+        from jiji.core.serialization import canonicalize
+        block, _ = make_genesis_block()
+        header = block.header
+        assert header.canonical_bytes() == canonicalize(header.to_dict())
+        header.nonce = 2**40
+        assert header.canonical_bytes() == canonicalize(header.to_dict())
+
 
 class TestMeetsDifficulty:
     def test_genesis_difficulty(self):
@@ -48,6 +62,21 @@ class TestMeetsDifficulty:
         block.header.difficulty = 256  # requires hash of all zeros
         assert not block.meets_difficulty()
 
+    def test_byte_compare_matches_integer_compare(self):
+        from jiji.core.config import MAX_TARGET
+        block, _ = make_genesis_block()
+        for difficulty in (1, 2, 3, 16, 1000):
+            block.header.difficulty = difficulty
+            for nonce in range(50):
+                block.header.nonce = nonce
+                expected = int.from_bytes(block.block_hash(), "big") <= MAX_TARGET // difficulty
+                assert block.meets_difficulty() == expected
+
+    def test_negative_difficulty_fails(self):
+        block, _ = make_genesis_block()
+        block.header.difficulty = -1
+        assert not block.meets_difficulty()
+
 
 class TestMerkleRoot:
     def test_matches_manual_computation(self):
@@ -61,6 +90,21 @@ class TestSerializedSize:
         block, _ = make_genesis_block()
         assert block.serialized_size() > 0
 
+    def test_matches_canonicalize(self):
+        from jiji.core.serialization import canonicalize
+        from jiji.core.transaction import Post, Transfer
+        block, _ = make_genesis_block()
+        assert block.serialized_size() == len(canonicalize(block.to_dict()))
+        priv, pub = generate_keypair()
+        post = Post(author=pub, nonce=0, timestamp=1, body="ü", reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        t = Transfer(sender=pub, recipient=pub, amount=1, nonce=1, gas_fee=1)
+        block.transactions += [post, t]
+        block.header.nonce = 123456789
+        assert block.serialized_size() == len(canonicalize(block.to_dict()))
+        block.transactions = []
+        assert block.serialized_size() == len(canonicalize(block.to_dict()))
+
 
 class TestBlockRoundtrip:
     def test_to_dict_from_dict(self):
@@ -0,0 +1,102 @@
+"""Tests for the gossip dedup filters: membership, rotation, and persistence."""
+import os
+
+import pytest
+
+from jiji.net.bloom import BloomFilter, NetCache, RotatingBloom
+
+
+def test_test_and_add():
+    b = RotatingBloom(1000)
+    key = os.urandom(32)
+    assert key not in b
+    assert not b.test_and_add(key)
+    assert key in b
+    assert b.test_and_add(key)
+
+
+def test_no_false_negatives_within_capacity():
+    b = RotatingBloom(2000)
+    keys = [os.urandom(32) for _ in range(1999)]
+    for k in keys:
+        b.add(k)
+    assert all(k in b for k in keys)
+
+
+def test_false_positive_rate_near_target():
+    b = RotatingBloom(5000, error_rate=0.01)
+    for _ in range(4999):
+        b.add(os.urandom(32))
+    hits = sum(os.urandom(32) in b for _ in range(5000))
+    assert hits < 5000 * 0.03
+
+
+def test_old_generation_ages_out():
+    # tiny error rate: a false positive would skip an insert and a rotation
+    b = RotatingBloom(100, error_rate=1e-12)
+    old = os.urandom(32)
+    b.add(old)
+    for _ in range(99):  # fills and rotates the first generation
+        b.add(os.urandom(32))
+    assert old in b  # still remembered by the previous generation
+    for _ in range(100):
+        b.add(os.urandom(32))
+    assert old not in b
+
+
+def test_touch_carries_key_forward():
+    b = RotatingBloom(100)
+    key = os.urandom(32)
+    b.add(key)
+    b.rotate()
+    assert b.test_and_add(key)  # seen in previous gen, copied to current
+    b.rotate()
+    assert key in b
+
+
+def test_roundtrip_dict():
+    b = RotatingBloom(500)
+    keys = [os.urandom(32) for _ in range(50)]
+    for k in keys:
+        b.add(k)
+    b2 = RotatingBloom(500)
+    assert b2.load_dict(b.to_dict())
+    assert all(k in b2 for k in keys)
+
+
+def test_load_rejects_other_shape():
+    b = RotatingBloom(500)
+    b.add(b"x" * 32)
+    other = RotatingBloom(600)
+    assert not other.load_dict(b.to_dict())
+    assert b"x" * 32 not in other
+
+
+def test_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        RotatingBloom(0)
+    with pytest.raises(ValueError):
+        RotatingBloom(10, error_rate=1.5)
+
+
+def test_bloom_filter_rebuilds_from_wire_parts():
+    f = BloomFilter.for_capacity(100)
+    keys = [os.urandom(32) for _ in range(100)]
+    for k in keys:
+        f.add(k)
+    g = BloomFilter(f.bits, f.k, f.salt)
+    assert all(k in g for k in keys)
+    with pytest.raises(ValueError):
+        BloomFilter(b"", 3, f.salt)
+    with pytest.raises(ValueError):
+        BloomFilter(f.bits, 3, b"short")
+
+
+def test_net_cache_hits_until_slot_reused():
+    c = NetCache(8)
+    assert not c.test_and_add(0x1234)
+    assert c.test_and_add(0x1234)
+    assert not c.test_and_add(0x1234 + 8)  # same slot, evicts the first key
+    assert not c.test_and_add(0x1234)
+    with pytest.raises(ValueError):
+        NetCache(100)
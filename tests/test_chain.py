@@ -1,7 +1,7 @@
 import pytest
 from jiji.core.crypto import generate_keypair
 from jiji.core.block import Block, BlockHeader
-from jiji.core.chain import Blockchain
+from jiji.core.chain import Blockchain, HashChain
 from jiji.core.config import GENESIS_DIFFICULTY, PROTOCOL_VERSION, block_reward
 from jiji.core.merkle import merkle_root
 from jiji.core.transaction import Post, Endorse, Transfer, Coinbase
@@ -17,14 +17,12 @@ def build_block(chain, txs, miner_pub, timestamp):
     cb = Coinbase(recipient=miner_pub, amount=block_reward(height), height=height)
     all_txs = [cb] + txs
     tx_root = merkle_root([tx.tx_hash() for tx in all_txs])
-    working = chain.state.copy()
+    working = chain.state.overlay()
+    block_post_authors = {tx.tx_hash(): tx.author for tx in all_txs if isinstance(tx, Post)}
     for tx in all_txs:
         target_author = None
         if isinstance(tx, Endorse) and tx.amount > 0:
-            target_author = chain.post_authors.get(tx.target)
-            for prev_tx in all_txs:
-                if isinstance(prev_tx, Post) and prev_tx.tx_hash() == tx.target:
-                    target_author = prev_tx.author
+            target_author = block_post_authors.get(tx.target, chain.post_authors.get(tx.target))
         working.apply_transaction(tx, miner_pub, target_author)
     header = BlockHeader(
         PROTOCOL_VERSION, height, chain.tip.block_hash(), timestamp,
@@ -177,3 +175,67 @@ class TestRejectsInvalidBlock:
         # try adding same height again
         with pytest.raises(ValidationError):
             chain.add_block(b1, current_time=1000025)
+
+
+class TestHashChain:
+    def test_list_behaviour(self):
+        hashes = [bytes([i]) * 32 for i in range(5)]
+        hc = HashChain(hashes)
+        assert len(hc) == 5
+        assert hc[0] == hashes[0] and hc[-1] == hashes[-1]
+        assert hc[1:3] == hashes[1:3]
+        assert list(hc) == hashes
+        assert hc == hashes
+        assert hc.index(hashes[3]) == 3
+        assert hashes[2] in hc
+        assert bytes(hc.view(4)) == hashes[4]
+        with pytest.raises(IndexError):
+            hc[5]
+
+    def test_index_ignores_unaligned_matches(self):
+        # b"\x01" * 32 appears straddling the boundary of these two hashes
+        hc = HashChain([b"\x00" * 16 + b"\x01" * 16, b"\x01" * 16 + b"\x00" * 16])
+        with pytest.raises(ValueError):
+            hc.index(b"\x01" * 32)
+        assert b"\x01" * 32 not in hc
+
+    def test_rejects_wrong_length(self):
+        with pytest.raises(ValueError):
+            HashChain().append(b"short")
+
+
+class TestMedianTimestamp:
+    def test_matches_statistics_median(self):
+        import statistics
+        priv, pub = make_keys()
+        chain = Blockchain()
+        assert chain.median_timestamp(11) is None
+        chain.initialize_genesis(pub, timestamp=1000000)
+        ts = 1000000
+        for i in range(6):
+            ts += 7 + i
+            chain.add_block(build_block(chain, [], pub, ts), current_time=ts + 1)
+            for count in (1, 2, 3, 4, 11):
+                recent = chain.get_recent_timestamps(count)
+                assert chain.median_timestamp(count) == statistics.median(recent)
+
+
+class TestDifficultyCache:
+    def test_retarget_memoized_per_tip(self, monkeypatch):
+        import jiji.core.validation as validation
+        from jiji.core.config import DIFFICULTY_ADJUSTMENT_WINDOW
+        priv, pub = make_keys()
+        chain = Blockchain()
+        chain.initialize_genesis(pub, timestamp=1000000)
+        ts = 1000000
+        while chain.height < DIFFICULTY_ADJUSTMENT_WINDOW - 1:
+            ts += 3
+            chain.add_block(build_block(chain, [], pub, ts), current_time=ts + 1)
+        boundary = DIFFICULTY_ADJUSTMENT_WINDOW
+        expected = validation.compute_expected_difficulty(chain, boundary)
+        assert chain._difficulty_cache == (chain.tip.block_hash(), boundary, expected)
+
+        def fail(chain, height):
+            raise AssertionError("retarget recomputed for the same tip")
+        monkeypatch.setattr(validation, "_retarget", fail)
+        assert validation.compute_expected_difficulty(chain, boundary) == expected
@@ -45,3 +45,43 @@ class TestSignAndVerify:
         priv, pub = generate_keypair()
         sig = sign(priv, b"")
         assert verify(pub, b"", sig)
+
+
+class TestKeyCache:
+    def test_bad_public_key_is_not_cached_as_valid(self):
+        priv, pub = generate_keypair()
+        sig = sign(priv, b"hello")
+        assert not verify(b"\x00" * 31, b"hello", sig)
+        assert verify(pub, b"hello", sig)
+        assert not verify(b"\x00" * 31, b"hello", sig)
+
+    def test_repeated_sign_is_deterministic(self):
+        priv, pub = generate_keypair()
+        assert sign(priv, b"m") == sign(priv, b"m")
+        assert verify(pub, b"m", sign(priv, b"m"))
+
+
+class TestVerifyBatch:
+    def test_all_valid(self):
+        from jiji.core.crypto import verify_batch
+        items = []
+        for i in range(5):
+            priv, pub = generate_keypair()
+            msg = bytes([i]) * 10
+            items.append((pub, msg, sign(priv, msg)))
+        assert verify_batch(items)
+        assert verify_batch([])
+
+    def test_one_bad(self):
+        from jiji.core.crypto import verify_batch
+        priv, pub = generate_keypair()
+        items = [(pub, b"a", sign(priv, b"a")), (pub, b"b", sign(priv, b"a"))]
+        assert not verify_batch(items)
+
+    def test_bad_item_mid_batch(self):
+        from jiji.core import crypto
+        priv, pub = generate_keypair()
+        items = [(pub, bytes([i]), sign(priv, bytes([i]))) for i in range(7)]
+        assert crypto.verify_batch(items)
+        items[5] = (pub, b"x", items[5][2])
+        assert not crypto.verify_batch(items)
@@ -10,9 +10,10 @@ from jiji.core.state import WorldState
 
 
 def _fresh_root(ws: WorldState) -> bytes:
-    """Recompute the state root with an empty leaf cache."""
+    """Recompute the state root with an empty leaf and tree cache."""
     ws._leaf_cache.clear()
     ws._dirty.clear()
+    ws._levels = None
     return ws.state_root()
 
 
@@ -70,6 +71,30 @@ def test_copy_preserves_cache_correctness():
     assert ws.state_root() == root_a
 
 
+def test_overlay_root_matches_applied_state():
+    rng = random.Random(11)
+    ws = WorldState()
+    keys = [rng.randbytes(32) for _ in range(9)]
+    for i, pk in enumerate(keys):
+        ws.get_or_create(pk).balance = i
+    ws.state_root()
+    # Touch existing accounts only (patched from the base tree), then add one.
+    overlay = ws.overlay()
+    for pk in keys[::3]:
+        overlay.get_or_create(pk).balance += 5
+        overlay._invalidate(pk)
+    expected = ws.copy()
+    for pk in keys[::3]:
+        expected.accounts[pk].balance += 5
+    assert overlay.state_root() == _fresh_root(expected)
+    overlay.get_or_create(rng.randbytes(32))
+    expected = WorldState()
+    expected.accounts = {**ws.accounts, **overlay.accounts}
+    assert overlay.state_root() == _fresh_root(expected)
+    # The base tree is unchanged by the overlay.
+    assert ws.state_root() == _fresh_root(ws.copy())
+
+
 def test_empty_state_root_stable():
     ws = WorldState()
     r1 = ws.state_root()
@@ -157,6 +157,35 @@ class TestMempoolAdd:
             pool.add(tx)
 
 
+class TestMempoolAddMany:
+    def test_accepts_valid_and_skips_bad_signature(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        good = []
+        for n in range(3):
+            post = Post(author=pub, nonce=n, timestamp=1000010, body=f"p{n}",
+                        reply_to=None, gas_fee=1)
+            post.sign_tx(priv)
+            good.append(post)
+        bad = Post(author=pub, nonce=3, timestamp=1000010, body="bad",
+                   reply_to=None, gas_fee=1)
+        bad.sign_tx(priv)
+        bad.signature = bytes(64)
+        accepted = pool.add_many(good + [bad])
+        assert accepted == [tx.tx_hash() for tx in good]
+        assert bad.tx_hash() not in pool
+        assert pool.size == 3
+
+    def test_marks_signatures_verified(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        post = Post(author=pub, nonce=0, timestamp=1000010, body="x",
+                    reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        pool.add_many([post])
+        assert post.signature_verified()
+
+
 class TestMempoolEviction:
     def test_evicts_lowest_fee_when_full(self):
         chain, priv, pub = setup_chain()
@@ -195,6 +224,63 @@ class TestMempoolEviction:
             pool.add(p2)
 
 
+class TestMarkKnownSignatures:
+    def test_copies_verification_to_matching_tx(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        post = Post(author=pub, nonce=0, timestamp=1000010, body="x",
+                    reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        pool.add(post)
+        relayed = Post.from_dict(post.to_dict())
+        assert not relayed.signature_verified()
+        assert pool.mark_known_signatures([relayed]) == 1
+        assert relayed.signature_verified()
+
+    def test_ignores_different_signature(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        post = Post(author=pub, nonce=0, timestamp=1000010, body="x",
+                    reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        pool.add(post)
+        forged = Post.from_dict(post.to_dict())
+        forged.signature = bytes(64)
+        assert forged.tx_hash() == post.tx_hash()
+        assert pool.mark_known_signatures([forged]) == 0
+        assert not forged.verify_signature()
+
+
+class TestMempoolPriorityIndex:
+    def test_index_tracks_adds_and_removals(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        posts = []
+        for n, fee in enumerate([3, 1, 2, 5]):
+            p = Post(author=pub, nonce=n, timestamp=1000010, body="x",
+                     reply_to=None, gas_fee=fee)
+            p.sign_tx(priv)
+            pool.add(p)
+            posts.append(p)
+        assert [t.gas_fee for t in pool.get_pending()] == [5, 3, 2, 1]
+        assert [t.gas_fee for t in pool.get_pending(limit=2)] == [5, 3]
+        pool.remove(posts[0].tx_hash())
+        assert [t.gas_fee for t in pool.get_pending()] == [5, 2, 1]
+        assert len(pool._order) == pool.size == 3
+
+    def test_ties_keep_arrival_order(self):
+        chain, priv, pub = setup_chain()
+        pool = Mempool(chain)
+        posts = []
+        for n in range(5):
+            p = Post(author=pub, nonce=n, timestamp=1000010, body="same",
+                     reply_to=None, gas_fee=1)
+            p.sign_tx(priv)
+            pool.add(p)
+            posts.append(p)
+        assert pool.get_pending() == posts
+
+
 class TestMempoolRemove:
     def test_remove_single(self):
         chain, priv, pub = setup_chain()
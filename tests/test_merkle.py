@@ -1,6 +1,9 @@
 import pytest
 from jiji.core.serialization import sha256
-from jiji.core.merkle import merkle_root, merkle_proof, verify_merkle_proof, EMPTY_HASH
+from jiji.core.merkle import (
+    EMPTY_HASH, MerkleAccumulator, merkle_levels, merkle_proof, merkle_root,
+    proof_from_levels, updated_root, verify_merkle_proof,
+)
 
 
 class TestMerkleRoot:
@@ -32,6 +35,13 @@ class TestMerkleRoot:
         leaves = [sha256(bytes([i])) for i in range(5)]
         assert merkle_root(leaves) == merkle_root(leaves)
 
+    def test_does_not_mutate_input(self):
+        leaves = [sha256(bytes([i])) for i in range(5)]
+        original = list(leaves)
+        merkle_root(leaves)
+        merkle_proof(leaves, 4)
+        assert leaves == original
+
 
 class TestMerkleProof:
     def test_proof_roundtrip_two_elements(self):
@@ -48,6 +58,15 @@ class TestMerkleProof:
             proof = merkle_proof(leaves, i)
             assert verify_merkle_proof(leaves[i], proof, root)
 
+    def test_proofs_from_shared_levels(self):
+        leaves = [sha256(bytes([i])) for i in range(11)]
+        levels = merkle_levels(leaves)
+        assert levels[-1] == [merkle_root(leaves)]
+        for i in range(11):
+            assert proof_from_levels(levels, i) == merkle_proof(leaves, i)
+        with pytest.raises(ValueError):
+            proof_from_levels(levels, 11)
+
     def test_proof_roundtrip_large(self):
         leaves = [sha256(bytes([i])) for i in range(16)]
         root = merkle_root(leaves)
@@ -68,6 +87,13 @@ class TestMerkleProof:
         wrong_root = sha256(b"wrong")
         assert not verify_merkle_proof(leaves[0], proof, wrong_root)
 
+    def test_all_indices_verify_odd_sizes(self):
+        for n in (1, 3, 5, 7, 11):
+            leaves = [sha256(bytes([i])) for i in range(n)]
+            root = merkle_root(leaves)
+            for i in range(n):
+                assert verify_merkle_proof(leaves[i], merkle_proof(leaves, i), root)
+
     def test_invalid_index_raises(self):
         leaves = [sha256(b"a")]
         with pytest.raises(ValueError):
@@ -76,3 +102,37 @@ class TestMerkleProof:
             merkle_proof(leaves, -1)
         with pytest.raises(ValueError):
             merkle_proof([], 0)
+
+
+class TestUpdatedRoot:
+    def test_matches_full_rebuild(self):
+        for n in (1, 2, 3, 7, 8, 13):
+            leaves = [sha256(bytes([i])) for i in range(n)]
+            for changed_at in ({0}, {n - 1}, set(range(0, n, 2))):
+                changed = {i: sha256(b"new" + bytes([i])) for i in changed_at}
+                expected = merkle_root([changed.get(i, leaf) for i, leaf in enumerate(leaves)])
+                levels = merkle_levels(leaves)
+                assert updated_root(levels, changed) == expected
+                assert levels == merkle_levels(leaves)  # untouched by default
+                assert updated_root(levels, changed, in_place=True) == expected
+                assert levels[-1][0] == expected
+                assert levels[0] == [changed.get(i, leaf) for i, leaf in enumerate(leaves)]
+
+    def test_no_changes_returns_current_root(self):
+        leaves = [sha256(bytes([i])) for i in range(5)]
+        assert updated_root(merkle_levels(leaves), {}) == merkle_root(leaves)
+
+
+class TestMerkleAccumulator:
+    def test_matches_merkle_root_at_every_size(self):
+        leaves = [sha256(bytes([i])) for i in range(40)]
+        acc = MerkleAccumulator()
+        assert acc.root() == EMPTY_HASH
+        for i, leaf in enumerate(leaves):
+            acc.add(leaf)
+            assert len(acc) == i + 1
+            assert acc.root() == merkle_root(leaves[:i + 1])
+
+    def test_init_from_list(self):
+        leaves = [sha256(bytes([i])) for i in range(13)]
+        assert MerkleAccumulator(leaves).root() == merkle_root(leaves)
@@ -94,13 +94,31 @@ class TestCreateBlockTemplate:
         priv2, pub2 = make_keys()
         bad = Post(author=pub2, nonce=0, timestamp=1000010, body="bad", reply_to=None, gas_fee=1)
         bad.sign_tx(priv2)
-        pool._txs[bad.tx_hash()] = bad
+        pool._insert(bad, None)
         block = miner.create_block_template()
         # only coinbase + p1 should be included (bad tx skipped)
         assert len(block.transactions) == 2
         tx_hashes = [tx.tx_hash() for tx in block.transactions]
         assert p1.tx_hash() in tx_hashes
 
+    def test_stops_at_block_size_limit(self, monkeypatch):
+        import jiji.mining.miner as miner_mod
+        chain, pool, miner, priv, pub = setup_all()
+        posts = []
+        for nonce in range(5):
+            p = Post(author=pub, nonce=nonce, timestamp=1000010, body="x" * 200,
+                     reply_to=None, gas_fee=1)
+            p.sign_tx(priv)
+            pool.add(p)
+            posts.append(p)
+        cb = Coinbase(recipient=pub, amount=block_reward(1), height=1)
+        limit = (miner_mod._BLOCK_SIZE_OVERHEAD + cb.serialized_size()
+                 + sum(p.serialized_size() + 1 for p in posts[:3]))
+        monkeypatch.setattr(miner_mod, "MAX_BLOCK_SIZE", limit)
+        block = miner.create_block_template()
+        assert len(block.transactions) == 4
+        assert block.serialized_size() <= limit
+
     def test_computes_correct_roots(self):
         chain, pool, miner, priv, pub = setup_all()
         post = Post(author=pub, nonce=0, timestamp=1000010, body="roots", reply_to=None, gas_fee=1)
@@ -127,6 +145,14 @@ class TestMineBlock:
         assert result is not None
         assert result.meets_difficulty()
 
+    def test_difficulty_one_skips_grind(self, monkeypatch):
+        import jiji.mining.miner as miner_mod
+        chain, pool, miner, priv, pub = setup_all()
+        template = miner.create_block_template()
+        monkeypatch.setattr(miner_mod, "_grind", None)  # must not be called
+        assert miner.mine_block(template) is template
+        assert template.header.nonce == 0
+
     def test_nonce_increments(self):
         chain, pool, miner, priv, pub = setup_all()
         template = miner.create_block_template()
@@ -134,6 +160,32 @@ class TestMineBlock:
         block = miner.mine_block(template)
         assert block.header.nonce >= original_nonce
 
+    def test_finds_first_valid_nonce_at_real_difficulty(self):
+        from jiji.core.config import MAX_TARGET
+        chain, pool, miner, priv, pub = setup_all()
+        template = miner.create_block_template()
+        template.header.difficulty = 64
+        block = miner.mine_block(template)
+        assert block.meets_difficulty()
+        found = block.header.nonce
+        for nonce in range(found):
+            block.header.nonce = nonce
+            assert int.from_bytes(block.block_hash(), "big") > MAX_TARGET // 64
+
+    def test_gives_up_at_next_untried_nonce(self):
+        chain, pool, miner, priv, pub = setup_all()
+        template = miner.create_block_template()
+        template.header.difficulty = 2**200
+        assert miner.mine_block(template, max_iterations=10) is None
+        assert template.header.nonce == 10
+
+    def test_nonce_template_reassembles_header(self):
+        chain, pool, miner, priv, pub = setup_all()
+        header = miner.create_block_template().header
+        header.nonce = 123456
+        prefix, suffix = header.nonce_template()
+        assert prefix + b"123456" + suffix == header.canonical_bytes()
+
 
 class TestMineNext:
     def test_advances_chain(self):
@@ -1,9 +1,9 @@
 import asyncio
 import json
-import pytest
 from jiji.core.crypto import generate_keypair
 from jiji.core.transaction import Post, Transfer
 from jiji.node import Node
+from tests.test_rpc import HTTPSession
 
 
 def make_keys():
@@ -36,20 +36,9 @@ def get_rpc_port(node):
 
 
 async def rpc_call(port, method, params=None):
-    """Send a JSON-RPC request over HTTP and return the parsed response."""
-    body = json.dumps({
-        "jsonrpc": "2.0", "method": method, "params": params or {}, "id": 1,
-    }).encode()
-    reader, writer = await asyncio.open_connection("127.0.0.1", port)
-    writer.write(
-        f"POST / HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
-    )
-    await writer.drain()
-    resp = await asyncio.wait_for(reader.read(65536), timeout=5)
-    writer.close()
-    await writer.wait_closed()
-    _, _, resp_body = resp.partition(b"\r\n\r\n")
-    return json.loads(resp_body)
+    """Send one JSON-RPC request over HTTP and return the parsed response."""
+    async with HTTPSession(port) as session:
+        return await session.call(method, params)
 
 
 class TestSingleNode:
@@ -84,18 +73,38 @@ class TestSingleNode:
                     body="rpc test", reply_to=None, gas_fee=1,
                 )
                 post.sign_tx(node.private_key)
-                result = await rpc_call(port, "submit_transaction", {
-                    "transaction": post.to_dict(),
-                })
+                async with HTTPSession(port) as session:
+                    result, mempool_result = await session.pipeline([
+                        ("submit_transaction", {"transaction": post.to_dict()}),
+                        ("get_mempool", None),  # verify it's in mempool
+                    ])
                 assert "result" in result
                 assert result["result"]["tx_hash"] == post.tx_hash().hex()
-                # verify it's in mempool
-                mempool_result = await rpc_call(port, "get_mempool")
                 assert post.tx_hash().hex() in mempool_result["result"]["transactions"]
             finally:
                 await node.stop()
         asyncio.run(_test())
 
+    def test_wait_until_wakes_on_change(self):
+        async def _test():
+            node = await create_node()
+            try:
+                post = Post(author=node.public_key, nonce=0, timestamp=1000010,
+                            body="wake", reply_to=None, gas_fee=1)
+                post.sign_tx(node.private_key)
+                assert not await node.wait_until(lambda: post.tx_hash() in node.mempool, 0.05)
+                loop = asyncio.get_running_loop()
+                waiter = asyncio.create_task(
+                    node.wait_until(lambda: post.tx_hash() in node.mempool, timeout=5))
+                await asyncio.sleep(0)
+                start = loop.time()
+                await node.handle_new_transaction(post)
+                assert await waiter
+                assert loop.time() - start < 1
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
     def test_mining_produces_blocks(self):
         async def _test():
             node = await create_node(mine=True)
@@ -107,15 +116,414 @@ class TestSingleNode:
                 await node.handle_new_transaction(post.to_dict())
 
                 # wait for at least one block to be mined
-                for _ in range(50):
-                    if node.chain.height > 0:
-                        break
-                    await asyncio.sleep(0.1)
-                assert node.chain.height > 0
+                assert await node.wait_until(lambda: node.chain.height > 0, timeout=5)
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
+    def test_seen_sets_persist(self, tmp_path):
+        from jiji.net.server import P2PServer
+        tx_hash, block_hash = bytes(range(32)), bytes(32)
+        p2p = P2PServer(None, data_dir=str(tmp_path))
+        p2p._seen_tx_hashes.add(tx_hash)
+        p2p._seen_add(p2p._seen_block_hashes, block_hash)
+        p2p.save_seen()
+        restored = P2PServer(None, data_dir=str(tmp_path))
+        restored.load_seen()
+        assert tx_hash in restored._seen_tx_hashes
+        assert block_hash in restored._seen_block_hashes
+
+    def test_seen_loads_legacy_hex_list(self, tmp_path):
+        from jiji.net.server import P2PServer
+        (tmp_path / "seen.json").write_text(json.dumps({"tx": ["ab" * 32], "block": []}))
+        p2p = P2PServer(None, data_dir=str(tmp_path))
+        p2p.load_seen()
+        assert bytes.fromhex("ab" * 32) in p2p._seen_tx_hashes
+
+    def test_repeated_announces_dropped_on_arrival(self):
+        from jiji.net.protocol import make_block_announce, make_tx_announce, make_tx_request
+        from jiji.net.server import P2PServer
+        p2p = P2PServer(None)
+        announce = make_tx_announce("ab" * 32)
+        assert not p2p._repeated_announce(announce)
+        assert p2p._repeated_announce(make_tx_announce("ab" * 32))
+        # separate tables per type; other messages and odd payloads pass
+        assert not p2p._repeated_announce(make_block_announce("ab" * 32, 3))
+        assert not p2p._repeated_announce(make_tx_request("ab" * 32))
+        assert not p2p._repeated_announce(make_tx_announce("zz"))
+
+    def test_repeated_block_announce_still_raises_peer_height(self):
+        from collections import deque
+        from jiji.net.protocol import MessageType, make_block_announce
+
+        class FakePeer:
+            def __init__(self, address):
+                self.address = address
+                self.peer_height = 0
+                self.inflight_sync_ranges = deque()
+                self.sent = []
+
+            async def send(self, msg):
+                self.sent.append(msg.msg_type)
+
+            async def send_many(self, msgs):
+                self.sent.extend(m.msg_type for m in msgs)
+
+        async def _test():
+            node = await create_node()
+            try:
+                peer_a, peer_b = FakePeer(("10.0.0.1", 1)), FakePeer(("10.0.0.2", 1))
+                for peer in (peer_a, peer_b):
+                    await node.p2p._handle_message(peer, make_block_announce("ab" * 32, 3))
+                assert peer_a.peer_height == peer_b.peer_height == 3
+                assert peer_a.sent == [MessageType.SYNC_REQUEST]
+                assert peer_b.sent == []  # dropped as a repeat after the height update
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
+    def test_mempool_digest_resends_and_prunes(self):
+        from jiji.net.bloom import BloomFilter
+        from jiji.net.protocol import MessageType, make_mempool_bloom
+
+        class FakePeer:
+            address = ("10.0.0.1", 1)
+            peer_mempool_bloom = None
+            mempool_blooms = 0
+
+            def __init__(self):
+                self.sent_mempool_hashes = {}
+                self.sent = []
+
+            async def send_many(self, msgs):
+                self.sent.extend(msgs)
+
+        def digest(*hashes):
+            bloom = BloomFilter.for_capacity(8)
+            for h in hashes:
+                bloom.add(h)
+            return make_mempool_bloom(bloom.bits, bloom.k, bloom.salt)
+
+        async def _test():
+            node = await create_node()
+            try:
+                post = Post(author=node.public_key, nonce=0, timestamp=1000010,
+                            body="resend", reply_to=None, gas_fee=1)
+                post.sign_tx(node.private_key)
+                h = node.mempool.add(post)
+                peer = FakePeer()
+                kinds = []
+                for _ in range(4):
+                    peer.sent.clear()
+                    await node.p2p._on_mempool_bloom(peer, digest())
+                    kinds.append([m.msg_type for m in peer.sent])
+                # announced, given a digest's grace, then pushed whole
+                assert kinds == [
+                    [MessageType.TX_ANNOUNCE], [], [MessageType.TX_RESPONSE], [],
+                ]
+                # once the peer's digest has it, it's no longer tracked
+                await node.p2p._on_mempool_bloom(peer, digest(h))
+                assert peer.sent_mempool_hashes == {}
+                # nor are txs that have left our mempool
+                await node.p2p._on_mempool_bloom(peer, digest())
+                assert h in peer.sent_mempool_hashes
+                node.mempool._discard(h)
+                await node.p2p._on_mempool_bloom(peer, digest())
+                assert peer.sent_mempool_hashes == {}
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
+    def test_block_announced_before_full_validation(self, monkeypatch):
+        import jiji.node as node_mod
+        from tests.test_chain import build_block
+        # genesis difficulty is below the pre-relay floor; lower the floor
+        monkeypatch.setattr(node_mod, "PRE_RELAY_MIN_DIFFICULTY", 1)
+
+        async def _test():
+            node = await create_node()
+            try:
+                chain = node.chain
+                ts = chain.tip.header.timestamp + 1
+                block = build_block(chain, [], node.public_key, ts)
+                order = []
+                add_block = chain.add_block
+                announce_block = node.p2p.announce_block
+                chain.add_block = lambda b: (order.append("validate"), add_block(b))
+                node.p2p.announce_block = lambda *a, **kw: (
+                    order.append("announce"), announce_block(*a, **kw))[1]
+                await node.handle_new_block(block.to_dict())
+                assert order == ["announce", "validate"]
+                assert chain.height == 1
+                # a header without the work due at its height isn't pre-relayed
+                order.clear()
+                bad = build_block(chain, [], node.public_key, ts + 1)
+                bad.header.difficulty += 1
+                await node.handle_new_block(bad.to_dict())
+                assert order == ["validate"]
+                # nor is one whose due difficulty is trivial to meet
+                monkeypatch.setattr(node_mod, "PRE_RELAY_MIN_DIFFICULTY", 2)
+                order.clear()
+                await node.handle_new_block(build_block(chain, [], node.public_key, ts + 1))
+                assert order == ["validate", "announce"]  # relayed once accepted
+                assert chain.height == 2
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
+    def test_rejected_pre_relayed_block_penalizes_source(self, monkeypatch):
+        import jiji.node as node_mod
+        from jiji.core.config import SCORE_INVALID_BLOCK
+        from tests.test_chain import build_block
+        monkeypatch.setattr(node_mod, "PRE_RELAY_MIN_DIFFICULTY", 1)
+
+        class FakePeer:
+            host = "10.0.0.9"
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        async def _test():
+            node = await create_node()
+            try:
+                chain = node.chain
+                block = build_block(chain, [], node.public_key, chain.tip.header.timestamp + 1)
+                block.header.tx_merkle_root = bytes(32)
+                announced = []
+                announce_block = node.p2p.announce_block
+                node.p2p.announce_block = lambda *a, **kw: (
+                    announced.append(a[0]), announce_block(*a, **kw))[1]
+                source = FakePeer()
+                await node.handle_new_block(block.to_dict(), source_peer=source)
+                assert announced == [block.block_hash()]
+                assert chain.height == 0
+                assert node.p2p.scorer._records[source.host]["score"] == SCORE_INVALID_BLOCK
+                assert not source.closed
+                # a second one crosses the ban threshold and drops the peer
+                await node.handle_new_block(block.to_dict(), source_peer=source)
+                assert node.p2p.scorer.is_banned(source.host)
+                assert source.closed
+            finally:
+                await node.stop()
+        asyncio.run(_test())
+
+    def test_known_addresses_capped_and_connects_bounded(self, monkeypatch):
+        import jiji.net.server as server_mod
+        from jiji.net.protocol import make_peers_response
+        from jiji.net.server import P2PServer
+        monkeypatch.setattr(server_mod, "MAX_KNOWN_ADDRESSES", 5)
+        monkeypatch.setattr(server_mod, "PEER_CONNECT_CONCURRENCY", 2)
+        p2p = P2PServer(None)
+        addrs = [("10.0.0.1", 9000 + i) for i in range(8)]
+        asyncio.run(p2p._on_peers_response(None, make_peers_response(addrs)))
+        assert list(p2p.known_addresses) == addrs[3:]
+
+        active = peak = 0
+
+        async def fake_connect(host, port):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return False
+
+        p2p.connect_to_peer = fake_connect
+        asyncio.run(p2p.connect_to_many(addrs))
+        assert peak == 2
+
+        # once the outbound cap is reached, the rest of the list isn't dialled
+        monkeypatch.setattr(server_mod, "MAX_OUTBOUND", 1)
+        monkeypatch.setattr(server_mod, "PEER_CONNECT_CONCURRENCY", 1)
+        dialled = []
+
+        async def connecting(host, port):
+            dialled.append(port)
+            p2p.peers[(host, port)] = type("Outbound", (), {"inbound": False})()
+            return True
+
+        p2p.connect_to_peer = connecting
+        asyncio.run(p2p.connect_to_many(addrs))
+        assert dialled == [addrs[0][1]]
+
+    def test_in_flight_dials_count_toward_max_outbound(self, monkeypatch):
+        import random
+        import jiji.net.server as server_mod
+        from jiji.net.server import P2PServer
+        monkeypatch.setattr(server_mod, "MAX_OUTBOUND", 5)
+        monkeypatch.setattr(server_mod, "PEER_CONNECT_CONCURRENCY", 8)
+        p2p = P2PServer(None)
+        rng = random.Random(7)
+
+        class FakeWriter:
+            def get_extra_info(self, name):
+                return None
+
+        async def fake_open_connection(host, port):
+            await asyncio.sleep(rng.random() / 100)
+            return None, FakeWriter()
+
+        async def fake_handshake(peer):
+            # the dial yields between the cap check and joining p2p.peers
+            await asyncio.sleep(rng.random() / 100)
+            peer.handshake_done = True
+
+        async def idle_loop(peer):
+            pass
+
+        monkeypatch.setattr(server_mod.asyncio, "open_connection", fake_open_connection)
+        p2p._perform_handshake = fake_handshake
+        p2p._peer_loop = idle_loop
+        asyncio.run(p2p.connect_to_many([("10.0.0.1", 9000 + i) for i in range(100)]))
+        assert p2p._outbound_count == 5
+        assert p2p._dialing == 0
+
+    def test_peer_exchange_dials_in_background(self, monkeypatch):
+        import jiji.net.server as server_mod
+        from jiji.net.server import P2PServer
+        real_sleep = asyncio.sleep
+        monkeypatch.setattr(server_mod.asyncio, "sleep", lambda delay: real_sleep(0))
+        p2p = P2PServer(None)
+        p2p.known_addresses[("10.0.0.1", 9000)] = 0.0
+        rounds, saves = [], []
+
+        async def slow_connect_many(addrs):
+            rounds.append(list(addrs))
+            await release.wait()
+
+        p2p.connect_to_many = slow_connect_many
+        p2p.save_peers = lambda: saves.append(1)
+
+        async def _test():
+            nonlocal release
+            release = asyncio.Event()
+            loop_task = asyncio.create_task(p2p.peer_exchange_loop())
+            try:
+                while len(saves) < 3:
+                    await real_sleep(0)
+                # exchanges keep going while the first round of dials hangs,
+                # and no second round is stacked on top of it
+                assert len(rounds) == 1
+                release.set()
+                while len(rounds) < 2:
+                    await real_sleep(0)
+            finally:
+                loop_task.cancel()
+                await p2p.stop()
+
+        release = None
+        asyncio.run(_test())
+        assert rounds[0] == [("10.0.0.1", 9000)]
+
+    def test_peer_tx_burst_verified_as_one_batch(self, monkeypatch):
+        import jiji.net.server as server_mod
+        from jiji.net.protocol import make_tx_response
+
+        batches = []
+        batch_verify = server_mod.batch_verify_signatures
+
+        def recording_batch_verify(txs):
+            batches.append(len(txs))
+            return batch_verify(txs)
+
+        monkeypatch.setattr(server_mod, "batch_verify_signatures", recording_batch_verify)
+
+        class _Peer:
+            address = ("127.0.0.1", 1)
+
+        async def _test():
+            node = await create_node()
+            try:
+                posts = []
+                for i in range(5):
+                    post = Post(author=node.public_key, nonce=i, timestamp=1000010,
+                                body=f"burst {i}", reply_to=None, gas_fee=1)
+                    post.sign_tx(node.private_key)
+                    posts.append(post)
+                for post in posts:
+                    await node.p2p._on_tx_response(_Peer(), make_tx_response(post.to_dict()))
+                await node.p2p._tx_inbox_task
+                assert batches == [5]
+                assert all(p.tx_hash() in node.mempool for p in posts)
             finally:
                 await node.stop()
         asyncio.run(_test())
 
+    def test_served_block_wire_cache_is_bounded(self, monkeypatch):
+        import jiji.net.server as server_mod
+        from jiji.core.chain import Blockchain
+        from jiji.net.server import P2PServer
+        from tests.test_chain import build_block
+        _, pub = make_keys()
+        chain = Blockchain()
+        chain.initialize_genesis(pub, timestamp=1000000)
+        chain.add_block(build_block(chain, [], pub, 1000010), current_time=1000015)
+        p2p = P2PServer(None)
+        genesis, tip = chain.get_block_by_height(0), chain.tip
+        body = p2p._wire_block(genesis)
+        assert json.loads(body) == genesis.to_dict()
+        assert p2p._wire_block(genesis) is body
+        monkeypatch.setattr(server_mod, "BLOCK_WIRE_CACHE_BYTES", len(body))
+        p2p._wire_block(tip)
+        assert list(p2p._block_wire) == [tip.block_hash()]
+        assert p2p._block_wire_size == len(p2p._block_wire[tip.block_hash()])
+
+    def test_send_many_coalesces_writes(self):
+        from jiji.net.peer import PeerConnection
+        from jiji.net.protocol import decode_message, encode_message, make_tx_announce
+
+        class _RecordingTransport(asyncio.Transport):
+            def __init__(self):
+                super().__init__()
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(bytes(data))
+
+            def is_closing(self):
+                return False
+
+            def close(self):
+                pass
+
+        async def _t():
+            reader = asyncio.StreamReader()
+            transport = _RecordingTransport()
+            protocol = asyncio.StreamReaderProtocol(reader)
+            writer = asyncio.StreamWriter(transport, protocol, reader, asyncio.get_running_loop())
+            peer = PeerConnection(reader, writer, "127.0.0.1", 9999)
+            msgs = [make_tx_announce(bytes([i]) * 32) for i in range(3)]
+            await peer.send_many(msgs)
+            assert transport.writes == [b"".join(encode_message(m) for m in msgs)]
+            frame = transport.writes[0]
+            assert decode_message(frame[4:4 + int.from_bytes(frame[:4], "big")]) == msgs[0]
+            await peer.send_many([])
+            assert len(transport.writes) == 1
+        asyncio.run(_t())
+
+    def test_broadcast_survives_failing_peer(self):
+        from jiji.net.protocol import make_peers_request
+        from jiji.net.server import P2PServer
+
+        class _Peer:
+            address = ("127.0.0.1", 1)
+
+            def __init__(self, fail):
+                self.fail, self.drained = fail, False
+
+            def write(self, msg):
+                return True
+
+            async def drain(self):
+                if self.fail:
+                    raise RuntimeError("boom")
+                self.drained = True
+
+        peers = [_Peer(False), _Peer(True), _Peer(False)]
+        asyncio.run(P2PServer._send_all(peers, make_peers_request()))
+        assert peers[0].drained and peers[2].drained
+
 
 class TestTwoNodes:
     def test_peer_connection(self):
@@ -131,6 +539,107 @@ class TestTwoNodes:
                 # give inbound connection time to register
                 await asyncio.sleep(0.1)
                 assert len(node_a.p2p.peers) == 1
+                peers = list(node_a.p2p.peers.values()) + list(node_b.p2p.peers.values())
+                assert all(p.compact_frames for p in peers)
+                assert node_a.p2p._peer_snapshot == tuple(node_a.p2p.peers.values())
+                # a disconnect drops the peer from the broadcast snapshot too
+                await node_b.p2p._peer_snapshot[0].close()
+                for _ in range(20):
+                    if not node_a.p2p._peer_snapshot:
+                        break
+                    await asyncio.sleep(0.05)
+                assert node_a.p2p._peer_snapshot == ()
+            finally:
+                await node_b.stop()
+                await node_a.stop()
+        asyncio.run(_test())
+
+    def test_peer_sockets_disable_nagle(self):
+        import socket
+
+        async def _test():
+            node_a = await create_node()
+            genesis = node_a.chain.get_block_by_height(0)
+            node_b = await create_node(genesis_block=genesis)
+            try:
+                await node_b.p2p.connect_to_peer("127.0.0.1", get_p2p_port(node_a))
+                await asyncio.sleep(0.1)
+                peers = list(node_a.p2p.peers.values()) + list(node_b.p2p.peers.values())
+                assert len(peers) == 2
+                for peer in peers:
+                    sock = peer.writer.get_extra_info("socket")
+                    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            finally:
+                await node_b.stop()
+                await node_a.stop()
+        asyncio.run(_test())
+
+    def test_sync_batch_verifies_signatures(self):
+        import time
+        from tests.test_chain import build_block
+
+        async def _test():
+            node_a = await create_node()
+            chain = node_a.chain
+            ts = chain.tip.header.timestamp
+            for i in range(3):
+                post = Post(author=node_a.public_key, nonce=i, timestamp=ts,
+                            body=f"sync {i}", reply_to=None, gas_fee=1)
+                post.sign_tx(node_a.private_key)
+                ts = max(ts + 1, int(time.time()))
+                block = build_block(chain, [post], node_a.public_key, ts)
+                chain.add_block(block, current_time=ts + 1)
+            genesis = chain.get_block_by_height(0)
+            node_b = await create_node(genesis_block=genesis)
+            try:
+                await node_b.p2p.connect_to_peer("127.0.0.1", get_p2p_port(node_a))
+                assert await node_b.wait_until(
+                    lambda: node_b.chain.height == chain.height, timeout=3,
+                )
+                for h in range(1, chain.height + 1):
+                    for tx in node_b.chain.get_block_by_height(h).transactions[1:]:
+                        assert tx.signature_verified()
+            finally:
+                await node_b.stop()
+                await node_a.stop()
+        asyncio.run(_test())
+
+    def test_sync_pipelines_batches(self, monkeypatch):
+        import time
+        import jiji.net.server as server_mod
+        from jiji.net.peer import PeerConnection
+        from jiji.net.protocol import MessageType
+        from tests.test_chain import build_block
+
+        monkeypatch.setattr(server_mod, "SYNC_BATCH_SIZE", 1)
+        bursts = []
+        send_many = PeerConnection.send_many
+
+        async def recording_send_many(self, msgs):
+            bursts.append([m.payload["start_height"] for m in msgs
+                           if m.msg_type == MessageType.SYNC_REQUEST])
+            await send_many(self, msgs)
+
+        monkeypatch.setattr(PeerConnection, "send_many", recording_send_many)
+
+        async def _test():
+            node_a = await create_node()
+            chain = node_a.chain
+            ts = chain.tip.header.timestamp
+            for _ in range(7):
+                ts = max(ts + 1, int(time.time()))
+                chain.add_block(build_block(chain, [], node_a.public_key, ts),
+                                current_time=ts + 1)
+            genesis = chain.get_block_by_height(0)
+            node_b = await create_node(genesis_block=genesis)
+            try:
+                await node_b.p2p.connect_to_peer("127.0.0.1", get_p2p_port(node_a))
+                assert await node_b.wait_until(
+                    lambda: node_b.chain.height == chain.height, timeout=5,
+                )
+                assert bursts[0] == [1, 2, 3, 4]  # four batches in flight at once
+                requested = sorted(h for b in bursts for h in b)
+                assert requested == list(range(1, chain.height + 1))
             finally:
                 await node_b.stop()
                 await node_a.stop()
@@ -153,11 +662,28 @@ class TestTwoNodes:
                 post.sign_tx(node_a.private_key)
                 await node_a.handle_new_transaction(post.to_dict())
                 # wait for gossip propagation
-                for _ in range(30):
-                    if post.tx_hash() in node_b.mempool:
-                        break
-                    await asyncio.sleep(0.1)
-                assert post.tx_hash() in node_b.mempool
+                assert await node_b.wait_until(lambda: post.tx_hash() in node_b.mempool, timeout=3)
+            finally:
+                await node_b.stop()
+                await node_a.stop()
+        asyncio.run(_test())
+
+    def test_mempool_digest_pulls_missing_tx(self):
+        async def _test():
+            node_a = await create_node()
+            genesis = node_a.chain.get_block_by_height(0)
+            node_b = await create_node(genesis_block=genesis)
+            try:
+                await node_b.p2p.connect_to_peer("127.0.0.1", get_p2p_port(node_a))
+                await asyncio.sleep(0.2)
+                assert all(p.mempool_bloom for p in node_a.p2p.peers.values())
+                # added without an announce: only node_b's digest can reveal
+                # to node_a that node_b lacks it
+                post = Post(author=node_a.public_key, nonce=0, timestamp=1000010,
+                            body="digest", reply_to=None, gas_fee=1)
+                post.sign_tx(node_a.private_key)
+                node_a.mempool.add(post)
+                assert await node_b.wait_until(lambda: post.tx_hash() in node_b.mempool, timeout=4)
             finally:
                 await node_b.stop()
                 await node_a.stop()
@@ -178,17 +704,17 @@ class TestTwoNodes:
 
                 await node_b.p2p.connect_to_peer("127.0.0.1", p2p_port_a)
                 # wait for node_a to mine and node_b to receive
-                for _ in range(100):
-                    if node_b.chain.height > 0:
-                        break
-                    await asyncio.sleep(0.1)
-                assert node_b.chain.height > 0
+                assert await node_b.wait_until(lambda: node_b.chain.height > 0, timeout=10)
             finally:
                 await node_b.stop()
                 await node_a.stop()
         asyncio.run(_test())
 
-    def test_sync_on_connect(self):
+    def test_sync_on_connect(self, monkeypatch):
+        import jiji.node as node_mod
+        # don't sit out the idle miner's pause after its first, empty block
+        monkeypatch.setattr(node_mod, "EMPTY_BLOCK_DELAY", 0.1)
+
         async def _test():
             node_a = await create_node(mine=True)
             # submit txs one at a time, waiting for each block
@@ -198,10 +724,7 @@ class TestTwoNodes:
                 post.sign_tx(node_a.private_key)
                 await node_a.handle_new_transaction(post.to_dict())
                 target = node_a.chain.height + 1
-                for _ in range(50):
-                    if node_a.chain.height >= target:
-                        break
-                    await asyncio.sleep(0.1)
+                await node_a.wait_until(lambda: node_a.chain.height >= target, timeout=5)
             assert node_a.chain.height >= 3
 
             p2p_port_a = get_p2p_port(node_a)
@@ -210,11 +733,7 @@ class TestTwoNodes:
             try:
                 await node_b.p2p.connect_to_peer("127.0.0.1", p2p_port_a)
                 # wait for sync
-                for _ in range(100):
-                    if node_b.chain.height >= 3:
-                        break
-                    await asyncio.sleep(0.1)
-                assert node_b.chain.height >= 3
+                assert await node_b.wait_until(lambda: node_b.chain.height >= 3, timeout=10)
             finally:
                 await node_b.stop()
                 await node_a.stop()
@@ -3,6 +3,7 @@ import pytest
 from jiji.net.protocol import (
     MessageType,
     Message,
+    encode_frame,
     encode_message,
     decode_length_prefix,
     decode_message,
@@ -17,6 +18,10 @@ from jiji.net.protocol import (
     make_block_response,
     make_sync_request,
     make_sync_response,
+    make_mempool_bloom,
+    make_mempool_response,
+    sync_response_parts,
+    block_response_parts,
 )
 
 
@@ -25,8 +30,8 @@ class TestMessageType:
         values = [m.value for m in MessageType]
         assert len(values) == len(set(values))
 
-    def test_has_thirteen_types(self):
-        assert len(MessageType) == 13
+    def test_has_fourteen_types(self):
+        assert len(MessageType) == 14
 
     def test_roundtrip_all_types(self):
         for mt in MessageType:
@@ -98,6 +103,31 @@ class TestMessageEncodeDecode:
         assert decoded.msg_type == MessageType.PEERS_REQUEST
         assert decoded.payload == {}
 
+    def test_stream_of_every_factory_decodes_in_order(self):
+        msgs = [
+            make_handshake(1, 42, "abc123"),
+            make_peers_request(),
+            make_peers_response([("127.0.0.1", 9333)]),
+            make_tx_announce("ff" * 32),
+            make_tx_request("cd" * 32),
+            make_tx_response({"tx_type": "post", "body": "hi"}),
+            make_block_announce("aa" * 32, 10),
+            make_block_request(height=7),
+            make_block_response({"header": {"height": 0}}),
+            make_sync_request(5, 15),
+            make_sync_response([{"header": {"height": i}} for i in range(3)]),
+            make_mempool_bloom(b"\x0f" * 40, 7, b"s" * 16),
+            make_mempool_response(["01" * 32]),
+        ]
+        for compact in (False, True):
+            stream = memoryview(b"".join(encode_message(m, compact=compact) for m in msgs))
+            decoded = []
+            while stream:
+                length = decode_length_prefix(stream[:4])
+                decoded.append(decode_message(stream[4:4 + length]))
+                stream = stream[4 + length:]
+            assert decoded == msgs
+
     def test_message_to_dict_from_dict(self):
         msg = Message(MessageType.TX_REQUEST, {"tx_hash": "ab" * 32})
         d = msg.to_dict()
@@ -106,6 +136,118 @@ class TestMessageEncodeDecode:
         assert restored.payload == msg.payload
 
 
+class TestCompactFrames:
+    def test_hash_messages_roundtrip_compact(self):
+        for msg in [
+            make_tx_announce("ab" * 32),
+            make_tx_request("cd" * 32),
+            make_block_announce("ef" * 32, 123456),
+            make_mempool_response(["01" * 32, "02" * 32]),
+            make_mempool_response([]),
+        ]:
+            encoded = encode_message(msg, compact=True)
+            assert encoded[4:5] != b"{"
+            decoded = decode_message(encoded[4:])
+            assert decoded.msg_type == msg.msg_type
+            assert decoded.payload == msg.payload
+
+    def test_compact_is_smaller(self):
+        msg = make_tx_announce("ab" * 32)
+        assert len(encode_message(msg, compact=True)) == 4 + 33
+        assert len(encode_message(msg)) > 4 + 33
+
+    def test_unrepresentable_payloads_stay_json(self):
+        for msg in [
+            make_tx_announce("AB" * 32),  # uppercase hex wouldn't round-trip
+            make_tx_announce("abcd"),
+            make_block_announce("ef" * 32, -1),
+            make_handshake(1, 0, "00" * 32),
+        ]:
+            encoded = encode_message(msg, compact=True)
+            assert encoded[4:5] == b"{"
+            assert decode_message(encoded[4:]).payload == msg.payload
+
+    def test_handshake_advertises_compact_frames(self):
+        assert make_handshake(1, 0, "").payload["compact_frames"] is True
+
+    def test_decode_accepts_buffer_views(self):
+        for msg, compact in [
+            (make_mempool_response(["01" * 32, "02" * 32]), True),
+            (make_handshake(1, 3, "ab"), False),
+        ]:
+            body = bytearray(encode_message(msg, compact=compact)[4:])
+            for data in (body, memoryview(body)):
+                assert decode_message(data).payload == msg.payload
+
+    def test_factories_accept_raw_hashes(self):
+        raw = bytes(range(32))
+        assert make_tx_announce(raw) == make_tx_announce(raw.hex())
+        assert make_block_announce(raw, 4) == make_block_announce(raw.hex(), 4)
+        assert make_mempool_response([raw]).payload["tx_hashes"] == [raw.hex()]
+
+    def test_raw_hash_frames_match_encoder(self):
+        raw = bytes(range(32))
+        for msg in (make_tx_announce(raw), make_tx_request(raw),
+                    make_block_announce(raw, 9)):
+            prefilled = encode_message(msg, compact=True)
+            msg._frames.clear()
+            assert encode_message(msg, compact=True) == prefilled
+            assert decode_message(prefilled[4:]) == msg
+
+    def test_frames_encoded_once_per_format(self):
+        msg = make_tx_announce("ab" * 32)
+        parts = encode_frame(msg, compact=True)
+        assert encode_frame(msg, compact=True) is parts
+        compact = encode_message(msg, compact=True)
+        assert compact == b"".join(parts)
+        full = encode_message(msg)
+        assert full != compact
+        assert decode_message(full[4:]) == decode_message(compact[4:]) == msg
+
+    def test_frame_keeps_body_unjoined(self):
+        msg = make_sync_response([{"header": {"height": i}} for i in range(50)])
+        prefix, body = encode_frame(msg)
+        assert decode_length_prefix(prefix) == len(body)
+        assert decode_message(body) == msg
+
+    def test_sync_response_parts_match_message(self, monkeypatch):
+        import jiji.net.protocol as protocol_mod
+        from jiji.core.serialization import dumps
+        blocks = [{"header": {"height": i}, "transactions": []} for i in range(4)]
+        for n in range(len(blocks) + 1):
+            frame = b"".join(sync_response_parts(dumps(b) for b in blocks[:n]))
+            assert decode_length_prefix(frame[:4]) == len(frame) - 4
+            assert decode_message(frame[4:]) == make_sync_response(blocks[:n])
+        # a batch too large for one frame is cut to the blocks that fit
+        full = b"".join(sync_response_parts(dumps(b) for b in blocks))
+        monkeypatch.setattr(protocol_mod, "MAX_MESSAGE_SIZE", len(full) - 5)
+        short = b"".join(sync_response_parts(dumps(b) for b in blocks))
+        assert decode_message(short[4:]) == make_sync_response(blocks[:3])
+
+    def test_block_response_parts_match_message(self):
+        from jiji.core.serialization import dumps
+        block = {"header": {"height": 2}, "transactions": [{"tx_type": "post"}]}
+        frame = b"".join(block_response_parts(dumps(block)))
+        assert decode_length_prefix(frame[:4]) == len(frame) - 4
+        assert decode_message(frame[4:]) == make_block_response(block)
+
+    def test_mempool_bloom_roundtrip(self):
+        msg = make_mempool_bloom(b"\x0f" * 40, 7, b"s" * 16)
+        compact = encode_message(msg, compact=True)
+        assert len(compact) == 4 + 18 + 40
+        for frame in (compact, encode_message(msg)):
+            assert decode_message(frame[4:]) == msg
+        # a hash count that doesn't fit the byte field stays JSON
+        odd = make_mempool_bloom(b"\x01", 300, b"s" * 16)
+        assert encode_message(odd, compact=True)[4:5] == b"{"
+
+    def test_malformed_compact_frame_raises(self):
+        with pytest.raises(ValueError):
+            decode_message(bytes([MessageType.TX_ANNOUNCE]) + b"short")
+        with pytest.raises(ValueError):
+            decode_message(bytes([200]) + b"\x00" * 32)
+
+
 class TestFactoryFunctions:
     def test_make_handshake(self):
         msg = make_handshake(1, 5, "deadbeef")
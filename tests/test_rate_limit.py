@@ -8,6 +8,7 @@ from jiji.core.config import PEER_MSG_BURST, RPC_REQ_PER_MIN
 from jiji.core.crypto import generate_keypair
 from jiji.net.peer import PeerConnection
 from jiji.node import Node
+from tests.test_rpc import read_http_response
 
 
 async def _make_node(**kwargs):
@@ -36,12 +37,11 @@ async def _send_rpc(port: int, method: str = "get_node_info") -> tuple[int, dict
         f"POST / HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
     )
     await writer.drain()
-    raw = await asyncio.wait_for(reader.read(65536), timeout=5)
+    head, body_bytes = await read_http_response(reader)
     writer.close()
     await writer.wait_closed()
-    status_line = raw.split(b"\r\n", 1)[0].decode()
+    status_line = head.split(b"\r\n", 1)[0].decode()
     status = int(status_line.split(" ")[1])
-    _, _, body_bytes = raw.partition(b"\r\n\r\n")
     try:
         parsed = json.loads(body_bytes) if body_bytes else {}
     except json.JSONDecodeError:
@@ -20,7 +20,7 @@ def build_block_on_chain(chain: Blockchain, txs: list, miner_pub: bytes, timesta
     cb = Coinbase(recipient=miner_pub, amount=block_reward(height), height=height)
     all_txs = [cb] + txs
 
-    working = chain.state.copy()
+    working = chain.state.overlay()
     working_posts = set(chain.known_posts)
     working_authors = dict(chain.post_authors)
 
@@ -215,6 +215,47 @@ class TestReorgWithPersistence:
 
         store.close()
 
+    def test_load_from_store_with_stale_index(self, tmp_path):
+        index_path = str(tmp_path / "chain.idx")
+        store = BlockStore(":memory:")
+        chain = Blockchain(store=store, index_path=index_path)
+        _, pub = generate_keypair()
+
+        chain.initialize_genesis(pub, timestamp=1000000)
+        block1 = build_block_on_chain(chain, [], pub, 1000001)
+        chain.add_block(block1, current_time=1000001)
+        chain.save_index()
+        assert Blockchain.load_index(index_path) == chain.main_chain
+
+        # Index now lags the store by one block
+        block2 = build_block_on_chain(chain, [], pub, 1000002)
+        chain.add_block(block2, current_time=1000002)
+
+        chain2 = Blockchain(store=store, index_path=index_path)
+        chain2.load_from_store()
+        assert chain2.main_chain == chain.main_chain
+        assert chain2.state.state_root() == chain.state.state_root()
+
+        store.close()
+
+    def test_load_from_store_ignores_corrupt_index(self, tmp_path):
+        index_path = tmp_path / "chain.idx"
+        store = BlockStore(":memory:")
+        chain = Blockchain(store=store, index_path=str(index_path))
+        _, pub = generate_keypair()
+
+        chain.initialize_genesis(pub, timestamp=1000000)
+        block1 = build_block_on_chain(chain, [], pub, 1000001)
+        chain.add_block(block1, current_time=1000001)
+        # Right tip, wrong ancestor: the loader must notice the broken link
+        index_path.write_bytes(b"\x11" * 32 + chain.main_chain[1])
+
+        chain2 = Blockchain(store=store, index_path=str(index_path))
+        chain2.load_from_store()
+        assert chain2.main_chain == chain.main_chain
+
+        store.close()
+
 
 class TestValidateBlockStructure:
     """Test lightweight fork block validation."""
@@ -1,10 +1,11 @@
 import asyncio
 import json
-import pytest
+import threading
 from jiji.core.crypto import generate_keypair
 from jiji.core.chain import Blockchain
 from jiji.core.config import block_reward
 from jiji.core.merkle import verify_merkle_proof
+from jiji.core.serialization import dumps, loads
 from jiji.core.transaction import Post, Transfer, transaction_from_dict
 from jiji.core.validation import ValidationError
 from jiji.mining.mempool import Mempool
@@ -54,6 +55,11 @@ def make_rpc():
     return rpc, node
 
 
+def decode_proof(proof_dicts: list[dict]) -> list[tuple[bytes, bool]]:
+    """Turn an RPC merkle proof back into verify_merkle_proof's form."""
+    return [(bytes.fromhex(p["hash"]), p["is_left"]) for p in proof_dicts]
+
+
 def dispatch(rpc, method, params=None):
     """Helper to call RPC dispatch synchronously."""
     request = {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": 1}
@@ -164,10 +170,27 @@ class TestRPCDirect:
         proof_data = result["result"]
         assert proof_data["tx_hash"] == post.tx_hash().hex()
         # verify the proof is valid
-        proof = [(bytes.fromhex(p["hash"]), p["is_left"]) for p in proof_data["proof"]]
+        proof = decode_proof(proof_data["proof"])
         root = bytes.fromhex(proof_data["root"])
         assert verify_merkle_proof(post.tx_hash(), proof, root)
 
+    def test_merkle_proofs_share_block_tree(self):
+        rpc, node = make_rpc()
+        posts = []
+        for nonce in range(3):
+            post = Post(author=node.pub, nonce=nonce, timestamp=1000015, body=f"p{nonce}",
+                        reply_to=None, gas_fee=1)
+            post.sign_tx(node.priv)
+            posts.append(post)
+        block = build_block(node.chain, posts, node.pub, 1000015)
+        node.chain.add_block(block, current_time=1000020)
+        for i, post in enumerate(posts, start=1):
+            data = dispatch(rpc, "get_merkle_proof", {"tx_hash": post.tx_hash().hex()})["result"]
+            assert data["index"] == i
+            proof = decode_proof(data["proof"])
+            assert verify_merkle_proof(post.tx_hash(), proof, block.header.tx_merkle_root)
+        assert list(rpc._proof_trees) == [block.block_hash()]
+
     def test_get_node_info(self):
         rpc, node = make_rpc()
         result = dispatch(rpc, "get_node_info")
@@ -181,11 +204,120 @@ class TestRPCDirect:
         assert result["error"]["code"] == -32601
 
 
+async def read_http_response(reader: asyncio.StreamReader) -> tuple[bytes, bytes]:
+    """Read one response framed by its Content-Length; return (head, body).
+
+    Stops at the end of the body rather than waiting for EOF, so it works
+    on keep-alive connections. A head without Content-Length has no body.
+    """
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+    length = 0
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return head, await asyncio.wait_for(reader.readexactly(length), timeout=5)
+
+
+class HTTPSession:
+    """One keep-alive HTTP/1.1 connection reused for a test's RPC calls.
+
+    Responses are framed by Content-Length, so several requests can share
+    the socket instead of each opening (and tearing down) its own.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self._host = host
+        self._port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def __aenter__(self) -> "HTTPSession":
+        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    _POST_HEAD = (
+        b"POST / HTTP/1.1\r\nContent-Type: application/json\r\n"
+        b"Connection: keep-alive\r\nContent-Length: %d\r\n\r\n"
+    )
+
+    @classmethod
+    def _request(cls, body: bytes) -> bytes:
+        return cls._POST_HEAD % len(body) + body
+
+    @staticmethod
+    def _rpc_body(method: str, params: dict | None, req_id: int) -> bytes:
+        return dumps({
+            "jsonrpc": "2.0", "method": method, "params": params or {}, "id": req_id,
+        })
+
+    async def post(self, body: bytes) -> tuple[bytes, bytes]:
+        """POST raw `body`; return (response head, response body)."""
+        self._writer.write(self._request(body))
+        await self._writer.drain()
+        return await read_http_response(self._reader)
+
+    async def call(self, method: str, params: dict | None = None, req_id: int = 1) -> dict:
+        """Send a JSON-RPC request and return the parsed response."""
+        _, body = await self.post(self._rpc_body(method, params, req_id))
+        return loads(body)
+
+    async def pipeline(self, calls: list[tuple[str, dict | None]]) -> list[dict]:
+        """Send every (method, params) call in one write, then read the replies.
+
+        The server answers pipelined HTTP/1.1 requests in order, so reply i
+        belongs to call i (ids are 1..n).
+        """
+        self._writer.write(b"".join(
+            self._request(self._rpc_body(method, params, i))
+            for i, (method, params) in enumerate(calls, 1)
+        ))
+        await self._writer.drain()
+        return [loads((await read_http_response(self._reader))[1]) for _ in calls]
+
+
 class TestRPCHTTP:
     def _run(self, coro):
         return asyncio.run(coro)
 
     def test_valid_request_over_http(self):
+        async def _test():
+            rpc, node = make_rpc()
+            await rpc.start()
+            port = rpc._server.sockets[0].getsockname()[1]
+            try:
+                async with HTTPSession(port) as session:
+                    data = await session.call("get_latest_block")
+                assert data["id"] == 1
+                assert data["result"]["header"]["height"] == 0
+            finally:
+                await rpc.stop()
+        self._run(_test())
+
+    def test_malformed_json_over_http(self):
+        async def _test():
+            rpc, node = make_rpc()
+            await rpc.start()
+            port = rpc._server.sockets[0].getsockname()[1]
+            try:
+                async with HTTPSession(port) as session:
+                    _, resp_body = await session.post(b"not json at all")
+                    data = loads(resp_body)
+                    assert data["error"]["code"] == -32700
+                    # a parse error doesn't cost the client its connection
+                    assert (await session.call("get_node_info", req_id=2))["id"] == 2
+            finally:
+                await rpc.stop()
+        self._run(_test())
+
+    def test_request_split_across_writes(self):
         async def _test():
             rpc, node = make_rpc()
             await rpc.start()
@@ -193,49 +325,104 @@ class TestRPCHTTP:
             try:
                 reader, writer = await asyncio.open_connection("127.0.0.1", port)
                 body = json.dumps({
-                    "jsonrpc": "2.0", "method": "get_latest_block", "params": {}, "id": 1,
+                    "jsonrpc": "2.0", "method": "get_latest_block", "params": {}, "id": 7,
                 }).encode()
-                request = (
-                    f"POST / HTTP/1.1\r\n"
-                    f"Content-Type: application/json\r\n"
-                    f"Content-Length: {len(body)}\r\n"
-                    f"\r\n"
-                ).encode() + body
-                writer.write(request)
-                await writer.drain()
-                response = await asyncio.wait_for(reader.read(8192), timeout=5)
+                head = f"POST / HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                # headers end mid-write and the body trickles in afterwards
+                for part in (head[:10], head[10:] + body[:5], body[5:20], body[20:]):
+                    writer.write(part)
+                    await writer.drain()
+                    await asyncio.sleep(0.01)
+                _, resp_body = await read_http_response(reader)
                 writer.close()
                 await writer.wait_closed()
-                # parse HTTP response body
-                _, _, resp_body = response.partition(b"\r\n\r\n")
+                assert json.loads(resp_body)["id"] == 7
+            finally:
+                await rpc.stop()
+        self._run(_test())
+
+    @staticmethod
+    def _record_threads(monkeypatch, rpc_mod, name):
+        """Wrap rpc_mod.<name> to record the thread each call runs on."""
+        threads = []
+        real = getattr(rpc_mod, name)
+
+        def recording(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(rpc_mod, name, recording)
+        return threads
+
+    def test_bulky_response_encoded_off_loop(self, monkeypatch):
+        import jiji.rpc.server as rpc_mod
+        monkeypatch.setattr(rpc_mod, "RPC_OFFLOAD_MIN_TXS", 1)
+        threads = self._record_threads(monkeypatch, rpc_mod, "dumps")
+
+        async def _test():
+            rpc, node = make_rpc()
+            await rpc.start()
+            port = rpc._server.sockets[0].getsockname()[1]
+            try:
+                body = json.dumps({
+                    "jsonrpc": "2.0", "method": "get_latest_block", "params": {}, "id": 3,
+                }).encode()
+                head, resp_body = (await _send_request(port, body)).split(b"\r\n\r\n", 1)
                 data = json.loads(resp_body)
-                assert data["id"] == 1
+                assert rpc_mod._is_bulky(data)
                 assert data["result"]["header"]["height"] == 0
+                assert threads and threading.get_ident() not in threads
             finally:
                 await rpc.stop()
         self._run(_test())
 
-    def test_malformed_json_over_http(self):
+    def test_large_request_decoded_off_loop(self, monkeypatch):
+        import jiji.rpc.server as rpc_mod
+        threads = self._record_threads(monkeypatch, rpc_mod, "loads")
+
+        async def _test():
+            rpc, node = make_rpc()
+            await rpc.start()
+            port = rpc._server.sockets[0].getsockname()[1]
+            try:
+                body = json.dumps({
+                    "jsonrpc": "2.0", "method": "get_latest_block", "params": {}, "id": 4,
+                }).encode()
+                await _send_request(port, body)
+                assert threads == [threading.get_ident()]  # small: parsed inline
+                monkeypatch.setattr(rpc_mod, "RPC_OFFLOAD_MIN_BYTES", 1)
+                threads.clear()
+                resp = await _send_request(port, body)
+                assert json.loads(resp.split(b"\r\n\r\n", 1)[1])["id"] == 4
+                assert len(threads) == 1 and threads[0] != threading.get_ident()
+            finally:
+                await rpc.stop()
+        self._run(_test())
+
+    def test_keep_alive_serves_several_requests(self):
         async def _test():
             rpc, node = make_rpc()
             await rpc.start()
             port = rpc._server.sockets[0].getsockname()[1]
             try:
                 reader, writer = await asyncio.open_connection("127.0.0.1", port)
-                body = b"not json at all"
-                request = (
-                    f"POST / HTTP/1.1\r\n"
-                    f"Content-Length: {len(body)}\r\n"
-                    f"\r\n"
-                ).encode() + body
-                writer.write(request)
-                await writer.drain()
-                response = await asyncio.wait_for(reader.read(8192), timeout=5)
+                for req_id, connection in ((1, ""), (2, "Connection: close\r\n")):
+                    body = json.dumps({
+                        "jsonrpc": "2.0", "method": "get_node_info", "params": {}, "id": req_id,
+                    }).encode()
+                    writer.write((
+                        f"POST / HTTP/1.1\r\nContent-Length: {len(body)}\r\n{connection}\r\n"
+                    ).encode() + body)
+                    await writer.drain()
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+                    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                    data = json.loads(await reader.readexactly(length))
+                    assert data["id"] == req_id
+                    assert (b"keep-alive" in head) == (req_id == 1)
+                # the server hangs up after the "Connection: close" request
+                assert await asyncio.wait_for(reader.read(), timeout=5) == b""
                 writer.close()
                 await writer.wait_closed()
-                _, _, resp_body = response.partition(b"\r\n\r\n")
-                data = json.loads(resp_body)
-                assert data["error"]["code"] == -32700
             finally:
                 await rpc.stop()
         self._run(_test())
@@ -249,39 +436,15 @@ class TestRPCHTTP:
                 # submit a transaction
                 post = Post(author=node.pub, nonce=0, timestamp=1000010, body="http", reply_to=None, gas_fee=1)
                 post.sign_tx(node.priv)
-                submit_body = json.dumps({
-                    "jsonrpc": "2.0", "method": "submit_transaction",
-                    "params": {"transaction": post.to_dict()}, "id": 1,
-                }).encode()
-                reader, writer = await asyncio.open_connection("127.0.0.1", port)
-                writer.write(
-                    f"POST / HTTP/1.1\r\nContent-Length: {len(submit_body)}\r\n\r\n".encode()
-                    + submit_body
-                )
-                await writer.drain()
-                resp = await asyncio.wait_for(reader.read(8192), timeout=5)
-                writer.close()
-                await writer.wait_closed()
-                _, _, body = resp.partition(b"\r\n\r\n")
-                submit_result = json.loads(body)
+                # submit and retrieve pipelined in one write; the server
+                # handles them in order, so the get sees the submitted tx
+                async with HTTPSession(port) as session:
+                    submit_result, get_result = await session.pipeline([
+                        ("submit_transaction", {"transaction": post.to_dict()}),
+                        ("get_transaction", {"tx_hash": post.tx_hash().hex()}),
+                    ])
                 assert "result" in submit_result
-
-                # retrieve it
-                get_body = json.dumps({
-                    "jsonrpc": "2.0", "method": "get_transaction",
-                    "params": {"tx_hash": post.tx_hash().hex()}, "id": 2,
-                }).encode()
-                reader, writer = await asyncio.open_connection("127.0.0.1", port)
-                writer.write(
-                    f"POST / HTTP/1.1\r\nContent-Length: {len(get_body)}\r\n\r\n".encode()
-                    + get_body
-                )
-                await writer.drain()
-                resp = await asyncio.wait_for(reader.read(8192), timeout=5)
-                writer.close()
-                await writer.wait_closed()
-                _, _, body = resp.partition(b"\r\n\r\n")
-                get_result = json.loads(body)
+                assert [submit_result["id"], get_result["id"]] == [1, 2]
                 assert get_result["result"]["body"] == "http"
             finally:
                 await rpc.stop()
@@ -296,10 +459,10 @@ async def _send_request(port: int, body_bytes: bytes, extra_headers: str = "") -
     ).encode()
     writer.write(header + body_bytes)
     await writer.drain()
-    resp = await asyncio.wait_for(reader.read(8192), timeout=5)
+    head, body = await read_http_response(reader)
     writer.close()
     await writer.wait_closed()
-    return resp
+    return head + body
 
 
 async def _send_options(port: int, extra_headers: str = "") -> bytes:
@@ -310,10 +473,10 @@ async def _send_options(port: int, extra_headers: str = "") -> bytes:
     ).encode()
     writer.write(header)
     await writer.drain()
-    resp = await asyncio.wait_for(reader.read(8192), timeout=5)
+    head, body = await read_http_response(reader)
     writer.close()
     await writer.wait_closed()
-    return resp
+    return head + body
 
 
 class TestRPCCors:
@@ -19,7 +19,7 @@ def _build_block(chain, txs, miner_pub, timestamp):
     cb = Coinbase(recipient=miner_pub, amount=block_reward(height), height=height)
     all_txs = [cb] + txs
     tx_root = merkle_root([tx.tx_hash() for tx in all_txs])
-    working = chain.state.copy()
+    working = chain.state.overlay()
     working_authors = dict(chain.post_authors)
     for tx in all_txs:
         target_author = None
@@ -1,4 +1,6 @@
-from jiji.core.serialization import canonicalize, sha256, compute_hash
+import json
+
+from jiji.core.serialization import canonicalize, sha256, compute_hash, dumps, loads
 
 
 class TestCanonicalize:
@@ -24,12 +26,12 @@ class TestCanonicalize:
         assert b"000102" in result
 
     def test_deterministic(self):
-        d = {"z": 1, "a": 2, "m": 3}
-        assert canonicalize(d) == canonicalize(d)
+        # insertion order doesn't change the bytes
+        for d in ({"z": 1, "a": 2, "m": 3}, {"m": 3, "z": 1, "a": 2}):
+            assert canonicalize(d) == b'{"a":2,"m":3,"z":1}'
 
     def test_empty_exclude(self):
-        d = {"a": 1}
-        assert canonicalize(d) == canonicalize(d, exclude_fields=set())
+        assert canonicalize({"a": 1}, exclude_fields=set()) == b'{"a":1}'
 
 
 class TestSha256:
@@ -58,3 +60,40 @@ class TestComputeHash:
         h1 = compute_hash(d, exclude_fields={"sig"})
         h2 = compute_hash({"a": 1})
         assert h1 == h2
+
+
+class TestDumps:
+    def test_roundtrips_through_stdlib(self):
+        d = {"b": [1, 2], "a": "héllo", "big": 2**80, "n": None}
+        assert json.loads(dumps(d)) == d
+
+    def test_compact(self):
+        assert b" " not in dumps({"a": 1, "b": [1, 2]})
+
+
+class TestLoads:
+    def test_inverts_dumps_for_any_input_type(self):
+        d = {"h": "12345678901234567890123" + "ab" * 20, "a": "héllo", "n": [1, None]}
+        raw = dumps(d)
+        for data in (raw, bytearray(raw), memoryview(raw), raw.decode()):
+            assert loads(data) == d
+
+    def test_big_ints_stay_exact(self):
+        for v in (2**64, -(2**63) - 1, {"x": [2**80]}):
+            assert loads(dumps(v)) == v
+
+    def test_malformed_raises_stdlib_errors(self):
+        import pytest
+        with pytest.raises(json.JSONDecodeError):
+            loads(b'{"a":')
+        with pytest.raises(UnicodeDecodeError):
+            loads(b"\xff")
+
+
+def test_sha256_backend_describes_openssl():
+    import hashlib
+    from jiji.core.serialization import sha256_backend
+    desc = sha256_backend()
+    assert isinstance(desc, str) and desc
+    if getattr(hashlib.sha256, "__name__", "") == "openssl_sha256":
+        assert "SSL" in desc
@@ -1,3 +1,4 @@
+import pytest
 from jiji.core.crypto import generate_keypair
 from jiji.core.state import WorldState, Account
 from jiji.core.transaction import Post, Endorse, Transfer, Coinbase
@@ -108,6 +109,20 @@ class TestTransferTransition:
         assert state.get_account(miner).balance == 1
 
 
+class TestApplyDispatch:
+    def test_subclass_uses_base_rule(self):
+        class MyCoinbase(Coinbase):
+            pass
+        _, pub = make_keys()
+        state = WorldState()
+        state.apply_transaction(MyCoinbase(recipient=pub, amount=7, height=1), pub)
+        assert state.get_account(pub).balance == 7
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(ValueError, match="unknown transaction type"):
+            WorldState().apply_transaction(object(), b"\x00" * 32)
+
+
 class TestStateRoot:
     def test_deterministic(self):
         state = WorldState()
@@ -128,6 +143,34 @@ class TestStateRoot:
         s2.get_or_create(pub).balance = 200
         assert s1.state_root() != s2.state_root()
 
+    def test_root_independent_of_insertion_order(self):
+        keys = [bytes([i]) * 32 for i in (5, 1, 9, 3)]
+        s1, s2 = WorldState(), WorldState()
+        for pk in keys:
+            s1.get_or_create(pk).balance = pk[0]
+        for pk in reversed(keys):
+            s2.get_or_create(pk).balance = pk[0]
+        # Accounts added directly to the dict must still be covered
+        s3 = WorldState()
+        for pk in keys:
+            s3.accounts[pk] = Account(balance=pk[0])
+        assert s1.state_root() == s2.state_root() == s3.state_root()
+
+    def test_leaf_is_canonical_account_json(self):
+        from jiji.core.merkle import merkle_root
+        from jiji.core.serialization import canonicalize, sha256
+        state = WorldState()
+        pubs = [b"\x02" * 32, b"\x01" * 32]
+        state.get_or_create(pubs[0]).balance = -5
+        acct = state.get_or_create(pubs[1])
+        acct.balance, acct.nonce = 10**20, 7
+        leaves = [
+            sha256(canonicalize({"pubkey": pk.hex(), "balance": state.accounts[pk].balance,
+                                 "nonce": state.accounts[pk].nonce}))
+            for pk in sorted(pubs)
+        ]
+        assert state.state_root() == merkle_root(leaves)
+
 
 class TestStateCopy:
     def test_independent(self):
@@ -144,3 +187,36 @@ class TestStateCopy:
         state.get_or_create(pub).balance = 50
         copy = state.copy()
         assert state.state_root() == copy.state_root()
+
+
+class TestStateOverlay:
+    def test_matches_copy_and_leaves_base_alone(self):
+        import random
+        rng = random.Random(3)
+        base = WorldState()
+        keys = [rng.randbytes(32) for _ in range(12)]
+        for i, pk in enumerate(keys[:8]):
+            base.get_or_create(pk).balance = 100 + i
+        base_root = base.state_root()
+        overlay, copy = base.overlay(), base.copy()
+        for _ in range(20):
+            sender, recipient = rng.choice(keys[:8]), rng.choice(keys)
+            nonce = overlay.get_or_create(sender).nonce
+            tx = Transfer(sender=sender, recipient=recipient, amount=1, nonce=nonce, gas_fee=1)
+            overlay.apply_transaction(tx, keys[0])
+            copy.apply_transaction(tx, keys[0])
+            assert overlay.state_root() == copy.state_root()
+        for pk in keys:
+            a, b = overlay.get_account(pk), copy.get_account(pk)
+            assert (a is None) == (b is None)
+            if a is not None:
+                assert (a.balance, a.nonce) == (b.balance, b.nonce)
+        assert base.state_root() == base_root
+        assert overlay.copy().state_root() == copy.state_root()
+
+    def test_empty_base(self):
+        _, pub = make_keys()
+        overlay = WorldState().overlay()
+        assert overlay.state_root() == WorldState().state_root()
+        overlay.apply_transaction(Coinbase(recipient=pub, amount=5, height=1), pub)
+        assert overlay.get_account(pub).balance == 5
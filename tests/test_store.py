@@ -1,4 +1,6 @@
 """Tests for SQLite block storage."""
+import os
+
 import pytest
 
 from jiji.core.block import Block, BlockHeader
@@ -279,3 +281,25 @@ class TestBlockStoreForks:
         assert chain[0].block_hash() == block1.block_hash()
         assert chain[1].block_hash() == block2.block_hash()
         store.close()
+
+
+class TestWarmPageCache:
+    def test_tolerates_missing_and_present_files(self, tmp_path):
+        from jiji.storage.store import warm_page_cache
+        present = tmp_path / "blocks.db"
+        present.write_bytes(b"\x00" * 4096)
+        warm_page_cache([present, tmp_path / "missing.db"])  # should not raise
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+    def test_advises_willneed_for_present_files_only(self, tmp_path, monkeypatch):
+        from jiji.storage.store import warm_page_cache
+        present = tmp_path / "blocks.db"
+        present.write_bytes(b"\x00" * 4096)
+        calls = []
+
+        def fake_fadvise(fd, offset, length, advice):
+            calls.append((os.fstat(fd).st_ino, offset, length, advice))
+
+        monkeypatch.setattr(os, "posix_fadvise", fake_fadvise)
+        warm_page_cache([tmp_path / "missing.db", present])
+        assert calls == [(present.stat().st_ino, 0, 0, os.POSIX_FADV_WILLNEED)]
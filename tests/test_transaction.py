@@ -35,6 +35,26 @@ class TestPost:
         h2 = post.tx_hash()
         assert h1 == h2
 
+    def test_tx_hash_memo_tracks_field_changes(self):
+        _, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1000, body="test", reply_to=None, gas_fee=1)
+        h1 = post.tx_hash()
+        post.body = "edited"
+        h2 = post.tx_hash()
+        assert h1 != h2
+        assert h2 == Post(author=pub, nonce=0, timestamp=1000, body="edited",
+                          reply_to=None, gas_fee=1).tx_hash()
+
+    def test_to_dict_memo_is_isolated_and_refreshed(self):
+        priv, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1000, body="hello", reply_to=None, gas_fee=2)
+        post.to_dict()["body"] = "tampered"
+        assert post.to_dict()["body"] == "hello"
+        post.sign_tx(priv)
+        assert post.to_dict()["signature"] == post.signature.hex()
+        post.reply_to = b"\xab" * 32
+        assert post.to_dict()["reply_to"] == "ab" * 32
+
     def test_roundtrip(self):
         priv, pub = make_keys()
         post = Post(author=pub, nonce=0, timestamp=1000, body="hello", reply_to=None, gas_fee=2)
@@ -122,6 +142,14 @@ class TestCoinbase:
         cb2 = Coinbase(recipient=pub, amount=50, height=1)
         assert cb1.tx_hash() != cb2.tx_hash()
 
+    def test_tx_hash_memo_tracks_field_changes(self):
+        _, pub = make_keys()
+        cb = Coinbase(recipient=pub, amount=50, height=0)
+        h1 = cb.tx_hash()
+        cb.height = 1
+        assert cb.tx_hash() == Coinbase(recipient=pub, amount=50, height=1).tx_hash()
+        assert cb.tx_hash() != h1
+
 
 class TestTransactionFromDict:
     def test_dispatches_post(self):
@@ -153,3 +181,136 @@ class TestTransactionFromDict:
     def test_unknown_type_raises(self):
         with pytest.raises(ValueError):
             transaction_from_dict({"tx_type": "unknown"})
+
+
+class TestCanonicalBytes:
+    """The fast serializers must stay byte-identical to canonicalize()."""
+
+    def _generic(self, tx):
+        from jiji.core.serialization import canonicalize
+        d = tx.to_dict()
+        d.pop("signature", None)
+        return canonicalize(d)
+
+    def test_post_matches_canonicalize(self):
+        _, pub = make_keys()
+        for body in ["hello", "", 'quo"te \\ back', "line\nbreak\t\x01", "héllo ☃ 🚀"]:
+            for reply_to in [None, b"\xab" * 32]:
+                post = Post(author=pub, nonce=3, timestamp=1000, body=body,
+                            reply_to=reply_to, gas_fee=2)
+                assert post.canonical_bytes() == self._generic(post)
+
+    def test_endorse_matches_canonicalize(self):
+        _, pub = make_keys()
+        e = Endorse(author=pub, nonce=1, target=b"\x01" * 32, amount=7,
+                    message='naïve "ok"', gas_fee=1)
+        assert e.canonical_bytes() == self._generic(e)
+
+    def test_transfer_matches_canonicalize(self):
+        _, pub = make_keys()
+        _, r = make_keys()
+        t = Transfer(sender=pub, recipient=r, amount=10, nonce=0, gas_fee=1)
+        assert t.canonical_bytes() == self._generic(t)
+
+    def test_coinbase_matches_canonicalize(self):
+        _, pub = make_keys()
+        cb = Coinbase(recipient=pub, amount=50, height=12)
+        assert cb.canonical_bytes() == self._generic(cb)
+
+    def test_unexpected_types_fall_back(self):
+        _, pub = make_keys()
+        post = Post(author=pub, nonce=True, timestamp=1000, body="x",
+                    reply_to=None, gas_fee=1)
+        assert post.canonical_bytes() == self._generic(post)
+
+
+class TestSignatureMemo:
+    def test_verify_result_cached(self, monkeypatch):
+        priv, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1000, body="x", reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        assert post.verify_signature()
+        import jiji.core.transaction as txmod
+        monkeypatch.setattr(txmod, "verify", lambda *a: pytest.fail("re-verified"))
+        assert post.verify_signature()
+
+    def test_tampered_signature_after_verify(self):
+        priv, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1000, body="x", reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        assert post.verify_signature()
+        post.signature = bytes(64)
+        assert not post.verify_signature()
+
+    def test_field_change_after_verify(self):
+        priv, pub = make_keys()
+        t = Transfer(sender=pub, recipient=b"\x02" * 32, amount=5, nonce=0, gas_fee=1)
+        t.sign_tx(priv)
+        assert t.verify_signature()
+        t.amount = 500
+        assert t.signing_payload() == t.canonical_bytes()
+        assert not t.verify_signature()
+        assert not t.signature_verified()
+
+    def test_mark_signature_verified(self):
+        _, pub = make_keys()
+        t = Transfer(sender=pub, recipient=b"\x02" * 32, amount=5, nonce=0, gas_fee=1)
+        assert not t.signature_verified()
+        t.mark_signature_verified()
+        assert t.signature_verified()
+        t.gas_fee = 2
+        assert not t.signature_verified()
+
+
+class TestCanonicalTemplates:
+    def test_big_ints_and_bytearray_match_canonicalize(self):
+        from jiji.core.serialization import canonicalize
+        t = Transfer(sender=bytearray(b"\x01" * 32), recipient=b"\x02" * 32,
+                     amount=2 ** 70, nonce=0, gas_fee=1)
+        d = t.to_dict()
+        d.pop("signature")
+        assert t.canonical_bytes() == canonicalize(d)
+        t.sender = bytes(t.sender)
+        d = t.to_dict()
+        d.pop("signature")
+        assert t.canonical_bytes() == canonicalize(d)
+
+
+class TestSerializedSize:
+    def _full(self, tx):
+        from jiji.core.serialization import canonicalize
+        return len(canonicalize(tx.to_dict()))
+
+    def test_matches_canonicalize(self):
+        priv, pub = make_keys()
+        txs = [
+            Post(author=pub, nonce=0, timestamp=1, body="héllo ☃ \"q\"",
+                 reply_to=None, gas_fee=1),
+            Endorse(author=pub, nonce=1, target=b"\x01" * 32, amount=3,
+                    message="naïve", gas_fee=1),
+            Transfer(sender=pub, recipient=b"\x02" * 32, amount=5, nonce=2, gas_fee=1),
+        ]
+        for tx in txs:
+            assert tx.serialized_size() == self._full(tx)  # empty signature
+            tx.sign_tx(priv)
+            assert tx.serialized_size() == self._full(tx)
+            tx.signature = None
+            assert tx.serialized_size() == self._full(tx)
+        cb = Coinbase(recipient=pub, amount=50, height=3)
+        assert cb.serialized_size() == self._full(cb)
+
+    def test_memo_tracks_field_changes(self):
+        _, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1, body="a", reply_to=None, gas_fee=1)
+        before = post.serialized_size()
+        post.body = "a much longer body"
+        assert post.serialized_size() == self._full(post) > before
+
+    def test_preimage_size_tracks_field_changes(self):
+        _, pub = make_keys()
+        post = Post(author=pub, nonce=0, timestamp=1, body="a", reply_to=None, gas_fee=1)
+        before = post.preimage_size()
+        post.body = "a much longer body"
+        assert post.preimage_size() == len(post.canonical_bytes()) > before
+        cb = Coinbase(recipient=pub, amount=50, height=3)
+        assert cb.preimage_size() == len(cb.canonical_bytes())
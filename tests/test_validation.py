@@ -14,6 +14,7 @@ from jiji.core.validation import (
     validate_endorse_format,
     validate_transfer_format,
     validate_coinbase_format,
+    validate_transaction_format,
     validate_transaction_state,
     validate_block,
 )
@@ -36,7 +37,7 @@ def build_block(chain, txs, miner_pub, timestamp):
     cb = Coinbase(recipient=miner_pub, amount=block_reward(height), height=height)
     all_txs = [cb] + txs
     tx_root = merkle_root([tx.tx_hash() for tx in all_txs])
-    working = chain.state.copy()
+    working = chain.state.overlay()
     for tx in all_txs:
         target_author = None
         if isinstance(tx, Endorse) and tx.amount > 0:
@@ -145,6 +146,22 @@ class TestCoinbaseFormat:
             validate_coinbase_format(cb, 0)
 
 
+class TestFormatDispatch:
+    def test_subclass_dispatches_to_base_validator(self):
+        class TaggedPost(Post):
+            pass
+
+        priv, pub = make_keys()
+        post = TaggedPost(author=pub, nonce=0, timestamp=1, body="", reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        with pytest.raises(ValidationError, match="body"):
+            validate_transaction_format(post)
+
+    def test_unknown_type_rejected(self):
+        with pytest.raises(ValidationError, match="unknown transaction type"):
+            validate_transaction_format(object())
+
+
 # -- State validation --
 
 class TestStateValidation:
@@ -229,7 +246,7 @@ class TestBlockValidation:
         chain, priv, pub = make_chain()
         cb = Coinbase(recipient=pub, amount=9999, height=1)
         tx_root = merkle_root([cb.tx_hash()])
-        working = chain.state.copy()
+        working = chain.state.overlay()
         working.apply_transaction(cb, pub)
         header = BlockHeader(
             PROTOCOL_VERSION, 1, chain.tip.block_hash(), 1000015,
@@ -247,7 +264,7 @@ class TestBlockValidation:
         cb = Coinbase(recipient=pub, amount=block_reward(1), height=1)
         all_txs = [cb, post, post]
         tx_root = merkle_root([tx.tx_hash() for tx in all_txs])
-        working = chain.state.copy()
+        working = chain.state.overlay()
         working.apply_transaction(cb, pub)
         working.apply_transaction(post, pub)
         header = BlockHeader(
@@ -265,9 +282,48 @@ class TestBlockValidation:
         with pytest.raises(ValidationError, match="merkle"):
             chain.add_block(block, current_time=1000020)
 
+    def test_reply_to_post_in_same_block(self):
+        chain, priv, pub = make_chain()
+        first = Post(author=pub, nonce=0, timestamp=1000015, body="a", reply_to=None, gas_fee=1)
+        first.sign_tx(priv)
+        reply = Post(author=pub, nonce=1, timestamp=1000015, body="b",
+                     reply_to=first.tx_hash(), gas_fee=1)
+        reply.sign_tx(priv)
+        block = build_block(chain, [first, reply], pub, 1000015)
+        validate_block(block, chain, 1000020)
+        # validation tracks intra-block posts without touching the chain's map
+        assert first.tx_hash() not in chain.post_authors
+        chain.add_block(block, current_time=1000020)
+        assert chain.post_authors[reply.tx_hash()] == pub
+
+    def test_merkle_checked_before_signatures(self, monkeypatch):
+        import jiji.core.validation as validation
+        chain, priv, pub = make_chain()
+        post = Post(author=pub, nonce=0, timestamp=1000015, body="x", reply_to=None, gas_fee=1)
+        post.sign_tx(priv)
+        block = build_block(chain, [post], pub, 1000015)
+        block.header.tx_merkle_root = b"\x00" * 32
+
+        def fail(txs):
+            raise AssertionError("signatures verified before merkle check")
+        monkeypatch.setattr(validation, "batch_verify_signatures", fail)
+        with pytest.raises(ValidationError, match="merkle"):
+            chain.add_block(block, current_time=1000020)
+
     def test_wrong_state_root(self):
         chain, priv, pub = make_chain()
         block = build_block(chain, [], pub, 1000015)
         block.header.state_root = b"\x00" * 32
         with pytest.raises(ValidationError, match="state_root"):
             chain.add_block(block, current_time=1000020)
+
+    def test_bad_signature_in_block_is_reported(self):
+        chain, priv, pub = make_chain()
+        good = Post(author=pub, nonce=0, timestamp=1000015, body="ok", reply_to=None, gas_fee=1)
+        good.sign_tx(priv)
+        bad = Post(author=pub, nonce=1, timestamp=1000015, body="forged", reply_to=None, gas_fee=1)
+        bad.signature = b"\x00" * 64
+        block = build_block(chain, [good, bad], pub, 1000015)
+        with pytest.raises(ValidationError, match="invalid post signature"):
+            chain.add_block(block, current_time=1000020)
+        assert chain.height == 0